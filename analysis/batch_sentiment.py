@@ -0,0 +1,321 @@
+"""
+Batch VADER sentiment over many sentences with numpy
+
+SentimentIntensityAnalyzer.polarity_scores walks each sentence token by
+token in Python. BatchSentimentAnalyzer gives the same scores for a whole
+list of sentences at once:
+
+- Whitespace tokens are mapped to integer ids through a vocabulary that
+  grows as new tokens are seen. Each id's properties (lexicon valence,
+  booster value, negation, ALL CAPS, and the few words the rules look for)
+  are computed once and kept in arrays indexed by id. Once the vocabulary
+  holds more than max_words words it is cleared before the next batch, so
+  a long-running process does not grow it without bound.
+- A batch is scored under the analyzer's lock; one analyzer can be shared
+  between threads.
+- The rules of the installed nltk VADER are applied to every token of the
+  batch together: ALL CAPS emphasis, boosters and dampeners up to three
+  words back, negation ("not", "n't", "never so", "least"), "kind of" style
+  dampening bigrams, the "but" shift and punctuation emphasis. Like VADER,
+  a repeated token is scored in the context of its first occurrence in the
+  sentence.
+- Sentences with one of VADER's special-case idioms ("kiss of death", ...)
+  are rare and are scored by polarity_scores itself.
+
+Scores are those polarity_scores returns (same rounding), up to float
+summation order in the last digit before rounding.
+"""
+import math
+import threading
+
+import numpy as np
+
+# Bit flags of the words VADER's rules check by name
+KIND, OF, LEAST, AT_OR_VERY, BUT, NEVER, SO_OR_THIS, IDIOM_END = (1 << bit for bit in range(8))
+
+
+class _Vocabulary(dict):
+    """Whitespace token -> token id, adding unseen tokens on lookup"""
+
+    def __init__(self, add):
+        super().__init__()
+        self._add = add
+
+    def __missing__(self, token):
+        token_id = self._add(token)
+        self[token] = token_id
+        return token_id
+
+
+class BatchSentimentAnalyzer:
+    """Scores lists of sentences like the given SentimentIntensityAnalyzer"""
+
+    def __init__(self, analyzer, max_words=200_000):
+        self.analyzer = analyzer
+        self.max_words = max_words
+        self._lock = threading.Lock()
+        self.lexicon = analyzer.lexicon
+        self.constants = analyzer.constants
+        self._punctuation = self.constants.REGEX_REMOVE_PUNCTUATION
+        self._punc_list = sorted(self.constants.PUNC_LIST, key=len, reverse=True)
+        self._bigrams = {
+            tuple(key.split()) for key in self.constants.BOOSTER_DICT if len(key.split()) == 2
+        }
+        self._idiom_ends = {key.split()[-1] for key in self.constants.SPECIAL_CASE_IDIOMS}
+        self._clear_vocabulary()
+
+    def _clear_vocabulary(self):
+        self._vocabulary = _Vocabulary(self._add_token)
+        self._word_ids = {}
+        self._words = []
+        self._valence = []
+        self._in_lexicon = []
+        self._is_booster = []
+        self._booster = []
+        self._is_upper = []
+        self._negation = []
+        self._flags = []
+        self._bigram_first = []
+        self._bigram_second = []
+        self._arrays = None
+
+    def _strip(self, token):
+        """The word VADER keeps for a whitespace token, or None if it drops it
+
+        VADER drops single characters and strips one entry of its
+        punctuation list from either end when the rest is free of
+        punctuation and longer than one character.
+        """
+        if len(token) <= 1:
+            return None
+        for punc in self._punc_list:
+            if token.endswith(punc):
+                word = token[:-len(punc)]
+            elif token.startswith(punc):
+                word = token[len(punc):]
+            else:
+                continue
+            if len(word) > 1 and not self._punctuation.search(word):
+                return word
+        return token
+
+    def _add_token(self, token):
+        word = self._strip(token)
+        if word is None:
+            return -1
+        word_id = self._word_ids.get(word)
+        if word_id is not None:
+            return word_id
+
+        c = self.constants
+        lower = word.lower()
+        flags = 0
+        for flag, matches in ((KIND, lower == 'kind'), (OF, lower == 'of'), (LEAST, lower == 'least'),
+                              (AT_OR_VERY, lower in ('at', 'very')), (BUT, lower == 'but'),
+                              (NEVER, word == 'never'), (SO_OR_THIS, word in ('so', 'this')),
+                              (IDIOM_END, word in self._idiom_ends)):
+            if matches:
+                flags |= flag
+
+        word_id = len(self._words)
+        self._word_ids[word] = word_id
+        self._words.append(word)
+        self._valence.append(self.lexicon.get(lower, 0.0))
+        self._in_lexicon.append(lower in self.lexicon)
+        self._is_booster.append(lower in c.BOOSTER_DICT)
+        self._booster.append(c.BOOSTER_DICT.get(lower, 0.0))
+        self._is_upper.append(word.isupper())
+        self._negation.append(lower in c.NEGATE or "n't" in lower)
+        self._flags.append(flags)
+        self._bigram_first.append(any(word == first for first, _ in self._bigrams))
+        self._bigram_second.append(any(word == second for _, second in self._bigrams))
+        self._arrays = None
+        return word_id
+
+    def _token_arrays(self):
+        if self._arrays is None:
+            self._arrays = {
+                'valence': np.array(self._valence, dtype=float),
+                'in_lexicon': np.array(self._in_lexicon, dtype=bool),
+                'is_booster': np.array(self._is_booster, dtype=bool),
+                'booster': np.array(self._booster, dtype=float),
+                'is_upper': np.array(self._is_upper, dtype=bool),
+                'negation': np.array(self._negation, dtype=bool),
+                'flags': np.array(self._flags, dtype=np.int64),
+                'bigram_first': np.array(self._bigram_first, dtype=bool),
+                'bigram_second': np.array(self._bigram_second, dtype=bool),
+            }
+        return self._arrays
+
+    def _encode(self, sentences):
+        """Flat token ids of all sentences and the token count of each"""
+        lookup = self._vocabulary.__getitem__
+        ids = []
+        lengths = np.zeros(len(sentences), dtype=np.int64)
+        for i, sentence in enumerate(sentences):
+            sentence_ids = [token_id for token_id in map(lookup, sentence.split()) if token_id >= 0]
+            lengths[i] = len(sentence_ids)
+            ids.extend(sentence_ids)
+        return np.array(ids, dtype=np.int64), lengths
+
+    def _token_sentiments(self, ids, lengths):
+        """VADER's per-token sentiment values for a flat batch of token ids
+
+        Also returns, per sentence, whether it needs the idiom fallback.
+        """
+        a = self._token_arrays()
+        c = self.constants
+        n_sentences = len(lengths)
+        n_tokens = len(ids)
+        sentence = np.repeat(np.arange(n_sentences), lengths)
+        starts = np.cumsum(lengths) - lengths
+        pos = np.arange(n_tokens) - starts[sentence]
+        length = lengths[sentence]
+        flags = a['flags'][ids]
+        in_lexicon = a['in_lexicon'][ids]
+
+        def back(values, k):
+            """values at the token k places earlier (meaningful where pos >= k)"""
+            return values[np.maximum(np.arange(n_tokens) - k, 0)]
+
+        is_upper = a['is_upper'][ids]
+        n_upper = np.bincount(sentence, weights=is_upper, minlength=n_sentences)
+        cap_diff = ((n_upper > 0) & (n_upper < lengths))[sentence]
+
+        next_flags = flags[np.minimum(np.arange(n_tokens) + 1, max(n_tokens - 1, 0))]
+        kind_of = (flags & KIND > 0) & (pos < length - 1) & (next_flags & OF > 0)
+        scored = in_lexicon & ~kind_of & ~a['is_booster'][ids]
+
+        valence = a['valence'][ids].copy()
+        emphasis = scored & is_upper & cap_diff
+        valence[emphasis] += np.where(valence[emphasis] > 0, c.C_INCR, -c.C_INCR)
+
+        pair = a['bigram_first'][ids] & (pos < length - 1)
+        pair &= a['bigram_second'][ids[np.minimum(np.arange(n_tokens) + 1, max(n_tokens - 1, 0))]]
+        if self._bigrams and pair.any():
+            # bigram_first/second only say the words occur in some bigram
+            words = self._words
+            for q in np.flatnonzero(pair):
+                pair[q] = (words[ids[q]], words[ids[q + 1]]) in self._bigrams
+        negation = a['negation'][ids]
+        never = flags & NEVER > 0
+        so_or_this = flags & SO_OR_THIS > 0
+
+        for k in range(3):
+            previous = back(ids, k + 1)
+            applies = scored & (pos > k) & ~a['in_lexicon'][previous]
+            scalar = a['booster'][previous]
+            scalar = np.where(valence < 0, -scalar, scalar)
+            caps = a['is_booster'][previous] & a['is_upper'][previous] & cap_diff
+            scalar = np.where(caps, np.where(valence > 0, scalar + c.C_INCR, scalar - c.C_INCR), scalar)
+            if k == 1:
+                scalar = np.where(scalar != 0, scalar * 0.95, scalar)
+            elif k == 2:
+                scalar = np.where(scalar != 0, scalar * 0.9, scalar)
+            valence = np.where(applies, valence + scalar, valence)
+
+            if k == 0:
+                valence = np.where(applies & back(negation, 1), valence * c.N_SCALAR, valence)
+            elif k == 1:
+                emphasized = back(never, 2) & back(so_or_this, 1)
+                valence = np.where(applies & emphasized, valence * 1.5,
+                                   np.where(applies & back(negation, 2), valence * c.N_SCALAR, valence))
+            else:
+                emphasized = (back(never, 3) & back(so_or_this, 2)) | back(so_or_this, 1)
+                valence = np.where(applies & emphasized, valence * 1.25,
+                                   np.where(applies & back(negation, 3), valence * c.N_SCALAR, valence))
+                dampened = applies & (back(pair, 3) | back(pair, 2))
+                valence = np.where(dampened, valence + c.B_DECR, valence)
+
+        least = ~back(in_lexicon, 1) & (back(flags, 1) & LEAST > 0)
+        negated = scored & least & (
+            ((pos > 1) & ~(back(flags, 2) & AT_OR_VERY > 0)) | (pos == 1)
+        )
+        valence = np.where(negated, valence * c.N_SCALAR, valence)
+        valence = np.where(scored, valence, 0.0)
+
+        # Every occurrence of a token takes the score of its first occurrence
+        key = sentence * len(self._words) + ids
+        _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+        sentiments = valence[first[inverse.ravel()]]
+
+        but_pos = np.where(flags & BUT > 0, pos, np.iinfo(np.int64).max)
+        first_but = np.full(n_sentences, np.iinfo(np.int64).max)
+        np.minimum.at(first_but, sentence, but_pos)
+        first_but = first_but[sentence]
+        has_but = first_but < np.iinfo(np.int64).max
+        sentiments = np.where(has_but & (pos < first_but), sentiments * 0.5,
+                              np.where(has_but & (pos > first_but), sentiments * 1.5, sentiments))
+
+        fallback = np.bincount(sentence, weights=flags & IDIOM_END > 0, minlength=n_sentences) > 0
+        return sentence, sentiments, fallback
+
+    def _scores(self, sentences):
+        """Per-sentence sum, positive sum, negative sum and neutral count"""
+        with self._lock:
+            # Token ids only have to be stable within a batch
+            if len(self._words) > self.max_words:
+                self._clear_vocabulary()
+            ids, lengths = self._encode(sentences)
+            sentence, sentiments, fallback = self._token_sentiments(ids, lengths)
+        n = len(sentences)
+        sum_s = np.bincount(sentence, weights=sentiments, minlength=n)
+        pos_sum = np.bincount(sentence, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n)
+        neg_sum = np.bincount(sentence, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n)
+        neu_count = np.bincount(sentence, weights=sentiments == 0, minlength=n)
+        return lengths, sum_s, pos_sum, neg_sum, neu_count, fallback
+
+    @staticmethod
+    def _punctuation_emphasis(text):
+        ep_amplifier = min(text.count('!'), 4) * 0.292
+        qm_count = text.count('?')
+        qm_amplifier = 0
+        if qm_count > 1:
+            qm_amplifier = qm_count * 0.18 if qm_count <= 3 else 0.96
+        return ep_amplifier + qm_amplifier
+
+    def polarity_scores(self, sentences):
+        """polarity_scores dicts ('neg', 'neu', 'pos', 'compound') for each sentence"""
+        sentences = list(sentences)
+        lengths, sum_s, pos_sum, neg_sum, neu_count, fallback = self._scores(sentences)
+        results = []
+        for i, text in enumerate(sentences):
+            if fallback[i]:
+                results.append(self.analyzer.polarity_scores(text))
+                continue
+            if not lengths[i]:
+                results.append({'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0})
+                continue
+            amplifier = self._punctuation_emphasis(text)
+            total_s = float(sum_s[i])
+            if total_s > 0:
+                total_s += amplifier
+            elif total_s < 0:
+                total_s -= amplifier
+            compound = self.constants.normalize(total_s)
+
+            positive, negative, neutral = float(pos_sum[i]), float(neg_sum[i]), float(neu_count[i])
+            if positive > math.fabs(negative):
+                positive += amplifier
+            elif positive < math.fabs(negative):
+                negative -= amplifier
+            total = positive + math.fabs(negative) + neutral
+            results.append({
+                'neg': round(math.fabs(negative / total), 3),
+                'neu': round(math.fabs(neutral / total), 3),
+                'pos': round(math.fabs(positive / total), 3),
+                'compound': round(compound, 4)
+            })
+        return results
+
+    def compound_scores(self, sentences):
+        """Compound score of each sentence as a float array"""
+        sentences = list(sentences)
+        lengths, sum_s, _, _, _, fallback = self._scores(sentences)
+        amplifier = np.array([self._punctuation_emphasis(text) for text in sentences], dtype=float)
+        sum_s = np.where(sum_s > 0, sum_s + amplifier, np.where(sum_s < 0, sum_s - amplifier, sum_s))
+        compound = sum_s / np.sqrt(sum_s * sum_s + 15)
+        scores = np.array([round(value, 4) for value in compound.tolist()], dtype=float)
+        for i in np.flatnonzero(fallback):
+            scores[i] = self.analyzer.polarity_scores(sentences[i])['compound']
+        return scores
@@ -0,0 +1,50 @@
+"""
+Text sources for corpus-level analysis
+
+Turns collected data into plain text streams for NLPAnalyzer.analyze_corpus
+and ESGScorer.score_projects.
+"""
+
+# Fields that hold report text in EEA API items, joined in this order
+EEA_TEXT_FIELDS = ('title', 'description', 'summary', 'abstract', 'text', 'body', 'content')
+
+
+def eea_report_texts(data):
+    """Yield one text per report returned by FreeDataCollector.get_eea_reports
+
+    Accepts the raw JSON: a list of reports or a dict holding the list under
+    'items', 'results', 'reports' or 'data'. Reports may be strings or dicts.
+    """
+    if data is None:
+        return
+    if isinstance(data, dict):
+        for key in ('items', 'results', 'reports', 'data'):
+            if isinstance(data.get(key), list):
+                data = data[key]
+                break
+        else:
+            data = [data]
+
+    for report in data:
+        if isinstance(report, str):
+            text = report
+        elif isinstance(report, dict):
+            text = ' '.join(str(report[field]) for field in EEA_TEXT_FIELDS if report.get(field))
+        else:
+            continue
+        if text.strip():
+            yield text
+
+
+def project_reports(project):
+    """Report texts of a project: its 'reports' plus the text of its updates"""
+    reports = [report for report in project.get('reports', []) if report]
+    reports.extend(update.get('text', '') for update in project.get('updates', []) if update.get('text'))
+    return reports
+
+
+def project_report_texts(projects):
+    """Yield (project_id, text) for every report of every project"""
+    for project in projects:
+        for text in project_reports(project):
+            yield project.get('id'), text
@@ -1,124 +1,164 @@
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.preprocessing import MinMaxScaler
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from nltk.corpus import stopwords
-import spacy
 import json
+from itertools import tee
+
+from analysis.keyword_matcher import KeywordMatcher
+from analysis.nlp_resources import get_nlp
+from analysis.nltk_resources import get_sentiment_analyzer
+from analysis.parsed_document import get_parsed_document, parse_corpus
+
+# ESG keywords and their weights
+ESG_KEYWORDS = {
+    'environmental': {
+        'climate': 0.8,
+        'emissions': 0.7,
+        'renewable': 0.8,
+        'sustainable': 0.6,
+        'pollution': 0.7,
+        'biodiversity': 0.6,
+        'waste': 0.5,
+        'energy': 0.7,
+        'water': 0.6,
+        'conservation': 0.5
+    },
+    'social': {
+        'community': 0.7,
+        'health': 0.8,
+        'safety': 0.8,
+        'diversity': 0.7,
+        'inclusion': 0.7,
+        'human rights': 0.9,
+        'labor': 0.6,
+        'education': 0.6,
+        'poverty': 0.7,
+        'equality': 0.8
+    },
+    'governance': {
+        'transparency': 0.9,
+        'compliance': 0.8,
+        'ethics': 0.8,
+        'corruption': 0.9,
+        'accountability': 0.8,
+        'risk': 0.7,
+        'stakeholder': 0.6,
+        'board': 0.7,
+        'regulation': 0.7,
+        'disclosure': 0.8
+    }
+}
+
 
 class ESGScorer:
-    def __init__(self):
-        # Download required NLTK data
-        nltk.download('vader_lexicon')
-        nltk.download('stopwords')
-        
-        self.sia = SentimentIntensityAnalyzer()
-        self.vectorizer = TfidfVectorizer(max_features=1000)
+    def __init__(self, rule_based_sentences=False):
         self.scaler = MinMaxScaler()
-        self.nlp = spacy.load('en_core_web_sm')
+        # Rule-based sentence splitting skips the parser and needs no model
+        self.rule_based_sentences = rule_based_sentences
         
-        # Define ESG keywords and their weights
+        # ESG keywords and their weights
         self.esg_keywords = {
-            'environmental': {
-                'climate': 0.8,
-                'emissions': 0.7,
-                'renewable': 0.8,
-                'sustainable': 0.6,
-                'pollution': 0.7,
-                'biodiversity': 0.6,
-                'waste': 0.5,
-                'energy': 0.7,
-                'water': 0.6,
-                'conservation': 0.5
-            },
-            'social': {
-                'community': 0.7,
-                'health': 0.8,
-                'safety': 0.8,
-                'diversity': 0.7,
-                'inclusion': 0.7,
-                'human rights': 0.9,
-                'labor': 0.6,
-                'education': 0.6,
-                'poverty': 0.7,
-                'equality': 0.8
-            },
-            'governance': {
-                'transparency': 0.9,
-                'compliance': 0.8,
-                'ethics': 0.8,
-                'corruption': 0.9,
-                'accountability': 0.8,
-                'risk': 0.7,
-                'stakeholder': 0.6,
-                'board': 0.7,
-                'regulation': 0.7,
-                'disclosure': 0.8
-            }
+            category: dict(keywords) for category, keywords in ESG_KEYWORDS.items()
         }
+        # One compiled counter for every category's keywords
+        self.keyword_matcher = KeywordMatcher(
+            keyword for keywords in self.esg_keywords.values() for keyword in keywords
+        )
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_nlp()
+
+    @property
+    def sia(self):
+        """VADER analyzer, loaded from local NLTK data on first use"""
+        return get_sentiment_analyzer()
+
+    def parse(self, text):
+        """Shared parsed document for text (parsed once, then cached)"""
+        return get_parsed_document(text, self.rule_based_sentences)
 
     def preprocess_text(self, text):
-        """Preprocess text data"""
-        doc = self.nlp(text.lower())
+        """Preprocess text data (text may also be a ParsedDocument)"""
+        document = self.parse(text)
         
         # Remove stopwords
-        stop_words = set(stopwords.words('english'))
-        processed_sentences = []
-        
-        for sent in doc.sents:
-            words = [token.text for token in sent if token.is_alpha and not token.is_stop]
-            processed_sentences.append(' '.join(words))
+        processed_sentences = [' '.join(words) for words in document.sentence_words]
         
         return ' '.join(processed_sentences)
 
-    def calculate_keyword_score(self, text, category):
-        """Calculate score based on keyword presence and weights"""
-        text = text.lower()
+    def keyword_counts(self, text):
+        """Occurrences of every ESG keyword in text, all categories in one pass"""
+        return self.keyword_matcher.count(text.lower())
+
+    def calculate_keyword_score(self, text, category, counts=None):
+        """Calculate score based on keyword presence and weights
+
+        counts are keyword_counts(text) if already computed, so the
+        categories of one text can share a single scan.
+        """
+        if counts is None:
+            counts = self.keyword_counts(text)
+        return self.weighted_keyword_score(counts, self.esg_keywords[category])
+
+    @staticmethod
+    def weighted_keyword_score(counts, keywords):
+        """Weighted keyword count, normalized by the weight of the keywords present"""
         score = 0
         total_weight = 0
         
-        for keyword, weight in self.esg_keywords[category].items():
-            if keyword in text:
-                score += text.count(keyword) * weight
+        for keyword, weight in keywords.items():
+            if counts.get(keyword):
+                score += counts[keyword] * weight
                 total_weight += weight
         
         return score / total_weight if total_weight > 0 else 0
 
     def calculate_sentiment_score(self, text):
-        """Calculate sentiment score using VADER"""
-        sentiment_scores = self.sia.polarity_scores(text)
+        """Calculate sentiment score using VADER (text may also be a ParsedDocument)"""
+        sentiment_scores = self.parse(text).sentiment
         # Convert sentiment to 0-1 scale
         return (sentiment_scores['compound'] + 1) / 2
 
-    def calculate_esg_scores(self, project_data):
+    @staticmethod
+    def project_text(project_data):
+        """All text of a project: its description followed by its reports"""
+        all_text = project_data.get('description', '')
+        all_text += ' ' + ' '.join(project_data.get('reports', []))
+        return all_text
+
+    def calculate_esg_scores(self, project_data, document=None):
         """
         Calculate ESG scores for a project
         project_data should contain:
         - description: text description of the project
         - metrics: dict of quantitative metrics
         - reports: list of relevant report texts
+        document is an already parsed project_text(project_data), if any.
         """
         try:
             # Combine all text data
-            all_text = project_data.get('description', '')
-            all_text += ' ' + ' '.join(project_data.get('reports', []))
-            processed_text = self.preprocess_text(all_text)
+            document = document or self.parse(self.project_text(project_data))
+            processed_text = self.preprocess_text(document)
+            # Sentiment is a property of the whole text, shared by all components
+            sentiment_score = self.calculate_sentiment_score(document)
+            # One keyword scan covers all three components
+            counts = self.keyword_counts(processed_text)
             
             # Calculate scores for each ESG component
             scores = {
                 'environmental': {
-                    'keyword_score': self.calculate_keyword_score(processed_text, 'environmental'),
-                    'sentiment_score': self.calculate_sentiment_score(all_text)
+                    'keyword_score': self.calculate_keyword_score(processed_text, 'environmental', counts),
+                    'sentiment_score': sentiment_score
                 },
                 'social': {
-                    'keyword_score': self.calculate_keyword_score(processed_text, 'social'),
-                    'sentiment_score': self.calculate_sentiment_score(all_text)
+                    'keyword_score': self.calculate_keyword_score(processed_text, 'social', counts),
+                    'sentiment_score': sentiment_score
                 },
                 'governance': {
-                    'keyword_score': self.calculate_keyword_score(processed_text, 'governance'),
-                    'sentiment_score': self.calculate_sentiment_score(all_text)
+                    'keyword_score': self.calculate_keyword_score(processed_text, 'governance', counts),
+                    'sentiment_score': sentiment_score
                 }
             }
             
@@ -142,6 +182,23 @@ class ESGScorer:
             print(f"Error calculating ESG scores: {str(e)}")
             return None
 
+    def score_projects(self, projects, batch_size=64, n_process=1, stats=None):
+        """Score an iterable of projects, parsing their texts in bulk
+
+        Yields calculate_esg_scores results in input order. Texts are parsed
+        with nlp.pipe in batches of batch_size using n_process processes;
+        throughput is printed at the end and kept in stats if given.
+        """
+        stats = stats if stats is not None else {}
+        projects, for_text = tee(projects)
+        documents = parse_corpus((self.project_text(p) for p in for_text),
+                                 self.rule_based_sentences, batch_size, n_process, stats)
+        for project_data, document in zip(projects, documents):
+            yield self.calculate_esg_scores(project_data, document)
+        if stats.get('documents'):
+            print(f"Scored {stats['documents']} projects in {stats['seconds']:.1f}s "
+                  f"({stats['docs_per_sec']:.1f} docs/sec)")
+
     def calculate_metric_score(self, metrics):
         """Calculate score from quantitative metrics"""
         if not metrics:
@@ -156,7 +213,8 @@ class ESGScorer:
             print(f"Error calculating metric score: {str(e)}")
             return 0
 
-    def calculate_final_scores(self, scores):
+    @staticmethod
+    def calculate_final_scores(scores):
         """Calculate final scores for each ESG component"""
         final_scores = {}
         
@@ -0,0 +1,138 @@
+"""
+Compiled multi-keyword counter for the ESG lexicons
+
+Counting each keyword with str.count means one pass over the text per
+keyword, and checking every word against every keyword is quadratic.
+KeywordMatcher is built once from a lexicon and counts every keyword of
+every category together:
+
+- Single-word keywords can only occur inside one whitespace-separated
+  token, so the text is split into tokens once and a trie-shaped regex runs
+  over the distinct tokens only. Counts are scaled by token frequency. A
+  lookahead finds the longest keyword starting at each position; keywords
+  that are prefixes of it ("emission" in "emissions") are added from a
+  precomputed prefix closure.
+- Multi-word keywords such as "human rights" match across any run of
+  whitespace, so line breaks inside a phrase still count. Each has its own
+  regex, which the re module scans for by its literal first word.
+
+Counts follow str.count: occurrences of the same keyword do not overlap.
+"""
+import re
+from bisect import bisect_right
+from collections import Counter
+
+
+def _normalize(keyword):
+    return ' '.join(keyword.lower().split())
+
+
+def _trie_pattern(keywords):
+    """Regex alternation shaped like a trie of keywords, preferring longer matches"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # A keyword ends here: the longer continuations are optional
+        return '(?:' + body + ')?' if '' in node else body
+
+    return emit(trie)
+
+
+class KeywordMatcher:
+    """Counts occurrences of a fixed set of lowercase keywords in text"""
+
+    def __init__(self, keywords):
+        keywords = sorted({_normalize(keyword) for keyword in keywords if keyword.strip()})
+        self.keywords = keywords
+        self.single_keywords = [keyword for keyword in keywords if ' ' not in keyword]
+        self.multi_keywords = [keyword for keyword in keywords if ' ' in keyword]
+
+        self._single_regex = None
+        if self.single_keywords:
+            self._single_regex = re.compile('(?=(' + _trie_pattern(self.single_keywords) + '))')
+        # Every keyword that matches wherever the given (longest) keyword matches
+        self._prefix_closure = {
+            keyword: [other for other in self.single_keywords if keyword.startswith(other)]
+            for keyword in self.single_keywords
+        }
+        self._multi_regexes = [
+            (keyword, re.compile(r'\s+'.join(re.escape(word) for word in keyword.split())))
+            for keyword in self.multi_keywords
+        ]
+
+    def _count_in_tokens(self, token_counts):
+        """Single-keyword counts over distinct tokens weighted by their frequency
+
+        Also returns, per keyword, the set of tokens that contain it.
+        """
+        counts = Counter()
+        containing = {}
+        if self._single_regex is None or not token_counts:
+            return counts, containing
+
+        vocab = list(token_counts)
+        joined = '\n'.join(vocab)
+        starts = []
+        offset = 0
+        for token in vocab:
+            starts.append(offset)
+            offset += len(token) + 1
+
+        last_end = {}
+        for match in self._single_regex.finditer(joined):
+            pos = match.start()
+            longest = match.group(1)
+            token = vocab[bisect_right(starts, pos) - 1]
+            for keyword in self._prefix_closure[longest]:
+                # Non-overlapping like str.count
+                if pos >= last_end.get(keyword, -1):
+                    last_end[keyword] = pos + len(keyword)
+                    counts[keyword] += token_counts[token]
+                    containing.setdefault(keyword, set()).add(token)
+        return counts, containing
+
+    def count(self, text):
+        """Occurrences of every keyword in text (expected lowercase)"""
+        counts, _ = self._count_in_tokens(Counter(text.split()))
+        for keyword, regex in self._multi_regexes:
+            hits = sum(1 for _ in regex.finditer(text))
+            if hits:
+                counts[keyword] = hits
+        return counts
+
+    def count_words(self, words, categories):
+        """Per category, the number of words containing any of its keywords
+
+        words is a token list (expected lowercase) and categories maps a
+        category to its keywords. A word counts once however many keywords it
+        contains; multi-word keywords count each time they appear across
+        consecutive words.
+        """
+        word_counts = Counter(words)
+        _, containing = self._count_in_tokens(word_counts)
+        text = None
+
+        totals = {}
+        for category, keywords in categories.items():
+            keywords = {_normalize(keyword) for keyword in keywords}
+            matched_words = set()
+            for keyword in keywords:
+                matched_words.update(containing.get(keyword, ()))
+            total = sum(word_counts[word] for word in matched_words)
+
+            for keyword, regex in self._multi_regexes:
+                if keyword in keywords:
+                    if text is None:
+                        text = ' '.join(words)
+                    total += sum(1 for _ in regex.finditer(text))
+            totals[category] = total
+        return totals
@@ -0,0 +1,93 @@
+"""
+Whole-document extraction of numeric ESG metrics
+
+Looping over every sentence and calling re.finditer with string patterns
+costs one pattern lookup and one scan start per sentence and pattern.
+MetricExtractor runs each precompiled pattern once over the full text and
+assigns every match to its sentence by binary search on the sentence
+boundaries. A match that runs past the end of its sentence (or starts
+between sentences) cannot occur in a per-sentence scan, so the sentences it
+touches are rescanned one by one for that pattern; the result is the same
+as scanning each sentence separately.
+
+Each metric also carries its value as a number with a unit, e.g.
+"$2.5 million" -> 2500000.0 USD and "40%" -> 40.0 %.
+"""
+import re
+from bisect import bisect_left, bisect_right
+
+# Order matters: metrics of one sentence are listed by pattern, then position
+METRIC_PATTERNS = {
+    'QUANTITY': r'(?P<number>\d+(?:,\d{3})*(?:\.\d+)?)\s*'
+                r'(?P<unit>MW|GW|kW|tons?|acres?|jobs?|people|employees)',
+    'PERCENT': r'(?P<number>\d+(?:\.\d+)?)%',
+    'MONEY': r'\$\s*(?P<number>\d+(?:,\d{3})*(?:\.\d+)?)'
+             r'(?:\s*(?P<scale>million|billion|trillion))?'
+}
+
+SCALES = {'million': 1e6, 'billion': 1e9, 'trillion': 1e12}
+# Singular unit spellings mapped to the plural used in results
+UNIT_NAMES = {'ton': 'tons', 'acre': 'acres', 'job': 'jobs'}
+
+
+def normalize_metric(metric_type, match):
+    """Numeric value and unit of a metric pattern match"""
+    number = float(match.group('number').replace(',', ''))
+    if metric_type == 'MONEY':
+        scale = match.group('scale')
+        return number * SCALES[scale] if scale else number, 'USD'
+    if metric_type == 'PERCENT':
+        return number, '%'
+    unit = match.group('unit')
+    return number, UNIT_NAMES.get(unit, unit)
+
+
+class MetricExtractor:
+    """Finds metric pattern matches in a text split into sentences"""
+
+    def __init__(self, patterns=None):
+        patterns = METRIC_PATTERNS if patterns is None else patterns
+        self.patterns = [(metric_type, re.compile(pattern)) for metric_type, pattern in patterns.items()]
+
+    def _matches(self, text, sentence_spans):
+        """(sentence index, pattern index, match) for every per-sentence match"""
+        starts = [start for start, _ in sentence_spans]
+        ends = [end for _, end in sentence_spans]
+        found = []
+        for order, (_, regex) in enumerate(self.patterns):
+            rescan = set()
+            for match in regex.finditer(text):
+                i = bisect_right(starts, match.start()) - 1
+                if i >= 0 and match.end() <= ends[i]:
+                    found.append((i, order, match))
+                else:
+                    # Every sentence the match overlaps
+                    rescan.update(range(bisect_right(ends, match.start()),
+                                        bisect_left(starts, match.end())))
+            if rescan:
+                found = [item for item in found if item[1] != order or item[0] not in rescan]
+                for i in rescan:
+                    found.extend((i, order, match)
+                                 for match in regex.finditer(text, starts[i], ends[i]))
+        found.sort(key=lambda item: (item[0], item[1], item[2].start()))
+        return found
+
+    def extract(self, text, sentence_spans):
+        """Metrics found in text, given sentence_spans as sorted (start, end) offsets
+
+        Each metric has the matched 'value' string, its 'type', the sentence
+        it occurs in as 'context', and the normalized 'number' and 'unit'.
+        """
+        metrics = []
+        for i, order, match in self._matches(text, sentence_spans):
+            metric_type = self.patterns[order][0]
+            number, unit = normalize_metric(metric_type, match)
+            start, end = sentence_spans[i]
+            metrics.append({
+                'value': match.group(),
+                'type': metric_type,
+                'context': text[start:end].strip(),
+                'number': number,
+                'unit': unit
+            })
+        return metrics
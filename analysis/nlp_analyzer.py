@@ -1,25 +1,15 @@
-import spacy
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from nltk.corpus import stopwords
 from collections import defaultdict
-import re
+
+from analysis.metric_extractor import MetricExtractor
+from analysis.nlp_resources import get_nlp
+from analysis.nltk_resources import get_sentiment_analyzer, get_stopwords
+from analysis.parsed_document import ParsedDocument, get_parsed_document, parse_corpus
+from analysis.sentence_memo import SentenceMemo, sentiment_memo
+from analysis.text_stream import iter_text_chunks
 
 class NLPAnalyzer:
-    def __init__(self):
-        # Download required NLTK data
-        nltk.download('vader_lexicon')
-        nltk.download('punkt')
-        nltk.download('stopwords')
-        nltk.download('wordnet')
-        nltk.download('averaged_perceptron_tagger')
-        nltk.download('maxent_ne_chunker')
-        nltk.download('words')
-        
-        # Load spaCy model
-        self.nlp = spacy.load('en_core_web_sm')
-        self.sia = SentimentIntensityAnalyzer()
-        self.stop_words = set(stopwords.words('english'))
+    def __init__(self, rule_based_sentences=False):
+        self.rule_based_sentences = rule_based_sentences
         
         # ESG-related keywords
         self.esg_keywords = {
@@ -36,11 +26,136 @@ class NLPAnalyzer:
                 'risk', 'stakeholder', 'board', 'regulation', 'disclosure'
             ]
         }
+        self.metric_extractor = MetricExtractor()
+        # ESG categories mentioned by each lowercased sentence
+        self.sentence_categories = SentenceMemo(self._categories_of)
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_nlp()
+
+    @property
+    def sia(self):
+        """VADER analyzer, loaded from local NLTK data on first use"""
+        return get_sentiment_analyzer()
+
+    @property
+    def stop_words(self):
+        return get_stopwords()
+
+    def _categories_of(self, lower_sentences):
+        return [
+            tuple(category for category, keywords in self.esg_keywords.items()
+                  if any(keyword in sentence_lower for keyword in keywords))
+            for sentence_lower in lower_sentences
+        ]
+
+    def memo_stats(self):
+        """Dedup statistics of the sentence sentiment and keyword memos"""
+        return {
+            'sentiment': sentiment_memo.stats(),
+            'keywords': self.sentence_categories.stats()
+        }
+
+    def parse(self, text):
+        """Shared parsed document for text (parsed once, then cached)
+
+        Every method below also accepts a ParsedDocument in place of text.
+        """
+        return get_parsed_document(text, self.rule_based_sentences)
+
+    def parse_corpus(self, texts, batch_size=64, n_process=1, stats=None):
+        """Parse many texts with nlp.pipe, yielding ParsedDocuments in input order"""
+        return parse_corpus(texts, self.rule_based_sentences, batch_size, n_process, stats)
+
+    def analyze(self, text, top_n=5):
+        """Run every analysis below on one document"""
+        document = self.parse(text)
+        return {
+            'key_phrases': self.extract_key_phrases(document, top_n),
+            'esg_insights': dict(self.extract_esg_insights(document)),
+            'aspect_sentiment': self.analyze_sentiment_by_aspect(document),
+            'metrics': self.extract_metrics(document)
+        }
+
+    def analyze_corpus(self, texts, batch_size=64, n_process=1, top_n=5, stats=None):
+        """Analyze an iterable of reports, yielding one analyze() result per text
+
+        Documents are parsed in batches of batch_size with nlp.pipe, using
+        n_process worker processes, and results stream out in input order.
+        Throughput is printed at the end and kept in stats ('documents',
+        'seconds', 'docs_per_sec') if a dict is passed, along with
+        'sentence_dedup_ratio', the share of sentences whose sentiment was
+        already memoized.
+        """
+        stats = stats if stats is not None else {}
+        seen, computed = sentiment_memo.sentences, sentiment_memo.computed
+        for document in self.parse_corpus(texts, batch_size, n_process, stats):
+            yield self.analyze(document, top_n)
+            sentences = sentiment_memo.sentences - seen
+            stats['sentence_dedup_ratio'] = (
+                1 - (sentiment_memo.computed - computed) / sentences if sentences else 0.0
+            )
+        if stats.get('documents'):
+            print(f"Analyzed {stats['documents']} documents in {stats['seconds']:.1f}s "
+                  f"({stats['docs_per_sec']:.1f} docs/sec, "
+                  f"{stats['sentence_dedup_ratio']:.0%} of sentences deduplicated)")
+
+    def analyze_stream(self, source, chunk_chars=100_000, top_n=5,
+                       max_insights=50, max_metrics=500, stats=None):
+        """Analyze a report of any length in sentence-aligned chunks
+
+        source is a file path, an open text file or an iterable of strings.
+        Each chunk is parsed on its own (and not cached) and its results are
+        merged, so memory stays bounded by chunk_chars. Returns the analyze()
+        schema: key phrases and aspect sentiment are exact, while insights
+        per category and metrics keep the first max_insights / max_metrics
+        found. stats, if given, receives chunk, character and match totals.
+        """
+        stats = stats if stats is not None else {}
+        stats.update(chunks=0, characters=0, insights_found=0, metrics_found=0)
+        key_phrases = []
+        insights = defaultdict(list)
+        sentiment_sums = defaultdict(float)
+        sentiment_counts = defaultdict(int)
+        metrics = []
+
+        for chunk in iter_text_chunks(source, chunk_chars):
+            document = ParsedDocument(chunk, self.rule_based_sentences)
+            stats['chunks'] += 1
+            stats['characters'] += len(chunk)
+
+            # Stable sort keeps earlier phrases first among equal lengths,
+            # matching a single sort over the whole text
+            key_phrases = sorted(key_phrases + self.extract_key_phrases(document, top_n),
+                                 key=len, reverse=True)[:top_n]
+
+            for category, sentences in self.extract_esg_insights(document).items():
+                stats['insights_found'] += len(sentences)
+                insights[category].extend(sentences[:max_insights - len(insights[category])])
+
+            for aspect, scores in self._aspect_sentiments(document).items():
+                sentiment_sums[aspect] += sum(scores)
+                sentiment_counts[aspect] += len(scores)
+
+            chunk_metrics = self.extract_metrics(document)
+            stats['metrics_found'] += len(chunk_metrics)
+            metrics.extend(chunk_metrics[:max_metrics - len(metrics)])
+
+        return {
+            'key_phrases': key_phrases,
+            'esg_insights': dict(insights),
+            'aspect_sentiment': {
+                aspect: sentiment_sums[aspect] / sentiment_counts[aspect]
+                for aspect in sentiment_sums
+            },
+            'metrics': metrics
+        }
 
     def extract_key_phrases(self, text, top_n=5):
         """Extract key phrases using spaCy's noun chunks"""
-        doc = self.nlp(text)
-        noun_chunks = [chunk.text.strip() for chunk in doc.noun_chunks]
+        noun_chunks = self.parse(text).noun_chunks
         
         # Filter out short phrases and those with stop words
         filtered_chunks = []
@@ -56,34 +171,32 @@ class NLPAnalyzer:
 
     def extract_esg_insights(self, text):
         """Extract sentences containing ESG-related insights"""
-        doc = self.nlp(text)
-        sentences = [sent.text for sent in doc.sents]
+        document = self.parse(text)
         insights = defaultdict(list)
         
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            
-            # Check each ESG category
-            for category, keywords in self.esg_keywords.items():
-                if any(keyword in sentence_lower for keyword in keywords):
-                    insights[category].append(sentence)
+        categories = self.sentence_categories(document.lower_sentences)
+        for sentence, sentence_categories in zip(document.sentences, categories):
+            for category in sentence_categories:
+                insights[category].append(sentence)
         
         return insights
 
-    def analyze_sentiment_by_aspect(self, text):
-        """Analyze sentiment for different ESG aspects"""
-        doc = self.nlp(text)
-        sentences = [sent.text for sent in doc.sents]
+    def _aspect_sentiments(self, document):
+        """Compound sentiment of each sentence, grouped by the ESG aspects it mentions"""
         sentiments = defaultdict(list)
         
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            
-            # Check which ESG aspect the sentence belongs to
-            for aspect, keywords in self.esg_keywords.items():
-                if any(keyword in sentence_lower for keyword in keywords):
-                    sentiment = self.sia.polarity_scores(sentence)
-                    sentiments[aspect].append(sentiment['compound'])
+        categories = self.sentence_categories(document.lower_sentences)
+        for i, aspects in enumerate(categories):
+            # The ESG aspects the sentence belongs to
+            for aspect in aspects:
+                sentiment = document.sentence_sentiment[i]
+                sentiments[aspect].append(sentiment['compound'])
+        
+        return sentiments
+
+    def analyze_sentiment_by_aspect(self, text):
+        """Analyze sentiment for different ESG aspects"""
+        sentiments = self._aspect_sentiments(self.parse(text))
         
         # Calculate average sentiment for each aspect
         avg_sentiments = {}
@@ -96,27 +209,14 @@ class NLPAnalyzer:
         return avg_sentiments
 
     def extract_metrics(self, text):
-        """Extract numerical metrics and their context"""
-        doc = self.nlp(text)
-        sentences = [sent.text for sent in doc.sents]
-        metrics = []
-        
-        # Regular expressions for different metric patterns
-        patterns = {
-            'QUANTITY': r'\d+(?:,\d{3})*(?:\.\d+)?\s*(?:MW|GW|kW|tons?|acres?|jobs?|people|employees)',
-            'PERCENT': r'\d+(?:\.\d+)?%',
-            'MONEY': r'\$\s*\d+(?:,\d{3})*(?:\.\d+)?(?:\s*(?:million|billion|trillion))?'
-        }
-        
-        # Find all sentences with numbers
-        for sentence in sentences:
-            for metric_type, pattern in patterns.items():
-                matches = re.finditer(pattern, sentence)
-                for match in matches:
-                    metrics.append({
-                        'value': match.group(),
-                        'type': metric_type,
-                        'context': sentence.strip()
-                    })
-        
-        return metrics
+        """Extract numerical metrics, their context and normalized values"""
+        document = self.parse(text)
+        return self.metric_extractor.extract(document.text, document.sentence_spans)
+
+    def extract_metrics_corpus(self, texts, batch_size=64, n_process=1, stats=None):
+        """Extract metrics from an iterable of texts, yielding one list per text
+
+        Texts are parsed in batches with nlp.pipe, as in analyze_corpus.
+        """
+        for document in self.parse_corpus(texts, batch_size, n_process, stats):
+            yield self.extract_metrics(document)
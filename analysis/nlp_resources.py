@@ -0,0 +1,96 @@
+"""
+Process-wide NLP resources shared by the analysis modules
+
+The spaCy model is loaded once per process and shared by every analyzer.
+Each parse only runs the components its task needs:
+
+- tokens: tokenizer only (lexical attributes such as is_alpha/is_stop)
+- sentences: dependency parser for sentence boundaries, or the rule-based
+  sentencizer when rule_based=True
+- noun_chunks: tagger, attribute ruler and parser
+- full: every component
+"""
+import os
+import threading
+import time
+
+import spacy
+
+# Set SPACY_MODEL to use another installed pipeline (a package name or path)
+SPACY_MODEL = os.environ.get('SPACY_MODEL', 'en_core_web_sm')
+
+# Components each task can skip; names not in the loaded pipeline are ignored
+TASK_DISABLED_COMPONENTS = {
+    'sentences': ('tagger', 'attribute_ruler', 'lemmatizer', 'ner'),
+    'noun_chunks': ('lemmatizer', 'ner'),
+    'full': ()
+}
+
+_lock = threading.Lock()
+_pipelines = {}
+
+# Seconds spent loading each pipeline, for reporting
+load_times = {}
+
+
+def _load_once(key, loader):
+    nlp = _pipelines.get(key)
+    if nlp is None:
+        with _lock:
+            nlp = _pipelines.get(key)
+            if nlp is None:
+                start = time.perf_counter()
+                nlp = loader()
+                load_times[key] = time.perf_counter() - start
+                _pipelines[key] = nlp
+    return nlp
+
+
+def get_nlp(model=None):
+    """Shared spaCy pipeline, loaded on first use"""
+    name = model or SPACY_MODEL
+    return _load_once(name, lambda: spacy.load(name))
+
+
+def get_sentencizer():
+    """Shared rule-based sentence splitter that needs no trained model"""
+    def build():
+        nlp = spacy.blank('en')
+        nlp.add_pipe('sentencizer')
+        return nlp
+    return _load_once('sentencizer', build)
+
+
+def disabled_components(nlp, task):
+    """Names of the loaded components that task does not need"""
+    if task not in TASK_DISABLED_COMPONENTS:
+        raise ValueError(f"Unknown NLP task '{task}'. Choose from: tokens, {', '.join(TASK_DISABLED_COMPONENTS)}")
+    return [name for name in TASK_DISABLED_COMPONENTS[task] if name in nlp.pipe_names]
+
+
+def parse(text, task='full', rule_based=False):
+    """Parse text with only the components task needs
+
+    rule_based=True splits sentences with punctuation rules instead of the
+    parser; it only applies to the 'sentences' task.
+    """
+    if task == 'sentences' and rule_based:
+        return get_sentencizer()(text)
+    nlp = get_nlp()
+    if task == 'tokens':
+        return nlp.make_doc(text)
+    return nlp(text, disable=disabled_components(nlp, task))
+
+
+def pipe(texts, task='full', rule_based=False, batch_size=64, n_process=1):
+    """Parse a stream of texts with nlp.pipe, yielding Docs in input order
+
+    n_process > 1 parses batches in worker processes.
+    """
+    if task == 'sentences' and rule_based:
+        return get_sentencizer().pipe(texts, batch_size=batch_size, n_process=n_process)
+    nlp = get_nlp()
+    if task == 'tokens':
+        return nlp.tokenizer.pipe(texts, batch_size=batch_size)
+    return nlp.pipe(texts, batch_size=batch_size, n_process=n_process,
+                    disable=disabled_components(nlp, task))
@@ -0,0 +1,120 @@
+"""
+Offline NLTK resources, loaded lazily and cached per process
+
+Nothing here downloads. Resources are looked up once in the local data
+directory (NLTK_DATA_DIR, default <repo>/nltk_data) and NLTK's usual search
+paths, including NLTK_DATA. A missing resource raises NLTKResourceError
+right away, which says how to install it. Run download_nltk_data.py on a
+machine with network access and copy the directory over to install them.
+"""
+import os
+import threading
+
+import nltk
+
+NLTK_DATA_DIR = os.environ.get(
+    'NLTK_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nltk_data')
+)
+
+# The sentence tokenizer data the installed nltk loads: releases with
+# PunktTokenizer (3.8.2 and later) read punkt_tab, older ones the pickled punkt
+if hasattr(nltk.tokenize, 'PunktTokenizer'):
+    PUNKT_PACKAGE, PUNKT_PATH = 'punkt_tab', 'tokenizers/punkt_tab/english/'
+else:
+    PUNKT_PACKAGE, PUNKT_PATH = 'punkt', 'tokenizers/punkt/english.pickle'
+
+# Package name -> data paths that satisfy it, newest format first
+NLTK_RESOURCES = {
+    'vader_lexicon': ('sentiment/vader_lexicon.zip', 'sentiment/vader_lexicon'),
+    'stopwords': ('corpora/stopwords',),
+    PUNKT_PACKAGE: (PUNKT_PATH,)
+}
+
+_lock = threading.Lock()
+_found = set()
+_cache = {}
+_data_dir_added = False
+
+
+class NLTKResourceError(LookupError):
+    """A required NLTK resource is not installed locally"""
+
+    def __init__(self, name):
+        self.name = name
+        super().__init__(
+            f"NLTK resource '{name}' is not installed. Searched: {', '.join(nltk.data.path)}. "
+            f"Network downloads are disabled; run download_nltk_data.py where network access "
+            f"is available and copy the data to {NLTK_DATA_DIR} (or point NLTK_DATA at it)."
+        )
+
+
+def _add_data_dir():
+    global _data_dir_added
+    if not _data_dir_added:
+        if os.path.isdir(NLTK_DATA_DIR) and NLTK_DATA_DIR not in nltk.data.path:
+            nltk.data.path.insert(0, NLTK_DATA_DIR)
+        _data_dir_added = True
+
+
+def require(name):
+    """Check that an NLTK package is installed locally, without downloading"""
+    if name in _found:
+        return
+    with _lock:
+        _add_data_dir()
+        for path in NLTK_RESOURCES[name]:
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                continue
+            _found.add(name)
+            return
+    raise NLTKResourceError(name)
+
+
+def _cached(key, build):
+    value = _cache.get(key)
+    if value is None:
+        value = build()
+        with _lock:
+            value = _cache.setdefault(key, value)
+    return value
+
+
+def get_sentiment_analyzer():
+    """Shared VADER analyzer, loaded on first use"""
+    def build():
+        require('vader_lexicon')
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+    return _cached('vader', build)
+
+
+def get_batch_sentiment_analyzer():
+    """Shared numpy batch version of the VADER analyzer"""
+    def build():
+        from analysis.batch_sentiment import BatchSentimentAnalyzer
+        return BatchSentimentAnalyzer(get_sentiment_analyzer())
+    return _cached('vader_batch', build)
+
+
+def get_stopwords(language='english'):
+    """Shared stopword set for language"""
+    def build():
+        require('stopwords')
+        from nltk.corpus import stopwords
+        return frozenset(stopwords.words(language))
+    return _cached(('stopwords', language), build)
+
+
+def sent_tokenize(text):
+    """nltk.sent_tokenize after checking punkt is installed"""
+    require(PUNKT_PACKAGE)
+    return nltk.tokenize.sent_tokenize(text)
+
+
+def word_tokenize(text):
+    """nltk.word_tokenize after checking punkt is installed"""
+    require(PUNKT_PACKAGE)
+    return nltk.tokenize.word_tokenize(text)
@@ -0,0 +1,109 @@
+"""
+Parsed documents shared by every analysis of the same text
+
+get_parsed_document parses a text once and keeps the result in a bounded
+LRU cache keyed by a hash of the exact text, so the analysis ESGScorer and
+NLPAnalyzer methods all read the same tokens, sentences, noun chunks and
+sentiment instead of re-running spaCy and VADER.
+"""
+import hashlib
+import time
+from functools import cached_property
+
+from analysis.nlp_resources import parse, pipe
+from analysis.nltk_resources import get_batch_sentiment_analyzer
+from analysis.sentence_memo import sentiment_memo
+from models.score_cache import ScoreCache
+
+# Parsed documents kept per process
+document_cache = ScoreCache(maxsize=128, ttl=None)
+
+
+class ParsedDocument:
+    """One parse of a text, reduced to plain Python data
+
+    Sentences come from the dependency parser, or from the rule-based
+    sentencizer when rule_based_sentences is set; in that case the noun
+    chunks are parsed on first use. doc may hold an existing spaCy parse of
+    text, e.g. from nlp.pipe.
+    """
+
+    def __init__(self, text, rule_based_sentences=False, doc=None):
+        self.text = text
+        self.rule_based_sentences = rule_based_sentences
+
+        if doc is None:
+            task = 'sentences' if rule_based_sentences else 'noun_chunks'
+            doc = parse(text, task, rule_based=rule_based_sentences)
+        if not rule_based_sentences:
+            self.noun_chunks = [chunk.text.strip() for chunk in doc.noun_chunks]
+
+        self.tokens = [token.text for token in doc]
+        self.sentence_spans = [(sent.start_char, sent.end_char) for sent in doc.sents]
+        self.sentences = [sent.text for sent in doc.sents]
+        self.lower_sentences = [sentence.lower() for sentence in self.sentences]
+        # Lowercased alphabetic, non-stopword tokens of each sentence
+        self.sentence_words = [
+            [token.lower_ for token in sent if token.is_alpha and not token.is_stop]
+            for sent in doc.sents
+        ]
+
+    @cached_property
+    def noun_chunks(self):
+        doc = parse(self.text, 'noun_chunks')
+        return [chunk.text.strip() for chunk in doc.noun_chunks]
+
+    @cached_property
+    def sentiment(self):
+        """VADER polarity scores of the whole text"""
+        return get_batch_sentiment_analyzer().polarity_scores([self.text])[0]
+
+    @cached_property
+    def sentence_sentiment(self):
+        """VADER polarity scores of each sentence, memoized across documents"""
+        return sentiment_memo(self.sentences)
+
+
+def _cache_key(text, rule_based_sentences):
+    payload = f"{int(rule_based_sentences)}\0{text}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_parsed_document(text, rule_based_sentences=False):
+    """Parsed document for text, parsing it only on a cache miss
+
+    A ParsedDocument passed in is returned unchanged.
+    """
+    if isinstance(text, ParsedDocument):
+        return text
+
+    key = _cache_key(text, rule_based_sentences)
+    document = document_cache.get(key)
+    if document is None:
+        document = ParsedDocument(text, rule_based_sentences)
+        document_cache.put(key, document)
+    return document
+
+
+def parse_corpus(texts, rule_based_sentences=False, batch_size=64, n_process=1, stats=None):
+    """Yield a ParsedDocument for each text, parsing the corpus with nlp.pipe
+
+    texts can be any iterable, including a generator; documents are yielded
+    as soon as their batch is parsed and are also added to the document
+    cache. If a stats dict is given it is updated with 'documents',
+    'seconds' and 'docs_per_sec' as documents stream out.
+    """
+    texts = (text or '' for text in texts)
+    task = 'sentences' if rule_based_sentences else 'noun_chunks'
+    start = time.perf_counter()
+    count = 0
+    for doc in pipe(texts, task, rule_based=rule_based_sentences,
+                    batch_size=batch_size, n_process=n_process):
+        document = ParsedDocument(doc.text, rule_based_sentences, doc=doc)
+        document_cache.put(_cache_key(doc.text, rule_based_sentences), document)
+        count += 1
+        if stats is not None:
+            elapsed = time.perf_counter() - start
+            stats.update(documents=count, seconds=elapsed,
+                         docs_per_sec=count / elapsed if elapsed > 0 else 0.0)
+        yield document
@@ -0,0 +1,81 @@
+"""
+Per-sentence results memoized across documents
+
+Reports and project updates repeat boilerplate: disclaimers, standard
+governance paragraphs, copy-pasted descriptions. A SentenceMemo keeps the
+result of a per-sentence computation under a hash of the sentence in a
+bounded LRU cache (models/score_cache), so a sentence seen in any earlier
+document, or earlier in the same batch, is not scored again. stats()
+reports the dedup ratio: the share of sentences looked up that did not
+need computing. Callers get deep copies of the memoized results, so editing
+one does not change what later documents see.
+"""
+import copy
+import hashlib
+import threading
+
+from analysis.nltk_resources import get_batch_sentiment_analyzer
+from models.score_cache import ScoreCache
+
+
+class SentenceMemo:
+    """Memoizes compute, a function from a list of sentences to a list of results"""
+
+    def __init__(self, compute, maxsize=50_000):
+        self.compute = compute
+        self.cache = ScoreCache(maxsize=maxsize, ttl=None)
+        self._lock = threading.Lock()
+        self.sentences = 0
+        self.computed = 0
+
+    @staticmethod
+    def make_key(sentence):
+        return hashlib.blake2b(sentence.encode('utf-8'), digest_size=16).digest()
+
+    def __call__(self, sentences):
+        """Results for sentences, computing each distinct unseen sentence once"""
+        sentences = list(sentences)
+        keys = [self.make_key(sentence) for sentence in sentences]
+        results = [self.cache.get(key) for key in keys]
+
+        missing = {}
+        for key, sentence, result in zip(keys, sentences, results):
+            if result is None:
+                missing.setdefault(key, sentence)
+        if missing:
+            computed = dict(zip(missing, self.compute(list(missing.values()))))
+            for key, result in computed.items():
+                self.cache.put(key, result)
+            results = [computed[key] if result is None else result
+                       for key, result in zip(keys, results)]
+        results = [copy.deepcopy(result) for result in results]
+
+        with self._lock:
+            self.sentences += len(sentences)
+            self.computed += len(missing)
+        return results
+
+    def stats(self):
+        """Sentences looked up and computed, the dedup ratio and cache counters"""
+        stats = self.cache.stats()
+        with self._lock:
+            stats.update(
+                sentences=self.sentences,
+                computed=self.computed,
+                dedup_ratio=1 - self.computed / self.sentences if self.sentences else 0.0
+            )
+        return stats
+
+    def clear(self):
+        """Drop every memoized result and reset the counters"""
+        self.cache.clear()
+        with self._lock:
+            self.sentences = self.computed = 0
+
+
+def _polarity_scores(sentences):
+    return get_batch_sentiment_analyzer().polarity_scores(sentences)
+
+
+# VADER scores of every sentence seen in this process, shared by all analyzers
+sentiment_memo = SentenceMemo(_polarity_scores)
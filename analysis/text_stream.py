@@ -0,0 +1,70 @@
+"""
+Sentence-aligned chunking for reports too large to analyze in one piece
+
+iter_text_chunks reads a file or an iterable of strings incrementally and
+yields chunks of about chunk_chars characters that end at a sentence
+boundary, so analyzers can process each chunk on its own and merge the
+partial results. Only the current chunk and one read buffer are in memory.
+"""
+import os
+import re
+
+# End of a sentence: terminal punctuation, optional closing quotes or
+# brackets, then whitespace
+SENTENCE_END = re.compile(r'[.!?]["\')\]]*\s+')
+WHITESPACE = re.compile(r'\s+')
+
+
+def _iter_pieces(source, read_size):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r', encoding='utf-8', errors='replace') as f:
+            yield from _iter_pieces(f, read_size)
+    elif hasattr(source, 'read'):
+        while True:
+            piece = source.read(read_size)
+            if not piece:
+                break
+            yield piece
+    else:
+        for piece in source:
+            if piece:
+                yield piece
+
+
+def _last_match_end(pattern, text, start, end):
+    last = None
+    for match in pattern.finditer(text, start, end):
+        last = match.end()
+    return last
+
+
+def _find_cut(buffer, offset, chunk_chars):
+    """Where to end the chunk starting at offset: the last sentence end within
+    chunk_chars, else the last whitespace, else offset + chunk_chars"""
+    # Only look at the second half so chunks stay reasonably large
+    start, end = offset + chunk_chars // 2, offset + chunk_chars
+    cut = _last_match_end(SENTENCE_END, buffer, start, end)
+    if cut is None:
+        cut = _last_match_end(WHITESPACE, buffer, start, end)
+    return cut or end
+
+
+def iter_text_chunks(source, chunk_chars=100_000, read_size=65_536):
+    """Yield sentence-aligned chunks of text from source
+
+    source is a file path, an open text file or an iterable of strings (a
+    plain string would be taken as a path; wrap text in a list). A chunk is
+    only cut mid-sentence when no sentence end occurs in its second half.
+    """
+    # Chunks are sliced from buffer at a moving offset; the unread tail (less
+    # than chunk_chars) is only copied once per piece, when the next piece
+    # is appended, so one very large piece is not re-copied for every chunk
+    buffer, offset = '', 0
+    for piece in _iter_pieces(source, read_size):
+        buffer, offset = buffer[offset:] + piece, 0
+        while len(buffer) - offset >= chunk_chars:
+            cut = _find_cut(buffer, offset, chunk_chars)
+            yield buffer[offset:cut]
+            offset = cut
+    if buffer[offset:].strip():
+        yield buffer[offset:]
@@ -12,11 +12,15 @@ import dash
 from dash import html, dcc
 from dash.dependencies import Input, Output, State
 import plotly.express as px
+import plotly.graph_objects as go
 
 # Import managers
 from models.fund_seeker import FundSeekerManager
 from models.real_time_manager import RealTimeManager
 from models.esg_scorer import ESGScorer
+from models.esg_table import ESGScoreTable
+from models.esg_pipeline import ESGScoringPipeline
+from models.esg_incremental import IncrementalESGAnalyzer
 from models.nlp_analyzer import NLPAnalyzer
 from models.investment_optimizer import InvestmentOptimizer
 from models.admin import AdminManager
@@ -30,12 +34,24 @@ login_manager.login_view = 'home'
 socketio = SocketIO(server, cors_allowed_origins="*")
 
 # Initialize managers
-fund_seeker_manager = FundSeekerManager()
+fund_seeker_manager = FundSeekerManager(text_analyzer=IncrementalESGAnalyzer())
 real_time_manager = RealTimeManager(socketio)
 esg_scorer = ESGScorer()
 nlp_analyzer = NLPAnalyzer()
 optimizer = InvestmentOptimizer()
 admin_manager = AdminManager()
+esg_table = ESGScoreTable(esg_scorer.feature_names)
+# Scoring runs on a thread pool (see __main__ for ESG_PIPELINE_PROCESSES); results
+# are applied on a SocketIO background task under the project store's lock
+esg_pipeline = ESGScoringPipeline(
+    esg_scorer,
+    fund_seeker_manager=fund_seeker_manager,
+    real_time_manager=real_time_manager,
+    esg_table=esg_table,
+    get_weights=lambda: admin_manager.esg_weights,
+    lock=fund_seeker_manager.lock,
+    task_runner=socketio
+)
 
 class User(UserMixin):
     def __init__(self, user_id, role):
@@ -75,6 +91,12 @@ try:
 except Exception as e:
     print(f"Error initializing ESG model: {str(e)}")
 
+# Make sure every stored project has a row in the columnar ESG table
+try:
+    esg_table.sync_projects(fund_seeker_manager.projects, esg_scorer)
+except Exception as e:
+    print(f"Error syncing ESG table: {str(e)}")
+
 # Create Dash app
 app = dash.Dash(__name__, server=server, url_base_pathname='/dashboard/')
 
@@ -96,7 +118,8 @@ app.layout = html.Div([
     # ESG Scores Display
     html.Div([
         html.H3("ESG Analysis Results"),
-        dcc.Graph(id='esg-scores-graph')
+        dcc.Graph(id='esg-scores-graph'),
+        dcc.Graph(id='esg-contributions-graph')
     ]),
     
     # Portfolio Optimization Section
@@ -126,18 +149,19 @@ app.layout = html.Div([
 
 # Callbacks
 @app.callback(
-    Output('esg-scores-graph', 'figure'),
+    [Output('esg-scores-graph', 'figure'),
+     Output('esg-contributions-graph', 'figure')],
     [Input('analyze-button', 'n_clicks')],
     [State('project-description', 'value')]
 )
 def update_esg_analysis(n_clicks, description):
     if n_clicks is None or not description:
-        # Return empty figure if no input
-        return go.Figure()
+        # Return empty figures if no input
+        return go.Figure(), go.Figure()
     
     try:
         # Score the project using the description
-        scores = esg_scorer.score_project_description(description)
+        scores = esg_scorer.score_project_description(description, explain=True)
         
         if scores is None:
             raise ValueError("Failed to generate ESG scores")
@@ -166,12 +190,31 @@ def update_esg_analysis(n_clicks, description):
             showlegend=False
         )
         
-        return fig
+        # Show how much each extracted metric moved the ESG score
+        if 'feature_contributions' not in scores:
+            return fig, go.Figure()
+        contributions = scores['feature_contributions']
+        contribution_fig = go.Figure(data=[
+            go.Bar(
+                x=list(contributions.values()),
+                y=list(contributions.keys()),
+                orientation='h',
+                marker_color=['#2ca02c' if v >= 0 else '#d62728' for v in contributions.values()]
+            )
+        ])
+        
+        contribution_fig.update_layout(
+            title=f"Score drivers (baseline {scores['base_value']:.1f})",
+            xaxis_title='Contribution to ESG Score',
+            showlegend=False
+        )
+        
+        return fig, contribution_fig
         
     except Exception as e:
         print(f"Error in ESG analysis: {str(e)}")
-        # Return empty figure on error
-        return go.Figure()
+        # Return empty figures on error
+        return go.Figure(), go.Figure()
 
 @app.callback(
     Output('optimization-results', 'figure'),
@@ -355,12 +398,19 @@ def submit_project():
                 {
                     'name': project['name'],
                     'description': project['description'],
-                    'funding_required': project['funding_required']
+                    'funding_required': project['funding_required'],
+                    'possible_duplicates': fund_seeker_manager.get_possible_duplicates(project['id'])
                 }
             )
         except Exception as e:
             print(f"Error notifying admins (non-critical): {str(e)}")
         
+        # Score the project in the background; the room is notified when done
+        try:
+            esg_pipeline.submit(project)
+        except Exception as e:
+            print(f"Error queueing ESG scoring (non-critical): {str(e)}")
+        
         flash('Project submitted successfully!', 'success')
         return redirect(url_for('fund_seeker_dashboard'))
         
@@ -474,15 +524,37 @@ def update_esg_params():
     )
     
     if success:
-        # Notify all users about ESG parameter changes
-        real_time_manager.notify_esg_parameter_change({
+        new_params = {
             'env_weight': data['env_weight'],
             'social_weight': data['social_weight'],
             'gov_weight': data['gov_weight']
-        })
+        }
+        
+        # Notify all users about ESG parameter changes
+        real_time_manager.notify_esg_parameter_change(new_params)
+        
+        # Recompute every project's composite score from the stored components
+        try:
+            # The scoring pipeline writes to the table under the same lock
+            with fund_seeker_manager.lock:
+                esg_table.sync_projects(fund_seeker_manager.projects, esg_scorer)
+                scores = esg_table.rescore(new_params)
+                fund_seeker_manager.update_esg_scores(scores)
+            real_time_manager.notify_esg_scores_rescored(scores, new_params)
+        except Exception as e:
+            print(f"Error rescoring projects (non-critical): {str(e)}")
     
     return jsonify({'success': success})
 
+@server.route('/admin/duplicates')
+@login_required
+def get_duplicate_report():
+    if current_user.role != 'admin':
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    report = fund_seeker_manager.get_duplicate_report()
+    return jsonify({'groups': len(report), 'duplicates': report})
+
 # Analytics Routes
 @server.route('/admin/analytics/user-growth')
 @login_required
@@ -546,11 +618,47 @@ def get_project_details(project_id):
         project = fund_seeker_manager.get_project_by_id(project_id)
         if project is None:
             return jsonify({'error': 'Project not found'}), 404
-        return jsonify(project)
+        details = fund_seeker_manager.public_project(project)
+        details['similar_projects'] = fund_seeker_manager.get_similar_projects(project_id)
+        return jsonify(details)
     except Exception as e:
         print(f"Error getting project details: {str(e)}")
         return jsonify({'error': 'Server error'}), 500
 
+@server.route('/api/projects/search')
+@login_required
+def search_projects():
+    if current_user.role != 'investor':
+        return jsonify({'error': 'Unauthorized'}), 403
+    
+    try:
+        min_score = request.args.get('min_score', type=float)
+        results = fund_seeker_manager.search_projects(
+            request.args.get('q', ''),
+            category=request.args.get('category') or None,
+            min_score=min_score,
+            page=request.args.get('page', 1, type=int),
+            per_page=min(request.args.get('per_page', 20, type=int), 100)
+        )
+        return jsonify(results)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"Error searching projects: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
+
+@server.route('/api/projects/<project_id>/esg-history')
+@login_required
+def get_project_esg_history(project_id):
+    try:
+        history = fund_seeker_manager.get_score_history(project_id)
+        if history is None:
+            return jsonify({'error': 'Project not found'}), 404
+        return jsonify({'project_id': project_id, 'history': history})
+    except Exception as e:
+        print(f"Error getting ESG history: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
+
 @server.route('/investor/submit-feedback', methods=['POST'])
 @login_required
 def submit_feedback():
@@ -646,6 +754,9 @@ def optimize_portfolio():
     return jsonify(optimization_results)
 
 if __name__ == '__main__':
+    # Opt in to worker processes with ESG_PIPELINE_PROCESSES=1. The pool is only
+    # created on the first scored project, so importing app.py never starts one
+    esg_pipeline.use_processes = os.getenv('ESG_PIPELINE_PROCESSES') == '1'
     try:
         # Try different ports if the default one is in use
         ports = [5001, 5002, 5003, 5004, 5005]
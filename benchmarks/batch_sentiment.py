@@ -0,0 +1,47 @@
+"""
+Sentence sentiment throughput: VADER per sentence vs BatchSentimentAnalyzer
+
+Scores the sentences of a synthetic report with polarity_scores one at a
+time (as the analyzers did) and with the numpy batch engine, both as full
+score dicts and as compound scores only, and checks the results agree.
+
+Run from the repository root:
+    python -m benchmarks.batch_sentiment --sizes 0.1 1
+"""
+import argparse
+import time
+
+from analysis.batch_sentiment import BatchSentimentAnalyzer
+from analysis.nltk_resources import get_sentiment_analyzer
+from benchmarks.metric_extraction import make_document
+
+
+def run_benchmark(sizes):
+    sia = get_sentiment_analyzer()
+    print(f"{'size MB':>8} {'sentences':>10} {'vader/s':>10} {'batch/s':>10} {'compound/s':>11} "
+          f"{'speedup':>8} {'match':>6}")
+    for size_mb in sizes:
+        sentences = make_document(size_mb).split('. ')
+        # A fresh engine, so the timing includes building its vocabulary
+        batch = BatchSentimentAnalyzer(sia)
+
+        start = time.perf_counter()
+        expected = [sia.polarity_scores(sentence) for sentence in sentences]
+        vader = time.perf_counter() - start
+        start = time.perf_counter()
+        result = batch.polarity_scores(sentences)
+        batched = time.perf_counter() - start
+        start = time.perf_counter()
+        batch.compound_scores(sentences)
+        compound = time.perf_counter() - start
+
+        n = len(sentences)
+        print(f"{size_mb:>8} {n:>10} {n / vader:>10.0f} {n / batched:>10.0f} {n / compound:>11.0f} "
+              f"{vader / batched:>7.1f}x {str(result == expected):>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.1, 1])
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
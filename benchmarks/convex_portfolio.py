@@ -0,0 +1,72 @@
+"""
+Volatility-limited portfolios: convex mode against SLSQP
+
+Times GreenPortfolioOptimizer.optimize_portfolio with max_volatility (the
+convex mode) over a sweep of volatility limits between the
+minimum-variance portfolio and the unconstrained LP optimum, as the
+dashboard's scenarios do. The first sweep includes the LP and the
+minimum-variance solve; the second repeats the limits against the
+cached problem. Each limit is also solved from scratch by scipy's SLSQP
+on the same problem, and the objectives are compared.
+
+Run from the repository root:
+    python -m benchmarks.convex_portfolio --assets 5 10 15 --limits 50
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.optimize import minimize
+
+from benchmarks.efficient_frontier import make_universe
+from optimization.portfolio_optimizer import GreenPortfolioOptimizer
+
+
+def slsqp_objective(returns, esg, cov, min_esg, max_volatility):
+    constraints = [{'type': 'eq', 'fun': lambda w: w.sum() - 1},
+                   {'type': 'ineq', 'fun': lambda w: esg @ w - min_esg},
+                   {'type': 'ineq', 'fun': lambda w: max_volatility ** 2 - w @ cov @ w}]
+    result = minimize(lambda w: -(returns + esg) @ w, np.full(len(returns), 1 / len(returns)),
+                      bounds=[(0.05, 0.4)] * len(returns), constraints=constraints, method='SLSQP',
+                      options={'ftol': 1e-12, 'maxiter': 1000})
+    return -result.fun if result.success else np.nan
+
+
+def run_benchmark(num_assets, num_limits, min_esg):
+    expected_returns, esg_scores, covariance = make_universe(num_assets)
+    returns = np.array(list(expected_returns.values()))
+    esg = np.array(list(esg_scores.values()))
+
+    # The range where the limit binds, from a separate optimizer
+    probe = GreenPortfolioOptimizer()
+    highest = probe.optimize_portfolio(expected_returns, esg_scores, covariance, 1.0, min_esg)['volatility']
+    probe.optimize_portfolio(expected_returns, esg_scores, covariance, 1.0, min_esg, max_volatility=0.0)
+    lowest = next(iter(probe._convex_problems.values()))['path'][0]['volatility']
+    limits = np.linspace(lowest, highest, num_limits + 2)[1:-1]
+
+    optimizer = GreenPortfolioOptimizer()
+    times, objectives = [], None
+    for _ in range(2):
+        start = time.perf_counter()
+        results = [optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1.0, min_esg,
+                                                max_volatility=limit) for limit in limits]
+        times.append(time.perf_counter() - start)
+        objectives = np.array([result['expected_return'] + result['esg_score'] for result in results])
+
+    start = time.perf_counter()
+    reference = np.array([slsqp_objective(returns, esg, covariance.values, min_esg, limit) for limit in limits])
+    slsqp_time = time.perf_counter() - start
+
+    print(f"{num_assets} assets, {num_limits} limits in [{lowest:.4f}, {highest:.4f}]: "
+          f"convex {times[0] * 1e3:.1f}ms (repeat {times[1] * 1e3:.1f}ms), SLSQP {slsqp_time * 1e3:.0f}ms, "
+          f"max objective gap {np.nanmax(np.abs(objectives - reference)):.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--assets', type=int, nargs='+', default=[5, 10, 15])
+    parser.add_argument('--limits', type=int, default=50)
+    parser.add_argument('--min-esg', type=float, default=0.6)
+    args = parser.parse_args()
+    for num_assets in args.assets:
+        run_benchmark(num_assets, args.limits, args.min_esg)
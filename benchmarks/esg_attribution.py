@@ -0,0 +1,50 @@
+"""
+Latency of per-feature ESG score attribution
+
+Reports explainer build time, single-row latency percentiles (the
+interactive dashboard case) and batch throughput.
+
+Run from the repository root:
+    python -m benchmarks.esg_attribution --rows 1000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from models.esg_scorer import ESGScorer
+
+
+def run_benchmark(n_rows, repeats):
+    scorer = ESGScorer(backend='random_forest')
+    scorer.train()
+    X, _ = scorer.generate_synthetic_data(n_samples=n_rows)
+    X_scaled = scorer.backend.scaler.transform(X.values)
+
+    start = time.perf_counter()
+    explainer = scorer.backend.explainer
+    build_time = time.perf_counter() - start
+    print(f"Explainer build: {build_time * 1000:.1f} ms for {len(explainer.leaf_values)} leaves")
+
+    latencies = []
+    for i in range(repeats):
+        row = X_scaled[i % n_rows:i % n_rows + 1]
+        start = time.perf_counter()
+        explainer.shap_values(row)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    print(f"Single row: p50 {np.percentile(latencies, 50):.2f} ms, "
+          f"p99 {np.percentile(latencies, 99):.2f} ms")
+
+    start = time.perf_counter()
+    explainer.shap_values(X_scaled)
+    batch_time = time.perf_counter() - start
+    print(f"Batch of {n_rows}: {batch_time:.2f} s ({n_rows / batch_time:.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=100)
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeats)
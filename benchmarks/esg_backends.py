@@ -0,0 +1,79 @@
+"""
+Compare the ESG model backends on the synthetic training data
+
+For each backend reports fit time, single-row prediction latency (p50/p99,
+the interactive scoring case), batch latency, pickled model size and
+holdout error, so the backend can be chosen by measurement.
+
+Run from the repository root:
+    python -m benchmarks.esg_backends --samples 2000 --batch 10000
+    ESG_MODEL_BACKEND=<name> python app.py   # to use the chosen backend
+"""
+import argparse
+import pickle
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from models.esg_backends import ESG_BACKENDS, make_backend
+from models.esg_scorer import ESGScorer
+
+
+def measure_backend(name, X_train, X_test, y_train, y_test, X_batch, repeats):
+    backend = make_backend(name)
+
+    start = time.perf_counter()
+    backend.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+
+    latencies = []
+    for i in range(repeats):
+        row = X_test[i % len(X_test):i % len(X_test) + 1]
+        start = time.perf_counter()
+        backend.predict(row)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+
+    start = time.perf_counter()
+    backend.predict(X_batch)
+    batch_time = time.perf_counter() - start
+
+    errors = backend.predict(X_test) - y_test
+    return {
+        'fit_s': fit_time,
+        'p50_ms': np.percentile(latencies, 50),
+        'p99_ms': np.percentile(latencies, 99),
+        'batch_ms': batch_time * 1000,
+        'size_kb': len(pickle.dumps(backend)) / 1024,
+        'mae': np.abs(errors).mean(),
+        'rmse': np.sqrt((errors ** 2).mean())
+    }
+
+
+def run_benchmark(backends, n_samples, batch_size, repeats):
+    scorer = ESGScorer(backend='formula')
+    X, y = scorer.generate_synthetic_data(n_samples=n_samples)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X.values, y, test_size=0.2, random_state=42
+    )
+    X_batch, _ = scorer.generate_synthetic_data(n_samples=batch_size)
+    X_batch = X_batch.values
+
+    print(f"{n_samples} training samples, batch of {batch_size}")
+    print(f"{'backend':<24} {'fit s':>8} {'p50 ms':>8} {'p99 ms':>8} {'batch ms':>9} "
+          f"{'size KB':>9} {'MAE':>7} {'RMSE':>7}")
+    for name in backends:
+        r = measure_backend(name, X_train, X_test, y_train, y_test, X_batch, repeats)
+        print(f"{name:<24} {r['fit_s']:>8.3f} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f} "
+              f"{r['batch_ms']:>9.1f} {r['size_kb']:>9.1f} {r['mae']:>7.3f} {r['rmse']:>7.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--backends', nargs='+', default=list(ESG_BACKENDS), choices=list(ESG_BACKENDS))
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+    run_benchmark(args.backends, args.samples, args.batch, args.repeats)
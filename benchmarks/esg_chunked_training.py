@@ -0,0 +1,71 @@
+"""
+Memory and speed of chunked ESG model training on large synthetic sets
+
+Each configuration runs in a fresh interpreter, because the peak resident
+set size reported by getrusage covers the whole process lifetime. The
+in-memory mode builds the full DataFrame and calls fit, as train() does;
+the chunked mode streams generator chunks through train_chunked.
+
+Run from the repository root:
+    python -m benchmarks.esg_chunked_training --rows 1000000 10000000 --backends ridge
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from models.esg_scorer import ESGScorer, peak_rss_mb
+
+
+def run_single(mode, backend, n_rows, chunk_size):
+    scorer = ESGScorer(backend=backend)
+    X_val, y_val = scorer.generate_synthetic_data(n_samples=10_000, random_state=7)
+
+    if mode == 'chunked':
+        stats = scorer.train_chunked(n_samples=n_rows, chunk_size=chunk_size,
+                                     validation_data=(X_val.values, y_val))
+        seconds, mae = stats['seconds'], stats['validation_mae']
+    else:
+        start = time.perf_counter()
+        X, y = scorer.generate_synthetic_data(n_samples=n_rows)
+        scorer.backend.fit(X.values, y)
+        seconds = time.perf_counter() - start
+        mae = float(np.abs(scorer.backend.predict(X_val.values) - y_val).mean())
+
+    print(f"RESULT {mode:<10} {backend:<14} {n_rows:>11} {seconds:>9.1f} "
+          f"{n_rows / seconds:>12.0f} {peak_rss_mb():>9.0f} {mae:>8.4f}")
+
+
+def run_benchmark(rows, backends, modes, chunk_size):
+    print(f"{'mode':<10} {'backend':<14} {'rows':>11} {'seconds':>9} {'rows/sec':>12} "
+          f"{'peak MB':>9} {'val MAE':>8}")
+    for n_rows in rows:
+        for backend in backends:
+            for mode in modes:
+                output = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.esg_chunked_training', '--single',
+                     '--mode', mode, '--backends', backend, '--rows', str(n_rows),
+                     '--chunk-size', str(chunk_size)],
+                    capture_output=True, text=True
+                ).stdout
+                for line in output.splitlines():
+                    if line.startswith('RESULT '):
+                        print(line[len('RESULT '):])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000])
+    parser.add_argument('--backends', nargs='+', default=['ridge', 'random_forest'])
+    parser.add_argument('--modes', nargs='+', default=['in-memory', 'chunked'],
+                        choices=['in-memory', 'chunked'])
+    parser.add_argument('--mode', default='chunked', choices=['in-memory', 'chunked'])
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--single', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.single:
+        run_single(args.mode, args.backends[0], args.rows[0], args.chunk_size)
+    else:
+        run_benchmark(args.rows, args.backends, args.modes, args.chunk_size)
@@ -0,0 +1,43 @@
+"""
+Cost of re-scoring a project's text after an update: full rebuild vs merge
+
+Grows a project with synthetic updates and, at each checkpoint, times
+re-analyzing all of its text from scratch (IncrementalESGAnalyzer.initialize)
+against merging only the newest update (add_text).
+
+Run from the repository root:
+    python -m benchmarks.esg_incremental --updates 200 --update-kb 2
+"""
+import argparse
+import time
+
+from benchmarks.metric_extraction import make_document
+from models.esg_incremental import IncrementalESGAnalyzer
+
+
+def run_benchmark(n_updates, update_kb, checkpoints=5):
+    analyzer = IncrementalESGAnalyzer()
+    project = {'id': 'bench', 'description': make_document(update_kb / 1024, seed=0), 'updates': []}
+    analyzer.initialize(project)
+    every = max(n_updates // checkpoints, 1)
+
+    print(f"{'updates':>8} {'rebuild ms':>11} {'merge ms':>9} {'speedup':>8}")
+    for i in range(1, n_updates + 1):
+        text = make_document(update_kb / 1024, seed=i)
+        project['updates'].append({'text': text})
+        start = time.perf_counter()
+        analyzer.add_text(project, text)
+        merge = time.perf_counter() - start
+        if i % every == 0:
+            start = time.perf_counter()
+            analyzer.initialize(dict(project, text_analysis=None))
+            rebuild = time.perf_counter() - start
+            print(f"{i:>8} {rebuild * 1000:>11.1f} {merge * 1000:>9.1f} {rebuild / merge:>7.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--updates', type=int, default=200)
+    parser.add_argument('--update-kb', type=float, default=2)
+    args = parser.parse_args()
+    run_benchmark(args.updates, args.update_kb)
@@ -0,0 +1,48 @@
+"""
+Throughput of the background ESG scoring pipeline by worker count
+
+Run from the repository root:
+    python -m benchmarks.esg_pipeline --jobs 400 --workers 1 2 4
+"""
+import argparse
+import os
+import time
+
+from models.esg_pipeline import ESGScoringPipeline
+from models.esg_scorer import ESGScorer
+
+SAMPLE_TEXT = (
+    "Innovative solar farm with organic waste recycling and community education "
+    "programs. Creates 120 permanent jobs and publishes transparent quarterly "
+    "reports that meet regulation standards. "
+)
+
+
+def run_benchmark(n_jobs, worker_counts, use_processes):
+    scorer = ESGScorer()
+    scorer.train()
+    texts = [f"{SAMPLE_TEXT} Site {i}." for i in range(n_jobs)]
+
+    mode = 'processes' if use_processes else 'threads'
+    print(f"Scoring {n_jobs} projects on {mode} ({os.cpu_count()} CPUs)")
+    print(f"{'workers':>8} {'seconds':>10} {'jobs/sec':>10}")
+    for workers in worker_counts:
+        pipeline = ESGScoringPipeline(scorer, max_workers=workers, use_processes=use_processes)
+        # Warm the pool up so process start-up and worker training are not timed
+        pipeline.score_texts(texts[:workers])
+
+        start = time.perf_counter()
+        pipeline.score_texts(texts)
+        elapsed = time.perf_counter() - start
+        pipeline.shutdown()
+        print(f"{workers:>8} {elapsed:>10.3f} {n_jobs / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=400)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', action='store_true',
+                        help='use the thread pool instead of worker processes')
+    args = parser.parse_args()
+    run_benchmark(args.jobs, args.workers, use_processes=not args.threads)
@@ -0,0 +1,115 @@
+"""
+ESG keyword counting on large reports: per-keyword scans vs KeywordMatcher
+
+Compares, on the same lowercased report text:
+- analysis ESGScorer keyword scoring for all three categories (previously
+  a `keyword in text` check plus text.count per keyword and category)
+- models NLPAnalyzer keyword frequencies (previously every word checked
+  against every keyword)
+
+Run from the repository root:
+    python -m benchmarks.keyword_matching --sizes 0.1 1
+"""
+import argparse
+import random
+import time
+
+from analysis.keyword_matcher import KeywordMatcher
+from benchmarks.metric_extraction import make_document
+
+ESG_KEYWORDS = {
+    'environmental': {'climate': 0.8, 'emissions': 0.7, 'renewable': 0.8, 'sustainable': 0.6,
+                      'pollution': 0.7, 'biodiversity': 0.6, 'waste': 0.5, 'energy': 0.7,
+                      'water': 0.6, 'conservation': 0.5},
+    'social': {'community': 0.7, 'health': 0.8, 'safety': 0.8, 'diversity': 0.7, 'inclusion': 0.7,
+               'human rights': 0.9, 'labor': 0.6, 'education': 0.6, 'poverty': 0.7, 'equality': 0.8},
+    'governance': {'transparency': 0.9, 'compliance': 0.8, 'ethics': 0.8, 'corruption': 0.9,
+                   'accountability': 0.8, 'risk': 0.7, 'stakeholder': 0.6, 'board': 0.7,
+                   'regulation': 0.7, 'disclosure': 0.8}
+}
+WORD_KEYWORDS = {
+    'environmental': ['renewable', 'sustainable', 'green', 'emission', 'carbon',
+                      'climate', 'environmental', 'recycling', 'biodiversity'],
+    'social': ['community', 'diversity', 'inclusion', 'employee', 'safety',
+               'health', 'human rights', 'labor', 'education'],
+    'governance': ['transparency', 'compliance', 'ethics', 'board', 'corruption',
+                   'risk management', 'stakeholder', 'accountability']
+}
+
+
+def reference_keyword_scores(text):
+    scores = {}
+    for category, keywords in ESG_KEYWORDS.items():
+        score = total_weight = 0
+        for keyword, weight in keywords.items():
+            if keyword in text:
+                score += text.count(keyword) * weight
+                total_weight += weight
+        scores[category] = score / total_weight if total_weight > 0 else 0
+    return scores
+
+
+def matcher_keyword_scores(matcher, text):
+    counts = matcher.count(text)
+    scores = {}
+    for category, keywords in ESG_KEYWORDS.items():
+        score = total_weight = 0
+        for keyword, weight in keywords.items():
+            if counts[keyword]:
+                score += counts[keyword] * weight
+                total_weight += weight
+        scores[category] = score / total_weight if total_weight > 0 else 0
+    return scores
+
+
+def reference_word_counts(words):
+    return {
+        category: sum(1 for word in words if any(keyword in word for keyword in keywords))
+        for category, keywords in WORD_KEYWORDS.items()
+    }
+
+
+def make_report(size_mb, seed=42):
+    """Synthetic report with ESG keywords mixed into ordinary sentences"""
+    rng = random.Random(seed)
+    vocabulary = [k for keywords in ESG_KEYWORDS.values() for k in keywords]
+    words = make_document(size_mb, seed).lower().split(' ')
+    for i in range(0, len(words), 9):
+        words[i] = rng.choice(vocabulary)
+    return ' '.join(words)
+
+
+def best_time(func, *args, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run_benchmark(sizes):
+    text_matcher = KeywordMatcher(k for keywords in ESG_KEYWORDS.values() for k in keywords)
+    word_matcher = KeywordMatcher(k for keywords in WORD_KEYWORDS.values() for k in keywords)
+
+    print(f"{'size MB':>8} {'task':<16} {'before ms':>10} {'after ms':>10} {'speedup':>8} {'match':>6}")
+    for size_mb in sizes:
+        text = make_report(size_mb)
+        before, expected = best_time(reference_keyword_scores, text)
+        after, result = best_time(matcher_keyword_scores, text_matcher, text)
+        print(f"{size_mb:>8} {'text scores':<16} {before:>10.1f} {after:>10.1f} "
+              f"{before / after:>7.1f}x {str(result == expected):>6}")
+
+        words = text.split()
+        before, expected = best_time(reference_word_counts, words, repeats=1)
+        after, result = best_time(word_matcher.count_words, words, WORD_KEYWORDS)
+        # Matches are equal apart from multi-word terms, which the old check never found
+        print(f"{size_mb:>8} {'word counts':<16} {before:>10.1f} {after:>10.1f} "
+              f"{before / after:>7.1f}x {str(result['environmental'] == expected['environmental']):>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.1, 1])
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
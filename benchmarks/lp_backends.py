@@ -0,0 +1,45 @@
+"""
+LP solver backends: in-process HiGHS against the CBC executable
+
+Solves the allocation LP of models/optimizer InvestmentOptimizer (budget,
+per-project caps and ESG floor, method='lp') at several sizes with each
+LPSolver backend and reports the median wall time of optimize_portfolio
+and the median time spent in the solver. For CBC that time includes
+writing the model file and starting the process.
+
+Run from the repository root:
+    python -m benchmarks.lp_backends --projects 10 100 1000 10000
+"""
+import argparse
+import statistics
+import time
+
+from models.lp_solvers import BACKENDS, LPSolver
+from models.optimizer import InvestmentOptimizer
+
+
+def run_benchmark(sizes, repeats, min_esg):
+    print(f"{'projects':>9} {'backend':>8} {'wall ms':>9} {'solve ms':>9} {'status':>10}")
+    for n in sizes:
+        projects = InvestmentOptimizer().generate_synthetic_projects(n)
+        budget = max(0.05 * sum(p['cost'] for p in projects), 10e6)
+        for backend in BACKENDS:
+            solver = LPSolver(backend)
+            optimizer = InvestmentOptimizer(solver=solver)
+            timings, solve_times = [], []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                result = optimizer.optimize_portfolio(projects, budget, min_esg, method='lp')
+                timings.append((time.perf_counter() - start) * 1000)
+                solve_times.append(solver.stats()['last_solve_time'] * 1000)
+            print(f"{n:>9} {backend:>8} {statistics.median(timings):>9.2f} "
+                  f"{statistics.median(solve_times):>9.2f} {result['optimization_status']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--min-esg', type=float, default=85)
+    args = parser.parse_args()
+    run_benchmark(args.projects, args.repeats, args.min_esg)
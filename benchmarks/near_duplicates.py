@@ -0,0 +1,102 @@
+"""
+Near-duplicate flagging on a large synthetic project store
+
+Builds n synthetic projects, a share of them resubmissions of an earlier
+project with small edits (extra whitespace, a changed name, a sentence
+added). Reports the time to sign and index the store, the latency of
+flagging a new submission through the LSH buckets against comparing its
+signature with every stored signature, the time of the batch report, and
+how many of the planted duplicates were found.
+
+Run from the repository root:
+    python -m benchmarks.near_duplicates --projects 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from models.near_duplicates import NearDuplicateIndex
+
+
+def make_projects(n, seed, vocabulary_size=5000):
+    """Projects written from a Zipf-distributed vocabulary of made-up words
+
+    The 60 words of benchmarks.project_search make every project share most
+    of its shingles with every other, which is not what real descriptions
+    look like.
+    """
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    vocabulary = [''.join(rng.choices(letters, k=rng.randint(3, 10))) for _ in range(vocabulary_size)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+    for i in range(n):
+        words = rng.choices(vocabulary, weights, k=rng.randint(20, 60))
+        yield {
+            'id': str(i + 1),
+            'name': ' '.join(words[:3]).title(),
+            'description': ' '.join(words[3:]),
+            'sustainability_impact': f"Creates {rng.randint(5, 500)} jobs",
+        }
+
+
+def resubmit(project, rng, new_id):
+    copy = dict(project, id=new_id)
+    copy['name'] = '  ' + project['name'] + rng.choice(['', ' II', ' (revised)'])
+    copy['description'] = project['description'] + rng.choice(['', ' Phase two.', ' Updated budget.'])
+    return copy
+
+
+def make_store(n_projects, duplicate_share, seed=3):
+    rng = random.Random(seed)
+    projects, planted = [], set()
+    for project in make_projects(n_projects, seed=seed):
+        if projects and rng.random() < duplicate_share:
+            original = rng.choice(projects)
+            project = resubmit(original, rng, project['id'])
+            planted.add(tuple(sorted((original['id'], project['id']))))
+        projects.append(project)
+    return projects, planted
+
+
+def run_benchmark(n_projects, duplicate_share, repeats):
+    projects, planted = make_store(n_projects, duplicate_share)
+    index = NearDuplicateIndex()
+    start = time.perf_counter()
+    index.add_projects(projects)
+    print(f"Signed and indexed {len(index)} projects in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(0)
+    submissions = [resubmit(rng.choice(projects), rng, f"new-{i}") for i in range(repeats)]
+    signatures = [index.project_signature(project) for project in submissions]
+    all_signatures = index._signatures[:len(index)]
+
+    timings, scans = [], []
+    for signature in signatures:
+        start = time.perf_counter()
+        index.query(signature)
+        timings.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        np.flatnonzero((all_signatures == signature).mean(axis=1) >= index.threshold)
+        scans.append((time.perf_counter() - start) * 1000)
+    print(f"Flag a submission: LSH p50 {statistics.median(timings):.2f} ms, "
+          f"full signature scan p50 {statistics.median(scans):.2f} ms")
+
+    start = time.perf_counter()
+    report = index.report()
+    elapsed = time.perf_counter() - start
+    found = {tuple(sorted(pair['ids'])) for group in report for pair in group['pairs']}
+    recall = len(planted & found) / len(planted) if planted else 1.0
+    print(f"Batch report: {len(report)} groups, {len(found)} pairs in {elapsed:.1f}s; "
+          f"{recall:.1%} of {len(planted)} planted duplicates found")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=100_000)
+    parser.add_argument('--duplicate-share', type=float, default=0.02)
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+    run_benchmark(args.projects, args.duplicate_share, args.repeats)
@@ -0,0 +1,50 @@
+"""
+Corpus throughput of NLPAnalyzer: one document at a time vs nlp.pipe
+
+Analyzes the same synthetic reports with per-document calls (the previous
+way) and with analyze_corpus at several batch sizes and process counts,
+reporting docs/sec. The document cache is cleared between runs.
+
+Run from the repository root:
+    python -m benchmarks.nlp_corpus --docs 500 --doc-kb 2 --batch-sizes 16 64 --processes 1 2
+"""
+import argparse
+import time
+
+from analysis import parsed_document
+from analysis.nlp_analyzer import NLPAnalyzer
+from benchmarks.metric_extraction import make_document
+
+
+def run_benchmark(n_docs, doc_kb, batch_sizes, processes):
+    texts = [make_document(doc_kb / 1024, seed=i) for i in range(n_docs)]
+    analyzer = NLPAnalyzer()
+    analyzer.analyze(texts[0])
+
+    parsed_document.document_cache.clear()
+    start = time.perf_counter()
+    for text in texts:
+        analyzer.analyze(text)
+    single = n_docs / (time.perf_counter() - start)
+    print(f"{'mode':<32} {'docs/sec':>10}")
+    print(f"{'one document at a time':<32} {single:>10.1f}")
+
+    for n_process in processes:
+        for batch_size in batch_sizes:
+            parsed_document.document_cache.clear()
+            stats = {}
+            for _ in analyzer.analyze_corpus(texts, batch_size=batch_size,
+                                             n_process=n_process, stats=stats):
+                pass
+            label = f"pipe batch={batch_size} n_process={n_process}"
+            print(f"{label:<32} {stats['docs_per_sec']:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=500)
+    parser.add_argument('--doc-kb', type=float, default=2)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[16, 64])
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2])
+    args = parser.parse_args()
+    run_benchmark(args.docs, args.doc_kb, args.batch_sizes, args.processes)
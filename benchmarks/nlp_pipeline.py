@@ -0,0 +1,66 @@
+"""
+Load time and per-document parse latency of the shared spaCy pipeline
+
+"before" loads the model once per analyzer (the analysis ESGScorer and
+NLPAnalyzer each called spacy.load) and parses every document with all
+components. "after" loads the shared pipeline once and runs only the
+components each task needs.
+
+Run from the repository root:
+    python -m benchmarks.nlp_pipeline --docs 200 --doc-kb 4
+"""
+import argparse
+import time
+
+import numpy as np
+import spacy
+
+from analysis import nlp_resources
+from benchmarks.metric_extraction import make_document
+
+
+def latency_ms(func, docs):
+    timings = []
+    for doc in docs:
+        start = time.perf_counter()
+        func(doc)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def run_benchmark(n_docs, doc_kb):
+    docs = [make_document(doc_kb / 1024, seed=i) for i in range(n_docs)]
+    model = nlp_resources.SPACY_MODEL
+
+    start = time.perf_counter()
+    full_nlp = spacy.load(model)
+    spacy.load(model)
+    before_load = time.perf_counter() - start
+
+    nlp_resources.get_nlp()
+    nlp_resources.get_nlp()
+    after_load = nlp_resources.load_times[model]
+    print(f"Model load: {before_load:.2f} s for two analyzers before, {after_load:.2f} s shared after")
+    print(f"Pipeline components: {', '.join(full_nlp.pipe_names)}")
+
+    print(f"\n{'task':<28} {'p50 ms':>8} {'p99 ms':>8}")
+    runs = [
+        ('full pipeline (before)', full_nlp),
+        ('tokens', lambda text: nlp_resources.parse(text, 'tokens')),
+        ('sentences (parser)', lambda text: nlp_resources.parse(text, 'sentences')),
+        ('sentences (rule-based)', lambda text: nlp_resources.parse(text, 'sentences', rule_based=True)),
+        ('noun_chunks', lambda text: nlp_resources.parse(text, 'noun_chunks')),
+    ]
+    for name, func in runs:
+        func(docs[0])
+        p50, p99 = latency_ms(func, docs)
+        print(f"{name:<28} {p50:>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--doc-kb', type=float, default=4)
+    args = parser.parse_args()
+    run_benchmark(args.docs, args.doc_kb)
@@ -0,0 +1,79 @@
+"""
+Peak memory of NLPAnalyzer on large reports: whole document vs analyze_stream
+
+Writes a synthetic report to a temporary file, then analyzes it in a fresh
+interpreter per mode (getrusage reports the peak over the whole process):
+- whole: read the file and call analyze() on the full text, as before
+- stream: analyze_stream() over the file in sentence-aligned chunks
+
+spaCy refuses texts longer than nlp.max_length (1,000,000 characters by
+default), so the whole mode fails on the larger sizes.
+
+Run from the repository root:
+    python -m benchmarks.nlp_streaming --sizes 0.5 5 --chunk-chars 100000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from analysis.nlp_analyzer import NLPAnalyzer
+from benchmarks.metric_extraction import make_document
+from models.esg_scorer import peak_rss_mb
+
+
+def run_single(mode, path, chunk_chars):
+    analyzer = NLPAnalyzer()
+    start = time.perf_counter()
+    try:
+        if mode == 'stream':
+            stats = {}
+            analyzer.analyze_stream(path, chunk_chars=chunk_chars, stats=stats)
+            characters = stats['characters']
+        else:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            analyzer.analyze(text)
+            characters = len(text)
+    except Exception as e:
+        print(f"RESULT {mode:<8} failed: {type(e).__name__}")
+        return
+    seconds = time.perf_counter() - start
+    print(f"RESULT {mode:<8} {characters:>12} {seconds:>9.1f} {peak_rss_mb():>9.0f}")
+
+
+def run_benchmark(sizes, modes, chunk_chars):
+    print(f"{'size MB':>8} {'mode':<8} {'characters':>12} {'seconds':>9} {'peak MB':>9}")
+    for size_mb in sizes:
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write(make_document(size_mb))
+        try:
+            for mode in modes:
+                output = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.nlp_streaming', '--single',
+                     '--mode', mode, '--path', f.name, '--chunk-chars', str(chunk_chars)],
+                    capture_output=True, text=True
+                ).stdout
+                for line in output.splitlines():
+                    if line.startswith('RESULT '):
+                        print(f"{size_mb:>8} {line[len('RESULT '):]}")
+        finally:
+            os.remove(f.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.5, 5])
+    parser.add_argument('--modes', nargs='+', default=['whole', 'stream'],
+                        choices=['whole', 'stream'])
+    parser.add_argument('--chunk-chars', type=int, default=100_000)
+    parser.add_argument('--mode', default='stream', choices=['whole', 'stream'])
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    parser.add_argument('--single', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.single:
+        run_single(args.mode, args.path, args.chunk_chars)
+    else:
+        run_benchmark(args.sizes, args.modes, args.chunk_chars)
@@ -0,0 +1,76 @@
+"""
+Greedy/Lagrangian portfolio solver against PuLP/CBC
+
+Times models/optimizer InvestmentOptimizer.optimize_portfolio with the
+exact greedy solver and with the PuLP model solved by CBC on synthetic
+projects, and reports the gap between the two objectives. CBC is skipped
+above --cbc-limit projects, where building and solving the model takes
+minutes.
+
+Run from the repository root:
+    python -m benchmarks.portfolio_greedy --projects 10 10000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from models.optimizer import InvestmentOptimizer
+
+
+def make_projects(n, seed=42):
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(1e6, 5e6, n)
+    esg = rng.uniform(60, 95, n)
+    returns = rng.uniform(5, 15, n)
+    risk = rng.uniform(0.1, 0.5, n)
+    return [
+        {'name': f'Green Project {i + 1}', 'cost': costs[i], 'esg_score': esg[i],
+         'expected_return': returns[i], 'risk_score': risk[i]}
+        for i in range(n)
+    ]
+
+
+def objective(projects, result):
+    by_name = {p['name']: p for p in projects}
+    return sum((0.7 * by_name[r['project_name']]['esg_score'] / 100 +
+                0.3 * by_name[r['project_name']]['expected_return'] / 100) * r['investment_amount']
+               for r in result['project_allocations'])
+
+
+def timed(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmark(sizes, budget_share, min_esg, cbc_limit, repeats):
+    optimizer = InvestmentOptimizer()
+    print(f"{'projects':>9} {'greedy ms':>10} {'CBC ms':>10} {'speedup':>8} {'objective gap':>14}")
+    for n in sizes:
+        projects = make_projects(n)
+        # The budget covers a share of all project costs, at least 10M
+        budget = max(budget_share * sum(p['cost'] for p in projects), 10e6)
+        greedy_time, greedy = timed(lambda: optimizer.optimize_portfolio(projects, budget, min_esg), repeats)
+        if n <= cbc_limit:
+            cbc_time, cbc = timed(
+                lambda: optimizer.optimize_portfolio(projects, budget, min_esg, method='lp'), repeats)
+            gap = (objective(projects, cbc) - objective(projects, greedy)) / objective(projects, cbc)
+            print(f"{n:>9} {greedy_time * 1000:>10.2f} {cbc_time * 1000:>10.1f} "
+                  f"{cbc_time / greedy_time:>7.0f}x {gap:>14.2e}")
+        else:
+            print(f"{n:>9} {greedy_time * 1000:>10.2f} {'skipped':>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, nargs='+', default=[10, 10_000, 1_000_000])
+    parser.add_argument('--budget-share', type=float, default=0.05)
+    parser.add_argument('--min-esg', type=float, default=85)
+    parser.add_argument('--cbc-limit', type=int, default=10_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+    run_benchmark(args.projects, args.budget_share, args.min_esg, args.cbc_limit, args.repeats)
@@ -0,0 +1,74 @@
+"""
+Project search latency on a large synthetic project store
+
+Indexes n synthetic projects with ProjectSearchIndex and reports build time
+and query latency (median, 95th percentile, worst) for rare, common and
+multi-term queries, with and without filters. The previous alternative was
+returning every approved project and filtering in the browser.
+
+Run from the repository root:
+    python -m benchmarks.project_search --projects 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from models.search_index import ProjectSearchIndex
+
+WORDS = ('solar wind hydro geothermal biomass battery storage grid farm rooftop offshore '
+         'community health clinic school education water sanitation irrigation forest '
+         'mangrove reforestation recycling waste compost transport electric bus housing '
+         'insulation efficiency microfinance women youth jobs training governance audit '
+         'transparency rural urban coastal drought flood resilience carbon emissions').split()
+STATUSES = ['pending', 'approved', 'approved', 'rejected']
+QUERIES = ['mangrove', 'solar', 'solar battery storage', 'community health clinic rural',
+           'carbon emissions transport electric bus', 'unknownterm']
+
+
+def make_projects(n, seed=42):
+    rng = random.Random(seed)
+    # Zipf-like word frequencies, so some terms are in most projects
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    for i in range(n):
+        words = rng.choices(WORDS, weights, k=rng.randint(20, 60))
+        yield {
+            'id': str(i + 1),
+            'name': ' '.join(words[:3]).title(),
+            'description': ' '.join(words[3:]),
+            'sustainability_impact': f"Creates {rng.randint(5, 500)} jobs",
+            'status': rng.choice(STATUSES),
+            'environmental_score': rng.randint(0, 100),
+            'social_score': rng.randint(0, 100),
+            'governance_score': rng.randint(0, 100),
+        }
+
+
+def run_benchmark(n_projects, repeats):
+    index = ProjectSearchIndex()
+    start = time.perf_counter()
+    index.add_projects(make_projects(n_projects))
+    print(f"Indexed {len(index)} projects in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'query':<42} {'filters':<9} {'matches':>8} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7}")
+    for query in QUERIES:
+        for label, filters in (('none', {}), ('filtered', {'statuses': ['pending', 'approved'],
+                                                           'category': 'environmental',
+                                                           'min_score': 50, 'page': 3})):
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                found = index.search(query, **filters)
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[int(0.95 * (len(timings) - 1))]
+            print(f"{query:<42} {label:<9} {found['total']:>8} {statistics.median(timings):>7.2f} "
+                  f"{p95:>7.2f} {timings[-1]:>7.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=100_000)
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+    run_benchmark(args.projects, args.repeats)
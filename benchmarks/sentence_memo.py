@@ -0,0 +1,75 @@
+"""
+Corpus analysis with repeated boilerplate: sentence memos on vs off
+
+Builds reports that share a fraction of their sentences (disclaimers,
+standard governance text), parses them, and times the sentence-level
+NLPAnalyzer steps (ESG insights and aspect sentiment) on the parsed
+documents twice: with the sentence memos bounded to zero entries (every
+sentence is scored, as before) and with the default bounds. Parsing is
+excluded, since the memos cannot save any of it. Reports docs/sec and the
+share of sentences that were deduplicated.
+
+Run from the repository root:
+    python -m benchmarks.sentence_memo --docs 300 --boilerplate 0.5
+"""
+import argparse
+import random
+import time
+
+from analysis import parsed_document
+from analysis.nlp_analyzer import NLPAnalyzer
+from analysis.sentence_memo import sentiment_memo
+from benchmarks.metric_extraction import SENTENCES
+
+
+def make_corpus(n_docs, sentences_per_doc, boilerplate, seed=42):
+    """Reports mixing shared boilerplate sentences with sentences of their own"""
+    rng = random.Random(seed)
+    vocabulary = ' '.join(SENTENCES).lower().replace('.', '').split()
+
+    def sentence():
+        return ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(8, 20))).capitalize()
+
+    shared = [sentence() for _ in range(200)]
+    return [
+        '. '.join(rng.choice(shared) if rng.random() < boilerplate else sentence()
+                  for _ in range(sentences_per_doc)) + '.'
+        for _ in range(n_docs)
+    ]
+
+
+def run(analyzer, corpus, maxsize):
+    """Sentence-level analysis docs/sec and the sentiment dedup ratio"""
+    parsed_document.document_cache.clear()
+    documents = list(analyzer.parse_corpus(corpus))
+    sentiment_memo.clear()
+    analyzer.sentence_categories.clear()
+    for memo in (sentiment_memo, analyzer.sentence_categories):
+        memo.cache.maxsize = maxsize
+
+    start = time.perf_counter()
+    for document in documents:
+        analyzer.extract_esg_insights(document)
+        analyzer.analyze_sentiment_by_aspect(document)
+    elapsed = time.perf_counter() - start
+    return len(documents) / elapsed, sentiment_memo.stats()['dedup_ratio']
+
+
+def run_benchmark(n_docs, sentences_per_doc, boilerplate):
+    corpus = make_corpus(n_docs, sentences_per_doc, boilerplate)
+    analyzer = NLPAnalyzer(rule_based_sentences=True)
+    default_size = sentiment_memo.cache.maxsize
+
+    print(f"{'memo':<8} {'docs/sec':>10} {'dedup':>8}")
+    for label, maxsize in (('off', 0), ('on', default_size)):
+        docs_per_sec, dedup_ratio = run(analyzer, corpus, maxsize)
+        print(f"{label:<8} {docs_per_sec:>10.1f} {dedup_ratio:>7.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=300)
+    parser.add_argument('--sentences', type=int, default=40)
+    parser.add_argument('--boilerplate', type=float, default=0.5)
+    args = parser.parse_args()
+    run_benchmark(args.docs, args.sentences, args.boilerplate)
@@ -0,0 +1,80 @@
+"""
+Metric extraction on parsed reports: per-sentence scans vs MetricExtractor
+
+Parses a synthetic report once with the rule-based sentencizer, then times
+only the extraction step:
+- before: re.finditer with string patterns for every sentence and pattern
+- after: MetricExtractor, one precompiled scan per pattern over the text
+
+Run from the repository root:
+    python -m benchmarks.sentence_metrics --sizes 0.1 1
+"""
+import argparse
+import re
+import time
+
+from analysis.metric_extractor import MetricExtractor
+from analysis.parsed_document import ParsedDocument
+from benchmarks.metric_extraction import make_document
+
+PATTERNS = {
+    'QUANTITY': r'\d+(?:,\d{3})*(?:\.\d+)?\s*(?:MW|GW|kW|tons?|acres?|jobs?|people|employees)',
+    'PERCENT': r'\d+(?:\.\d+)?%',
+    'MONEY': r'\$\s*\d+(?:,\d{3})*(?:\.\d+)?(?:\s*(?:million|billion|trillion))?'
+}
+METRIC_SENTENCES = [
+    "The wind farm adds 45 MW and avoids 12,000 tons of CO2 each year.",
+    "Funding of $2.5 million covers 30% of the capital cost.",
+    "The program trained 1,200 people and created 85 jobs.",
+]
+
+
+def make_report(size_mb):
+    """Synthetic report with a metric sentence after every few ordinary ones"""
+    sentences = make_document(size_mb).split('. ')
+    for i in range(0, len(sentences), 4):
+        sentences[i] = METRIC_SENTENCES[i % 3].rstrip('.')
+    return '. '.join(sentences)
+
+
+def reference_extract(sentences):
+    """Previous per-sentence implementation, kept for comparison"""
+    metrics = []
+    for sentence in sentences:
+        for metric_type, pattern in PATTERNS.items():
+            for match in re.finditer(pattern, sentence):
+                metrics.append({'value': match.group(), 'type': metric_type,
+                                'context': sentence.strip()})
+    return metrics
+
+
+def best_time(func, *args, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def run_benchmark(sizes):
+    extractor = MetricExtractor()
+    print(f"{'size MB':>8} {'sentences':>10} {'metrics':>8} {'before ms':>10} {'after ms':>10} "
+          f"{'speedup':>8} {'match':>6}")
+    for size_mb in sizes:
+        # Keep every text under spaCy's default max_length
+        text = make_report(min(size_mb, 0.95))
+        document = ParsedDocument(text, rule_based_sentences=True)
+        before, expected = best_time(reference_extract, document.sentences)
+        after, result = best_time(extractor.extract, document.text, document.sentence_spans)
+        same = [(m['value'], m['type'], m['context']) for m in result] == \
+            [(m['value'], m['type'], m['context']) for m in expected]
+        print(f"{size_mb:>8} {len(document.sentences):>10} {len(result):>8} {before:>10.1f} "
+              f"{after:>10.1f} {before / after:>7.1f}x {str(same):>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[0.1, 0.9])
+    args = parser.parse_args()
+    run_benchmark(args.sizes)
@@ -0,0 +1,86 @@
+"""
+Similar-project lookups on a large synthetic project store
+
+Fits ProjectSimilarityIndex on n synthetic projects and reports fit time,
+the latency of top-k lookups for a project and for a free text, the cost
+of adding a project without refitting, and the blocked all-pairs top-k
+over a sample. The comparison is a dense cosine similarity over the same
+vectors, which needs a (projects x vocabulary) float array and is run on
+the sample only.
+
+Run from the repository root:
+    python -m benchmarks.similar_projects --projects 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from benchmarks.project_search import make_projects
+from models.similarity_index import ProjectSimilarityIndex
+
+
+def timed(function, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(0.95 * (len(timings) - 1))]
+
+
+def run_benchmark(n_projects, k, repeats, sample):
+    projects = list(make_projects(n_projects))
+    index = ProjectSimilarityIndex()
+    start = time.perf_counter()
+    index.fit(projects)
+    matrix = index._rows()
+    print(f"Fitted {len(index)} projects in {time.perf_counter() - start:.1f}s "
+          f"({matrix.shape[1]} terms, {matrix.nnz} non-zeros)")
+
+    rng = random.Random(0)
+    ids = [rng.choice(projects)['id'] for _ in range(repeats)]
+    lookups = iter(ids * 2)
+    p50, p95 = timed(lambda: index.similar_projects(next(lookups), k), repeats)
+    print(f"Top-{k} for a project:    p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+    p50, p95 = timed(lambda: index.similar_to_text('rural community solar battery storage', k), repeats)
+    print(f"Top-{k} for a free text:  p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+
+    extra = iter(make_projects(repeats, seed=7))
+    counter = iter(range(repeats))
+    def add():
+        project = next(extra)
+        project['id'] = f"new-{next(counter)}"
+        index.add_project(project)
+        index.similar_projects(project['id'], k)
+    p50, p95 = timed(add, repeats)
+    print(f"Add a project + lookup:  p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+    start = time.perf_counter()
+    ProjectSimilarityIndex().fit(projects)
+    print(f"Refitting instead:       {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    sample_index = ProjectSimilarityIndex()
+    sample_index.fit(projects[:sample])
+    start = time.perf_counter()
+    sample_index.all_similar(k)
+    blocked = time.perf_counter() - start
+    start = time.perf_counter()
+    dense = sample_index._rows().toarray()
+    similarity = dense @ dense.T
+    np.fill_diagonal(similarity, -np.inf)
+    np.argpartition(-similarity, k, axis=1)[:, :k]
+    print(f"All-pairs top-{k} over {sample}: blocked sparse {blocked:.2f}s, "
+          f"dense {time.perf_counter() - start:.2f}s ({similarity.nbytes / 1e6:.0f} MB of scores)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--projects', type=int, default=100_000)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--repeats', type=int, default=50)
+    parser.add_argument('--sample', type=int, default=5000)
+    args = parser.parse_args()
+    run_benchmark(args.projects, args.k, args.repeats, args.sample)
@@ -0,0 +1,14 @@
+"""Helpers shared by the root-level test modules"""
+import numpy as np
+import pandas as pd
+
+
+def make_universe(num_assets, seed=0):
+    """Expected returns, ESG scores and a factor-model covariance of a synthetic universe"""
+    rng = np.random.default_rng(seed)
+    assets = [f"Asset {i}" for i in range(num_assets)]
+    factors = rng.normal(size=(num_assets, 3)) * 0.1
+    covariance = factors @ factors.T + np.diag(rng.uniform(0.01, 0.04, num_assets))
+    expected_returns = dict(zip(assets, rng.uniform(0.03, 0.15, num_assets)))
+    esg_scores = dict(zip(assets, rng.uniform(0.5, 1.0, num_assets)))
+    return expected_returns, esg_scores, pd.DataFrame(covariance, index=assets, columns=assets)
@@ -59,6 +59,29 @@ SAMPLE_PROJECTS = {
     }
 }
 
+# Annual volatility assumed per risk level, and the correlation between projects
+RISK_VOLATILITY = {'Low': 0.10, 'Medium': 0.20, 'High': 0.30}
+PROJECT_CORRELATION = 0.3
+
+def project_covariance(projects, correlation=PROJECT_CORRELATION):
+    """Covariance matrix of project returns from their risk levels (constant correlation, PSD)"""
+    vols = np.array([RISK_VOLATILITY[data['risk_level']] for data in projects.values()])
+    correlations = np.full((len(vols), len(vols)), correlation)
+    np.fill_diagonal(correlations, 1.0)
+    return pd.DataFrame(np.outer(vols, vols) * correlations,
+                        index=projects.keys(), columns=projects.keys())
+
+# Sample ESG scores, drawn once with a fixed seed so they stay the same
+# across callbacks
+PROJECT_ESG_SCORES = dict(zip(SAMPLE_PROJECTS.keys(),
+                              np.random.RandomState(42).uniform(0.6, 0.95, len(SAMPLE_PROJECTS))))
+
+# Built once: the frontier and every scenario share it. With the ESG scores
+# also fixed, the optimizer's cached problem for these projects (keyed on the
+# covariance, scores and constraints) is reused across callbacks whenever the
+# minimum ESG score is unchanged
+PROJECT_COVARIANCE = project_covariance(SAMPLE_PROJECTS)
+
 def create_project_cards():
     """Create project information cards"""
     cards = []
@@ -181,8 +204,8 @@ def update_dashboard(budget_range, min_esg_score, risk_tolerance, n_clicks, stor
     df = pd.DataFrame.from_dict(SAMPLE_PROJECTS, orient='index')
     df['name'] = df.index
     
-    # Calculate ESG scores
-    esg_scores = {name: np.random.uniform(0.6, 0.95) for name in SAMPLE_PROJECTS.keys()}
+    # Sample ESG scores
+    esg_scores = PROJECT_ESG_SCORES
     df['esg_score'] = df.index.map(esg_scores)
     
     # 1. Portfolio Sunburst
@@ -225,9 +248,7 @@ def update_dashboard(budget_range, min_esg_score, risk_tolerance, n_clicks, stor
     frontier_results = optimizer.generate_efficient_frontier(
         expected_returns={name: data['expected_return'] for name, data in SAMPLE_PROJECTS.items()},
         esg_scores=esg_scores,
-        covariance_matrix=pd.DataFrame(np.random.rand(5,5)*0.1, 
-                                     index=SAMPLE_PROJECTS.keys(),
-                                     columns=SAMPLE_PROJECTS.keys()),
+        covariance_matrix=PROJECT_COVARIANCE,
         num_portfolios=100
     )
     
@@ -256,30 +277,35 @@ def update_dashboard(budget_range, min_esg_score, risk_tolerance, n_clicks, stor
     )
     
     # 6. Scenario Comparison
-    # Generate three scenarios with different risk tolerances
+    # Generate three scenarios with different risk tolerances; each caps
+    # portfolio volatility at its share of the riskiest project's volatility
     scenarios = {
         'Conservative': risk_tolerance * 0.5,
         'Balanced': risk_tolerance,
         'Aggressive': min(risk_tolerance * 1.5, 1.0)
     }
+    max_project_volatility = np.sqrt(np.max(np.diag(PROJECT_COVARIANCE)))
     
     scenario_results = []
     for scenario, risk_level in scenarios.items():
         result = optimizer.optimize_portfolio(
             expected_returns={name: data['expected_return'] for name, data in SAMPLE_PROJECTS.items()},
             esg_scores=esg_scores,
-            covariance_matrix=pd.DataFrame(np.random.rand(5,5)*0.1, 
-                                         index=SAMPLE_PROJECTS.keys(),
-                                         columns=SAMPLE_PROJECTS.keys()),
+            covariance_matrix=PROJECT_COVARIANCE,
             total_budget=budget_range[1],
             min_esg_score=min_esg_score,
-            max_volatility=risk_level
+            max_volatility=risk_level * max_project_volatility,
+            method='convex'
         )
+        # A limit below the least volatile feasible portfolio has no solution;
+        # leave its bars out rather than plotting zeros
+        solved = result['optimization_status'] == 'Optimal'
         scenario_results.append({
             'Scenario': scenario,
-            'Return': result['expected_return'],
-            'Risk': result['volatility'],
-            'ESG Score': result['esg_score']
+            'Return': result['expected_return'] if solved else None,
+            'Risk': result['volatility'] if solved else None,
+            'ESG Score': result['esg_score'] if solved else None,
+            'Status': result['optimization_status']
         })
     
     scenario_df = pd.DataFrame(scenario_results)
@@ -293,6 +319,12 @@ def update_dashboard(budget_range, min_esg_score, risk_tolerance, n_clicks, stor
             go.Bar(x=scenario_df['Scenario'], y=scenario_df[metric], name=metric),
             row=1, col=i
         )
+        # Mark the scenarios without a solution where their bar would be
+        for _, row in scenario_df[scenario_df['Status'] != 'Optimal'].iterrows():
+            scenario_fig.add_annotation(
+                x=row['Scenario'], y=0, text=row['Status'], showarrow=False,
+                yshift=12, textangle=-90, row=1, col=i
+            )
     
     scenario_fig.update_layout(height=400, title_text="Scenario Comparison")
     
@@ -1,10 +1,9 @@
 import nltk
 
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('vader_lexicon')
-nltk.download('stopwords')
-nltk.download('wordnet')
-nltk.download('averaged_perceptron_tagger')
-nltk.download('maxent_ne_chunker')
-nltk.download('words')
+from analysis.nltk_resources import NLTK_DATA_DIR, NLTK_RESOURCES
+
+# Download the NLTK data the analyzers use into the local data directory.
+# The analyzers never download at runtime; copy this directory to machines
+# without network access.
+for package in NLTK_RESOURCES:
+    nltk.download(package, download_dir=NLTK_DATA_DIR)
@@ -6,7 +6,9 @@ class AdminManager:
     def __init__(self):
         self.users_file = 'data/users.json'
         self.analytics_file = 'data/analytics.json'
+        self.esg_params_file = 'data/esg_params.json'
         self._load_data()
+        self._load_esg_weights()
 
     def _load_data(self):
         """Load users and analytics data from JSON files"""
@@ -39,6 +41,20 @@ class AdminManager:
                 'esg_distribution': {}
             }
 
+    def _load_esg_weights(self):
+        """Load the admin-configured ESG weights"""
+        self.esg_weights = {
+            'env_weight': 0.4,
+            'social_weight': 0.3,
+            'gov_weight': 0.3
+        }
+        try:
+            if os.path.exists(self.esg_params_file):
+                with open(self.esg_params_file, 'r') as f:
+                    self.esg_weights.update(json.load(f))
+        except Exception as e:
+            print(f"Error loading ESG parameters: {str(e)}")
+
     def _save_users(self):
         """Save users data to JSON file"""
         try:
@@ -155,14 +171,35 @@ class AdminManager:
     def esg_params(self):
         """Get ESG scoring parameters"""
         return {
-            'environmental_weight': 0.4,
-            'social_weight': 0.3,
-            'governance_weight': 0.3,
+            'environmental_weight': self.esg_weights['env_weight'],
+            'social_weight': self.esg_weights['social_weight'],
+            'governance_weight': self.esg_weights['gov_weight'],
             'min_score': 0,
             'max_score': 100,
             'threshold': 60
         }
 
+    def update_esg_params(self, env_weight, social_weight, gov_weight):
+        """Update ESG component weights; they must sum to 1"""
+        try:
+            weights = {
+                'env_weight': float(env_weight),
+                'social_weight': float(social_weight),
+                'gov_weight': float(gov_weight)
+            }
+        except (TypeError, ValueError):
+            return False
+        if abs(sum(weights.values()) - 1.0) >= 0.01:
+            return False
+        
+        self.esg_weights = weights
+        try:
+            with open(self.esg_params_file, 'w') as f:
+                json.dump(self.esg_weights, f, indent=2)
+        except Exception as e:
+            print(f"Error saving ESG parameters: {str(e)}")
+        return True
+
     def update_analytics(self, data_type, data):
         """Update analytics data"""
         if data_type in self.analytics:
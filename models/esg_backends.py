@@ -0,0 +1,290 @@
+import os
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+
+from models.esg_explainer import TreeEnsembleExplainer
+
+DEFAULT_BACKEND = 'random_forest'
+
+
+class ESGModelBackend:
+    """Interface for the regression model behind ESGScorer
+
+    Backends take raw feature matrices (one column per ESGScorer feature, in
+    order) and own any scaling they need.
+    """
+    name = None
+    supports_explain = False
+
+    def fit(self, X, y):
+        raise NotImplementedError
+
+    def partial_fit(self, X, y):
+        """Update the model with one chunk of training data"""
+        raise NotImplementedError(f"The {self.name} backend does not support chunked training")
+
+    def predict(self, X):
+        raise NotImplementedError
+
+    def explain(self, X):
+        """Return (contributions, base_value) for each row of X"""
+        raise NotImplementedError(f"The {self.name} backend does not support feature attribution")
+
+
+class RandomForestBackend(ESGModelBackend):
+    """Scaled random forest, explained exactly by TreeEnsembleExplainer
+
+    Chunked training fits trees_per_chunk new trees on each chunk with
+    warm_start, so every tree sees a single chunk. The forest is capped at
+    max_trees trees (n_estimators by default): past the cap, each new tree
+    replaces a random kept tree with probability max_trees / trees fitted so
+    far (reservoir sampling). The kept trees stay a uniform sample of all
+    fitted trees, so every chunk is represented in proportion to its trees,
+    and memory and predict time do not grow with the number of chunks.
+    """
+    name = 'random_forest'
+    supports_explain = True
+
+    def __init__(self, n_estimators=100, max_depth=10, min_samples_split=5,
+                 min_samples_leaf=2, random_state=42, trees_per_chunk=10, max_trees=None):
+        self.scaler = StandardScaler()
+        self.model = RandomForestRegressor(
+            n_estimators=n_estimators,
+            max_depth=max_depth,
+            min_samples_split=min_samples_split,
+            min_samples_leaf=min_samples_leaf,
+            random_state=random_state
+        )
+        self.trees_per_chunk = trees_per_chunk
+        self.max_trees = max_trees or n_estimators
+        self._rng = np.random.RandomState(random_state)
+        self._trees_fitted = 0
+        self._explainer = None
+
+    def fit(self, X, y):
+        self.scaler.fit(X)
+        self.model.set_params(warm_start=False)
+        self.model.fit(self.scaler.transform(X), y)
+        self._explainer = None
+        return self
+
+    def partial_fit(self, X, y):
+        if not self.model.warm_start or not hasattr(self.model, 'estimators_'):
+            # Trees only depend on the order of feature values, so the
+            # scaler fitted on the first chunk is kept for later ones
+            self.scaler.fit(X)
+            self.model.set_params(warm_start=True, n_estimators=self.trees_per_chunk)
+            self._trees_fitted = 0
+            kept = []
+        else:
+            self.model.set_params(n_estimators=len(self.model.estimators_) + self.trees_per_chunk)
+            kept = list(self.model.estimators_)
+        # Seeds of new trees follow from the forest size, which stops growing at the cap
+        self.model.set_params(random_state=self._rng.randint(np.iinfo(np.int32).max))
+        self.model.fit(self.scaler.transform(X), y)
+
+        for tree in self.model.estimators_[len(kept):]:
+            self._trees_fitted += 1
+            if len(kept) < self.max_trees:
+                kept.append(tree)
+            else:
+                slot = self._rng.randint(self._trees_fitted)
+                if slot < self.max_trees:
+                    kept[slot] = tree
+        self.model.estimators_ = kept
+        self.model.set_params(n_estimators=len(kept))
+        self._explainer = None
+        return self
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(X))
+
+    @property
+    def explainer(self):
+        """Attribution engine for the fitted forest, built on first use"""
+        if self._explainer is None:
+            self._explainer = TreeEnsembleExplainer(self.model.estimators_, self.model.n_features_in_)
+        return self._explainer
+
+    def explain(self, X):
+        explainer = self.explainer
+        return explainer.shap_values(self.scaler.transform(X)), explainer.expected_value
+
+
+class HistGradientBoostingBackend(ESGModelBackend):
+    """Histogram gradient boosting; fast to fit on large training sets"""
+    name = 'hist_gradient_boosting'
+
+    def __init__(self, max_iter=200, learning_rate=0.1, max_leaf_nodes=31, random_state=42):
+        self.model = HistGradientBoostingRegressor(
+            max_iter=max_iter,
+            learning_rate=learning_rate,
+            max_leaf_nodes=max_leaf_nodes,
+            random_state=random_state
+        )
+
+    def fit(self, X, y):
+        self.model.fit(np.asarray(X, dtype=float), y)
+        return self
+
+    def predict(self, X):
+        return self.model.predict(np.asarray(X, dtype=float))
+
+
+class LinearBackend(ESGModelBackend):
+    """Shared attribution for affine models y = X @ coef + intercept
+
+    Contributions are measured against the training mean, so each row's
+    contributions plus the base value add up to the unclipped prediction.
+    """
+    supports_explain = True
+
+    def _linear_terms(self):
+        """Return (coef, intercept, feature_mean) in raw feature space"""
+        raise NotImplementedError
+
+    def explain(self, X):
+        coef, intercept, feature_mean = self._linear_terms()
+        X = np.asarray(X, dtype=float)
+        return (X - feature_mean) * coef, float(feature_mean @ coef + intercept)
+
+
+class RidgeBackend(LinearBackend):
+    """Scaled ridge regression; tiny and sub-millisecond to evaluate
+
+    Chunked training accumulates the sufficient statistics X'X, X'y and the
+    sums, then solves the same system Ridge solves on the standardized data.
+    """
+    name = 'ridge'
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+        self.scaler = StandardScaler()
+        self.model = Ridge(alpha=alpha)
+        self._stats = None
+
+    def fit(self, X, y):
+        self.scaler.fit(X)
+        self.model.fit(self.scaler.transform(X), y)
+        self._stats = None
+        return self
+
+    def partial_fit(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if self._stats is None:
+            # Accumulate around the first chunk's mean to avoid cancellation
+            self._stats = {
+                'shift': X.mean(axis=0),
+                'n': 0,
+                'sum_x': np.zeros(X.shape[1]),
+                'sum_y': 0.0,
+                'xx': np.zeros((X.shape[1], X.shape[1])),
+                'xy': np.zeros(X.shape[1])
+            }
+        stats = self._stats
+        X_shifted = X - stats['shift']
+        stats['n'] += len(y)
+        stats['sum_x'] += X_shifted.sum(axis=0)
+        stats['sum_y'] += y.sum()
+        stats['xx'] += X_shifted.T @ X_shifted
+        stats['xy'] += X_shifted.T @ y
+        self._solve()
+        return self
+
+    def _solve(self):
+        """Fit the scaler and ridge coefficients from the accumulated statistics"""
+        stats = self._stats
+        n = stats['n']
+        mean_shifted = stats['sum_x'] / n
+        y_mean = stats['sum_y'] / n
+        cov = stats['xx'] - n * np.outer(mean_shifted, mean_shifted)
+        cross = stats['xy'] - n * mean_shifted * y_mean
+
+        var = np.diag(cov) / n
+        scale = np.sqrt(var)
+        scale[scale == 0] = 1.0
+        self.scaler.mean_ = stats['shift'] + mean_shifted
+        self.scaler.var_ = var
+        self.scaler.scale_ = scale
+        self.scaler.n_samples_seen_ = n
+        self.scaler.n_features_in_ = len(scale)
+
+        gram = cov / np.outer(scale, scale)
+        coef = np.linalg.solve(gram + self.alpha * np.eye(len(scale)), cross / scale)
+        self.model.coef_ = coef
+        self.model.intercept_ = y_mean
+        self.model.n_features_in_ = len(scale)
+
+    def predict(self, X):
+        return self.model.predict(self.scaler.transform(X))
+
+    def _linear_terms(self):
+        # Fold the scaler into the coefficients
+        coef = self.model.coef_ / self.scaler.scale_
+        intercept = self.model.intercept_ - self.scaler.mean_ @ coef
+        return coef, intercept, self.scaler.mean_
+
+
+class FormulaBackend(LinearBackend):
+    """The analytic ESG formula used to label the synthetic training data
+
+    Needs no training data; fit only records the feature means used as the
+    attribution baseline.
+    """
+    name = 'formula'
+
+    # Coefficients of ESGScorer.generate_synthetic_data's target, in feature order
+    COEF = np.array([
+        -0.4 / 200 * 0.4,   # carbon_emissions
+        0.4 * 0.4,          # renewable_energy
+        0.2 * 0.4,          # waste_recycled
+        10 * 0.5 * 0.3,     # community_impact
+        0.1 * 0.5 * 0.3,    # job_creation
+        0.5 * 0.3,          # transparency_score
+        0.5 * 0.3           # compliance_score
+    ])
+    INTERCEPT = 100 * 0.4 * 0.4
+
+    def __init__(self):
+        self.feature_mean = np.zeros(len(self.COEF))
+        self._rows_seen = 0
+
+    def fit(self, X, y=None):
+        self.feature_mean = np.asarray(X, dtype=float).mean(axis=0)
+        self._rows_seen = len(X)
+        return self
+
+    def partial_fit(self, X, y=None):
+        X = np.asarray(X, dtype=float)
+        total = self._rows_seen + len(X)
+        self.feature_mean = self.feature_mean + (X.sum(axis=0) - len(X) * self.feature_mean) / total
+        self._rows_seen = total
+        return self
+
+    def predict(self, X):
+        return np.clip(np.asarray(X, dtype=float) @ self.COEF + self.INTERCEPT, 0, 100)
+
+    def _linear_terms(self):
+        return self.COEF, self.INTERCEPT, self.feature_mean
+
+
+ESG_BACKENDS = {
+    backend.name: backend
+    for backend in (RandomForestBackend, HistGradientBoostingBackend, RidgeBackend, FormulaBackend)
+}
+
+
+def make_backend(name=None, **params):
+    """Create a model backend by name
+
+    Falls back to the ESG_MODEL_BACKEND environment variable and then to the
+    random forest.
+    """
+    name = name or os.environ.get('ESG_MODEL_BACKEND') or DEFAULT_BACKEND
+    if name not in ESG_BACKENDS:
+        raise ValueError(f"Unknown ESG model backend '{name}'. Choose from: {', '.join(ESG_BACKENDS)}")
+    return ESG_BACKENDS[name](**params)
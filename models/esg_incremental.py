@@ -0,0 +1,175 @@
+"""
+Incremental ESG text analysis of projects
+
+Re-scoring a project's text after every update means re-reading the
+description, every report and every earlier update. Instead each project
+keeps running aggregates under project['text_analysis']:
+
+- keyword_counts: occurrences of each ESG keyword (stopwords removed, as
+  in analysis ESGScorer)
+- sentiment_sum / sentiment_count: VADER compound scores of its sentences
+- metric_totals: count, total, min and max of the numeric metrics found by
+  the MetricExtractor, per metric type and unit (e.g. 'QUANTITY:tons')
+- history: the scores after each text was added, as a time series of at
+  most max_history points (the oldest are dropped)
+
+A new update is analyzed on its own and merged in, so the cost depends on
+the length of the update only, and the aggregates stay bounded however many
+updates a project gets. They live in the project dict and are saved with it
+by FundSeekerManager, which leaves them out of project payloads.
+
+Scores follow analysis ESGScorer.calculate_final_scores: keywords weighted
+40% and sentiment 30%. Sentiment is the mean sentence compound score
+mapped to 0-1, since a whole-text VADER score cannot be updated piecewise.
+"""
+from collections import Counter
+from datetime import datetime
+
+from analysis.corpus import project_reports
+from analysis.esg_scorer import ESG_KEYWORDS, ESGScorer
+from analysis.keyword_matcher import KeywordMatcher
+from analysis.metric_extractor import MetricExtractor
+from analysis.parsed_document import ParsedDocument
+
+# Score points kept per project
+MAX_HISTORY = 365
+
+
+def metric_totals(metrics):
+    """Count, total, min and max of metric numbers per 'TYPE:unit' key"""
+    totals = {}
+    for metric in metrics:
+        number = metric['number']
+        key = f"{metric['type']}:{metric['unit']}"
+        if key not in totals:
+            totals[key] = {'count': 0, 'total': 0.0, 'min': number, 'max': number}
+        entry = totals[key]
+        entry['count'] += 1
+        entry['total'] += number
+        entry['min'] = min(entry['min'], number)
+        entry['max'] = max(entry['max'], number)
+    return totals
+
+
+class IncrementalESGAnalyzer:
+    """Keeps per-project ESG text aggregates up to date one text at a time"""
+
+    def __init__(self, esg_keywords=None, max_history=MAX_HISTORY):
+        self.esg_keywords = esg_keywords or ESG_KEYWORDS
+        self.max_history = max_history
+        self.keyword_matcher = KeywordMatcher(
+            keyword for keywords in self.esg_keywords.values() for keyword in keywords
+        )
+        self.metric_extractor = MetricExtractor()
+
+    @staticmethod
+    def new_aggregate():
+        return {
+            'keyword_counts': {},
+            'sentiment_sum': 0.0,
+            'sentiment_count': 0,
+            'metric_totals': {},
+            'texts_analyzed': 0,
+            'history': []
+        }
+
+    def analyze_text(self, text):
+        """Aggregate of a single text"""
+        # Sentences come from the rule-based sentencizer; nothing is cached,
+        # since each text is only seen once
+        document = ParsedDocument(text, rule_based_sentences=True)
+        processed_text = ' '.join(' '.join(words) for words in document.sentence_words)
+        compounds = [scores['compound'] for scores in document.sentence_sentiment]
+        metrics = self.metric_extractor.extract(document.text, document.sentence_spans)
+
+        aggregate = self.new_aggregate()
+        aggregate.update(
+            keyword_counts=dict(self.keyword_matcher.count(processed_text)),
+            sentiment_sum=float(sum(compounds)),
+            sentiment_count=len(compounds),
+            metric_totals=metric_totals(metrics),
+            texts_analyzed=1
+        )
+        return aggregate
+
+    @staticmethod
+    def merge(aggregate, partial):
+        """Add a partial aggregate into aggregate (in place) and return it"""
+        counts = Counter(aggregate['keyword_counts'])
+        counts.update(partial['keyword_counts'])
+        aggregate['keyword_counts'] = dict(counts)
+        aggregate['sentiment_sum'] += partial['sentiment_sum']
+        aggregate['sentiment_count'] += partial['sentiment_count']
+        if 'metric_totals' not in aggregate:
+            # Aggregates saved by older versions keep every metric in a list
+            aggregate['metric_totals'] = metric_totals(aggregate.pop('metrics', []))
+        totals = aggregate['metric_totals']
+        for key, entry in partial['metric_totals'].items():
+            if key not in totals:
+                totals[key] = dict(entry)
+                continue
+            current = totals[key]
+            current['count'] += entry['count']
+            current['total'] += entry['total']
+            current['min'] = min(current['min'], entry['min'])
+            current['max'] = max(current['max'], entry['max'])
+        aggregate['texts_analyzed'] += partial['texts_analyzed']
+        return aggregate
+
+    def scores(self, aggregate):
+        """Final ESG scores of an aggregate, in the analysis ESGScorer layout"""
+        count = aggregate['sentiment_count']
+        mean_compound = aggregate['sentiment_sum'] / count if count else 0.0
+        sentiment_score = (mean_compound + 1) / 2
+
+        detailed = {
+            category: {
+                'keyword_score': ESGScorer.weighted_keyword_score(aggregate['keyword_counts'], keywords),
+                'sentiment_score': sentiment_score
+            }
+            for category, keywords in self.esg_keywords.items()
+        }
+        final_scores = ESGScorer.calculate_final_scores(detailed)
+        return {
+            'final_scores': final_scores,
+            'overall_score': sum(final_scores.values()) / len(final_scores)
+        }
+
+    def _record(self, aggregate, date=None):
+        scores = self.scores(aggregate)
+        point = {'date': date or datetime.now().isoformat(), 'texts': aggregate['texts_analyzed']}
+        point.update(scores['final_scores'])
+        point['overall_score'] = scores['overall_score']
+        aggregate['history'].append(point)
+        del aggregate['history'][:-self.max_history]
+        return point
+
+    @staticmethod
+    def project_texts(project):
+        """Texts of a project in the order they are aggregated"""
+        texts = [project.get('description', ''), project.get('sustainability_impact', '')]
+        texts.extend(project_reports(project))
+        return [text for text in texts if text and text.strip()]
+
+    def initialize(self, project, date=None):
+        """Build a project's aggregates from all of its current text"""
+        aggregate = self.new_aggregate()
+        for text in self.project_texts(project):
+            self.merge(aggregate, self.analyze_text(text))
+        self._record(aggregate, date)
+        project['text_analysis'] = aggregate
+        return aggregate
+
+    def add_text(self, project, text, date=None):
+        """Merge one new text (e.g. an update) into a project's aggregates
+
+        Projects without aggregates are initialized from all of their text
+        first, which already includes an update appended to the project.
+        Returns the new point of the score time series.
+        """
+        aggregate = project.get('text_analysis')
+        if aggregate is None:
+            self.initialize(project, date)
+            return project['text_analysis']['history'][-1]
+        self.merge(aggregate, self.analyze_text(text))
+        return self._record(aggregate, date)
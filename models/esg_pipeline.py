@@ -0,0 +1,207 @@
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from models.esg_table import COMPONENT_COLUMNS, WEIGHT_KEYS
+
+# Scorer owned by each worker process when the pipeline runs on a process pool
+_worker_scorer = None
+
+
+def _init_worker_scorer():
+    """Train one ESG scorer per worker process"""
+    global _worker_scorer
+    from models.esg_scorer import ESGScorer
+    _worker_scorer = ESGScorer()
+    _worker_scorer.train()
+
+
+def _score_project_text(text, esg_scorer=None):
+    """Extract ESG metrics from text and score them
+
+    Runs inside the pool: with threads the shared scorer is passed in, with
+    processes the per-worker scorer is used.
+    """
+    scorer = esg_scorer if esg_scorer is not None else _worker_scorer
+    metrics = scorer.extract_metrics_from_description(text)
+    scores = scorer.score_project(metrics)
+    return metrics, scores
+
+
+def project_text(project):
+    """Text used to score a project: its description plus sustainability impact"""
+    return f"{project.get('description', '')} {project.get('sustainability_impact', '')}"
+
+
+class ESGScoringPipeline:
+    """Background job queue that scores newly submitted projects
+
+    Jobs run on a thread pool by default, or on a process pool with one
+    trained scorer per worker when use_processes is set. The pool is created
+    on the first submitted job, not with the pipeline. Finished jobs write
+    their scores back to the project store, update the ESG table and notify
+    the project room.
+
+    Pool callbacks run on executor threads. With a task_runner (the app's
+    SocketIO), they only queue the finished job; a background task started
+    through the runner applies the results, so writes and socket emits
+    happen on the server's own (green) thread. The task is started when a
+    job is submitted and exits once no submitted job is left to apply.
+    Writes are made while holding lock, which the app shares with the
+    project store and the weight re-scoring route.
+    """
+
+    def __init__(self, esg_scorer, fund_seeker_manager=None, real_time_manager=None,
+                 esg_table=None, get_weights=None, max_workers=None, use_processes=False,
+                 lock=None, task_runner=None, poll_interval=0.05):
+        self.esg_scorer = esg_scorer
+        self.fund_seeker_manager = fund_seeker_manager
+        self.real_time_manager = real_time_manager
+        self.esg_table = esg_table
+        self.get_weights = get_weights
+        self.max_workers = max_workers or int(os.getenv('ESG_PIPELINE_WORKERS', '2'))
+        self.use_processes = use_processes
+        self.jobs = {}
+        self._lock = threading.Lock()
+        # Held while results are written to the store and the table
+        self.write_lock = lock if lock is not None else threading.RLock()
+        self.task_runner = task_runner
+        self.poll_interval = poll_interval
+        self._finished = queue.Queue()
+        self._outstanding = 0
+        self._delivering = False
+        self._stopped = False
+        self._executor = None
+
+    @property
+    def executor(self):
+        """The scoring pool, created on first use"""
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=_init_worker_scorer
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix='esg-scoring'
+                    )
+            return self._executor
+
+    def _submit_text(self, text):
+        if self.use_processes:
+            return self.executor.submit(_score_project_text, text)
+        return self.executor.submit(_score_project_text, text, self.esg_scorer)
+
+    def submit(self, project):
+        """Queue a project for scoring and return immediately with its future"""
+        project_id = str(project['id'])
+        with self._lock:
+            self.jobs[project_id] = 'queued'
+            self._outstanding += 1
+            start_delivery = self.task_runner is not None and not self._delivering
+            self._delivering = self._delivering or start_delivery
+        if start_delivery:
+            self.task_runner.start_background_task(self._deliver)
+
+        try:
+            future = self._submit_text(project_text(project))
+        except Exception:
+            with self._lock:
+                self.jobs[project_id] = 'failed'
+                self._outstanding -= 1
+            raise
+        future.add_done_callback(lambda f: self._on_done(project_id, f))
+        return future
+
+    def score_texts(self, texts):
+        """Score many texts on the pool without writing anything back"""
+        futures = [self._submit_text(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def _on_done(self, project_id, future):
+        """Pool callback: queue the finished job, or apply it when there is no task runner"""
+        if self.task_runner is None:
+            self._apply(project_id, future)
+        else:
+            self._finished.put((project_id, future))
+
+    def _deliver(self):
+        """Background task: apply finished jobs until none are outstanding"""
+        while True:
+            if self.drain():
+                continue
+            with self._lock:
+                if self._stopped or self._outstanding == 0:
+                    self._delivering = False
+                    return
+            self.task_runner.sleep(self.poll_interval)
+
+    def drain(self):
+        """Apply every queued finished job; returns how many were applied"""
+        applied = 0
+        while True:
+            try:
+                project_id, future = self._finished.get_nowait()
+            except queue.Empty:
+                return applied
+            self._apply(project_id, future)
+            applied += 1
+
+    def _apply(self, project_id, future):
+        """Write a finished job's scores back and notify the project room"""
+        try:
+            metrics, scores = future.result()
+            if scores is None:
+                raise ValueError("ESG scorer returned no scores")
+
+            components = [scores[name] for name in COMPONENT_COLUMNS]
+            if self.get_weights is not None:
+                weights = self.get_weights()
+                composite = sum(c * float(weights[key]) for c, key in zip(components, WEIGHT_KEYS))
+            else:
+                composite = scores['esg_score']
+            new_scores = {
+                **{name: round(value, 2) for name, value in zip(COMPONENT_COLUMNS, components)},
+                'esg_score': round(composite, 2),
+                'predicted_esg_score': round(scores['esg_score'], 2)
+            }
+
+            with self.write_lock:
+                if self.fund_seeker_manager is not None:
+                    self.fund_seeker_manager.update_project_scores(project_id, new_scores)
+                if self.esg_table is not None:
+                    self.esg_table.upsert(project_id, metrics, components)
+                    self.esg_table.save()
+            with self._lock:
+                self.jobs[project_id] = 'done'
+                self._outstanding -= 1
+
+            if self.real_time_manager is not None:
+                self.real_time_manager.notify_esg_update(project_id, new_scores)
+
+        except Exception as e:
+            print(f"Error scoring project {project_id}: {str(e)}")
+            with self._lock:
+                self.jobs[project_id] = 'failed'
+                self._outstanding -= 1
+
+    def get_status(self, project_id):
+        """Get the scoring status of a project (queued/done/failed)"""
+        with self._lock:
+            return self.jobs.get(str(project_id))
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs and optionally wait for queued ones
+
+        With wait, jobs already finished are applied before returning.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        if wait:
+            self.drain()
+        with self._lock:
+            self._stopped = True
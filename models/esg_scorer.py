@@ -1,20 +1,115 @@
+import copy
+import re
+import sys
+import time
+
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.model_selection import train_test_split
 import pandas as pd
 
+from models.esg_backends import make_backend
+from models.score_cache import ScoreCache
+
+# Keyword groups that switch an extracted metric on, matched as substrings
+METRIC_KEYWORDS = {
+    'renewable': ('solar', 'renewable', 'clean energy'),
+    'recycling': ('recycl', 'waste management'),
+    'community': ('community', 'social', 'education'),
+    'transparency': ('transparen', 'report', 'disclosure'),
+    'compliance': ('compliance', 'standard', 'regulation')
+}
+
+# "120 permanent jobs": the job count written before a "job" mention, i.e.
+# (\d+)\s*(?:permanent |temporary )?job, written for the reversed text so the
+# pattern starts with a literal and re can skip straight to each mention
+REVERSED_JOB_NUMBER_PATTERN = re.compile(r'boj(?: tnenamrep| yraropmet)?\s*(\d+)')
+
+
+def _job_numbers(text):
+    """Job counts written before the "job" mentions of text, in text order"""
+    reversed_numbers = REVERSED_JOB_NUMBER_PATTERN.findall(text[::-1])
+    return [int(digits[::-1]) for digits in reversed(reversed_numbers)]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def draw_synthetic_esg_data(rng, n_samples):
+    """Draw synthetic ESG features and scores from rng
+
+    rng may be a np.random.RandomState or np.random.Generator. Returns an
+    (n_samples, 7) feature array and the target scores.
+    """
+    # Environmental metrics (with realistic ranges)
+    carbon_emissions = rng.normal(100, 30, n_samples)  # CO2 tons/year
+    renewable_energy = rng.uniform(0, 100, n_samples)  # % of total energy
+    waste_recycled = rng.uniform(0, 100, n_samples)    # % of waste recycled
+
+    # Social metrics
+    community_impact = rng.uniform(0, 10, n_samples)   # Impact score
+    job_creation = rng.normal(500, 150, n_samples)     # Number of jobs
+
+    # Governance metrics
+    transparency_score = rng.uniform(0, 100, n_samples)
+    compliance_score = rng.uniform(70, 100, n_samples)
+
+    # Create feature matrix, columns in ESGScorer.feature_names order
+    X = np.column_stack([
+        carbon_emissions,
+        renewable_energy,
+        waste_recycled,
+        community_impact,
+        job_creation,
+        transparency_score,
+        compliance_score
+    ])
+
+    # Generate ESG scores with domain knowledge
+    # Environmental component (40% weight)
+    env_score = (
+        (100 - carbon_emissions/200) * 0.4 +  # Lower emissions better
+        renewable_energy * 0.4 +              # Higher renewable % better
+        waste_recycled * 0.2                  # Higher recycling % better
+    ) * 0.4
+
+    # Social component (30% weight)
+    social_score = (
+        (community_impact/10 * 100) * 0.5 +   # Scale to 0-100
+        (job_creation/1000 * 100) * 0.5       # Scale to 0-100
+    ) * 0.3
+
+    # Governance component (30% weight)
+    gov_score = (
+        transparency_score * 0.5 +
+        compliance_score * 0.5
+    ) * 0.3
+
+    # Combined ESG score
+    y = env_score + social_score + gov_score
+
+    # Ensure scores are in 0-100 range
+    y = np.clip(y, 0, 100)
+
+    return X, y
+
+
 class ESGScorer:
-    def __init__(self):
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42
-        )
-        self.scaler = StandardScaler()
+    def __init__(self, cache_size=256, cache_ttl=3600, backend=None, backend_params=None):
+        # backend is a name from models.esg_backends.ESG_BACKENDS; when unset
+        # the ESG_MODEL_BACKEND environment variable picks it
+        self.backend_params = backend_params or {}
+        self.backend = make_backend(backend, **self.backend_params)
         self.is_trained = False
+        self.model_version = 0
+        self.score_cache = ScoreCache(maxsize=cache_size, ttl=cache_ttl)
         self.feature_names = [
             'carbon_emissions',
             'renewable_energy',
@@ -25,61 +120,33 @@ class ESGScorer:
             'compliance_score'
         ]
         
-    def generate_synthetic_data(self, n_samples=1000):
-        """Generate synthetic ESG data for training"""
-        np.random.seed(42)
-        
-        # Environmental metrics (with realistic ranges)
-        carbon_emissions = np.random.normal(100, 30, n_samples)  # CO2 tons/year
-        renewable_energy = np.random.uniform(0, 100, n_samples)  # % of total energy
-        waste_recycled = np.random.uniform(0, 100, n_samples)    # % of waste recycled
-        
-        # Social metrics
-        community_impact = np.random.uniform(0, 10, n_samples)   # Impact score
-        job_creation = np.random.normal(500, 150, n_samples)     # Number of jobs
-        
-        # Governance metrics
-        transparency_score = np.random.uniform(0, 100, n_samples)
-        compliance_score = np.random.uniform(70, 100, n_samples)
-        
-        # Create feature matrix
-        X = pd.DataFrame({
-            'carbon_emissions': carbon_emissions,
-            'renewable_energy': renewable_energy,
-            'waste_recycled': waste_recycled,
-            'community_impact': community_impact,
-            'job_creation': job_creation,
-            'transparency_score': transparency_score,
-            'compliance_score': compliance_score
-        })
-        
-        # Generate ESG scores with domain knowledge
-        # Environmental component (40% weight)
-        env_score = (
-            (100 - carbon_emissions/200) * 0.4 +  # Lower emissions better
-            renewable_energy * 0.4 +              # Higher renewable % better
-            waste_recycled * 0.2                  # Higher recycling % better
-        ) * 0.4
-        
-        # Social component (30% weight)
-        social_score = (
-            (community_impact/10 * 100) * 0.5 +   # Scale to 0-100
-            (job_creation/1000 * 100) * 0.5       # Scale to 0-100
-        ) * 0.3
-        
-        # Governance component (30% weight)
-        gov_score = (
-            transparency_score * 0.5 +
-            compliance_score * 0.5
-        ) * 0.3
-        
-        # Combined ESG score
-        y = env_score + social_score + gov_score
-        
-        # Ensure scores are in 0-100 range
-        y = np.clip(y, 0, 100)
-        
-        return X, y
+    def generate_synthetic_data(self, n_samples=1000, random_state=42):
+        """Generate synthetic ESG data for training
+
+        Uses its own RandomState, so the output is the same for a given
+        random_state and the global np.random state is left untouched.
+        """
+        X, y = draw_synthetic_esg_data(np.random.RandomState(random_state), n_samples)
+        return pd.DataFrame(X, columns=self.feature_names), y
+
+    def iter_synthetic_chunks(self, n_samples, chunk_size=100_000, seed=42):
+        """Yield (X, y) array chunks of synthetic data without materializing it all
+
+        Each chunk draws from its own np.random.Generator spawned from one
+        SeedSequence, so chunks are independent and reproducible and could be
+        generated in parallel.
+        """
+        n_chunks = -(-n_samples // chunk_size)
+        streams = np.random.SeedSequence(seed).spawn(n_chunks)
+        for i, stream in enumerate(streams):
+            size = min(chunk_size, n_samples - i * chunk_size)
+            yield draw_synthetic_esg_data(np.random.default_rng(stream), size)
+
+    def iter_csv_chunks(self, path, chunk_size=100_000, target_column='esg_score'):
+        """Yield (X, y) array chunks from a CSV with one column per feature and a target"""
+        for chunk in pd.read_csv(path, chunksize=chunk_size):
+            yield (chunk[self.feature_names].to_numpy(dtype=float),
+                   chunk[target_column].to_numpy(dtype=float))
     
     def train(self):
         """Train the ESG scoring model"""
@@ -90,22 +157,90 @@ class ESGScorer:
                 X, y, test_size=0.2, random_state=42
             )
             
-            # Scale features
-            self.scaler = self.scaler.fit(X_train)
-            X_train_scaled = self.scaler.transform(X_train)
-            
-            # Train model
-            self.model.fit(X_train_scaled, y_train)
+            # Train model (the backend handles any feature scaling)
+            self.backend.fit(X_train.values, y_train)
             self.is_trained = True
+            # Bumping the version invalidates cached description scores
+            self.model_version += 1
             
-            print("ESG Model trained successfully")
+            print(f"ESG Model trained successfully ({self.backend.name})")
             
         except Exception as e:
             print(f"Error training ESG model: {str(e)}")
             self.is_trained = False
     
-    def score_project(self, project_data):
-        """Score a project based on its ESG metrics"""
+    def train_chunked(self, chunks=None, n_samples=1_000_000, chunk_size=100_000,
+                      validation_data=None):
+        """Train on a stream of (X, y) chunks with bounded memory
+
+        chunks defaults to iter_synthetic_chunks(n_samples, chunk_size); pass
+        iter_csv_chunks(...) to train on real data. Only one chunk is held in
+        memory at a time. The backend must support partial_fit. The current
+        model is kept if training fails.
+
+        Returns a dict with rows, chunks, seconds and peak_rss_mb (the
+        process's peak resident set size), plus validation_mae when
+        validation_data=(X, y) is given.
+        """
+        try:
+            if chunks is None:
+                chunks = self.iter_synthetic_chunks(n_samples, chunk_size)
+
+            backend = make_backend(self.backend.name, **self.backend_params)
+            start = time.perf_counter()
+            rows = 0
+            n_chunks = 0
+            for X_chunk, y_chunk in chunks:
+                backend.partial_fit(X_chunk, y_chunk)
+                rows += len(y_chunk)
+                n_chunks += 1
+            if rows == 0:
+                raise ValueError("No training data in chunks")
+
+            self.backend = backend
+            self.is_trained = True
+            self.model_version += 1
+
+            stats = {
+                'rows': rows,
+                'chunks': n_chunks,
+                'seconds': time.perf_counter() - start,
+                'peak_rss_mb': peak_rss_mb()
+            }
+            if validation_data is not None:
+                X_val, y_val = validation_data
+                errors = backend.predict(np.asarray(X_val, dtype=float)) - y_val
+                stats['validation_mae'] = float(np.abs(errors).mean())
+
+            print(f"ESG Model trained on {rows} rows in {n_chunks} chunks ({backend.name})")
+            return stats
+
+        except Exception as e:
+            print(f"Error in chunked ESG training: {str(e)}")
+            return None
+
+    def explain_batch(self, feature_matrix):
+        """Per-feature ESG score contributions for many projects at once
+
+        feature_matrix is a DataFrame or array with columns ordered as
+        self.feature_names. Returns (contributions, base_value) where each
+        row of contributions plus base_value equals the predicted ESG score.
+        Raises NotImplementedError for backends without attribution support.
+        """
+        if not self.is_trained:
+            self.train()
+        if isinstance(feature_matrix, pd.DataFrame):
+            feature_matrix = feature_matrix[self.feature_names].values
+        values = np.asarray(feature_matrix, dtype=float).reshape(-1, len(self.feature_names))
+        return self.backend.explain(values)
+
+    def score_project(self, project_data, explain=False):
+        """Score a project based on its ESG metrics
+
+        With explain=True the result also holds 'feature_contributions' (how
+        much each feature moved the ESG score) and the model's 'base_value',
+        when the model backend supports attribution.
+        """
         try:
             if not self.is_trained:
                 self.train()
@@ -126,24 +261,29 @@ class ESGScorer:
             # Ensure all required features are present
             project_df = project_df[self.feature_names]
             
-            # Scale features
-            X_scaled = self.scaler.transform(project_df)
-            
             # Predict ESG score
-            esg_score = float(self.model.predict(X_scaled)[0])
+            X = project_df.values.astype(float)
+            esg_score = float(self.backend.predict(X)[0])
             
             # Calculate component scores
             env_score = float(self._calculate_environmental_score(project_df.iloc[0]))
             social_score = float(self._calculate_social_score(project_df.iloc[0]))
             gov_score = float(self._calculate_governance_score(project_df.iloc[0]))
             
-            return {
+            result = {
                 'esg_score': esg_score,
                 'environmental_score': env_score,
                 'social_score': social_score,
                 'governance_score': gov_score
             }
             
+            if explain and self.backend.supports_explain:
+                contributions, base_value = self.backend.explain(X)
+                result['feature_contributions'] = dict(zip(self.feature_names, contributions[0].tolist()))
+                result['base_value'] = base_value
+            
+            return result
+            
         except Exception as e:
             print(f"Error in ESG scoring: {str(e)}")
             return None
@@ -176,6 +316,29 @@ class ESGScorer:
         ]
         return np.average(metrics, weights=weights)
 
+    def calculate_component_matrix(self, feature_matrix):
+        """Vectorized environmental/social/governance scores for a feature matrix
+
+        feature_matrix has one row per project with columns ordered as
+        self.feature_names; returns an (n, 3) array using the same weights as
+        the _calculate_*_score helpers.
+        """
+        X = np.asarray(feature_matrix, dtype=float).reshape(-1, len(self.feature_names))
+        col = {name: i for i, name in enumerate(self.feature_names)}
+        
+        # Each component is an affine function of the raw features
+        weights = np.zeros((len(self.feature_names), 3))
+        weights[col['carbon_emissions'], 0] = -0.4 / 200
+        weights[col['renewable_energy'], 0] = 0.4
+        weights[col['waste_recycled'], 0] = 0.2
+        weights[col['community_impact'], 1] = 0.5 * 10
+        weights[col['job_creation'], 1] = 0.5 / 10
+        weights[col['transparency_score'], 2] = 0.5
+        weights[col['compliance_score'], 2] = 0.5
+        offset = np.array([0.4 * 100, 0.0, 0.0])
+        
+        return X @ weights + offset
+
     def extract_metrics_from_description(self, description):
         """Extract ESG metrics from project description text"""
         # Default base values
@@ -190,46 +353,62 @@ class ESGScorer:
         }
         
         description = description.lower()
+        hits = {
+            group for group, keywords in METRIC_KEYWORDS.items()
+            if any(keyword in description for keyword in keywords)
+        }
+        job_mentions = description.count('job')
+        job_numbers = _job_numbers(description) if job_mentions else []
         
         # Environmental metrics
-        if any(word in description for word in ['solar', 'renewable', 'clean energy']):
+        if 'renewable' in hits:
             metrics['renewable_energy'] = 90
             metrics['carbon_emissions'] = 20
         
-        if any(word in description for word in ['recycl', 'waste management']):
+        if 'recycling' in hits:
             metrics['waste_recycled'] = 80
         
         # Social metrics
-        job_mentions = description.count('job')
         if job_mentions > 0:
-            # Extract number of jobs if mentioned
-            import re
-            job_numbers = re.findall(r'(\d+)\s*(?:permanent |temporary )?jobs?', description)
+            # Use the number of jobs if mentioned
             if job_numbers:
-                metrics['job_creation'] = sum(int(num) for num in job_numbers)
+                metrics['job_creation'] = sum(job_numbers)
             else:
                 metrics['job_creation'] = 100 * job_mentions
         
-        if any(word in description for word in ['community', 'social', 'education']):
+        if 'community' in hits:
             metrics['community_impact'] = 8
         
         # Governance metrics
-        if any(word in description for word in ['transparen', 'report', 'disclosure']):
+        if 'transparency' in hits:
             metrics['transparency_score'] = 90
         
-        if any(word in description for word in ['compliance', 'standard', 'regulation']):
+        if 'compliance' in hits:
             metrics['compliance_score'] = 90
             
         return metrics
 
-    def score_project_description(self, description):
+    def score_project_description(self, description, explain=False):
         """Score a project based on its text description"""
         try:
+            if not self.is_trained:
+                self.train()
+
+            cache_key = ScoreCache.make_key(description, f"{self.model_version}:{int(explain)}")
+            cached = self.score_cache.get(cache_key)
+            # Deep copies, so a caller editing the nested feature_contributions
+            # dict does not change the cached result
+            if cached is not None:
+                return copy.deepcopy(cached)
+            
             # Extract metrics from description
             metrics = self.extract_metrics_from_description(description)
             
             # Get scores using the extracted metrics
-            return self.score_project(metrics)
+            scores = self.score_project(metrics, explain=explain)
+            if scores is not None:
+                self.score_cache.put(cache_key, copy.deepcopy(scores))
+            return scores
             
         except Exception as e:
             print(f"Error in scoring project description: {str(e)}")
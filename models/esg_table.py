@@ -0,0 +1,171 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+COMPONENT_COLUMNS = ['environmental_score', 'social_score', 'governance_score']
+WEIGHT_KEYS = ['env_weight', 'social_weight', 'gov_weight']
+
+
+class ESGScoreTable:
+    """Columnar store of per-project ESG component scores and feature vectors
+
+    Rows are kept in two dense matrices (components and features) indexed by
+    project ID, so a change of ESG weights only needs one matrix-vector
+    product over the component matrix instead of re-running text extraction.
+    """
+
+    def __init__(self, feature_names, table_file=os.path.join('data', 'esg_table.json')):
+        self.feature_names = list(feature_names)
+        self.table_file = table_file
+        self.project_ids = []
+        self._row_index = {}
+        self._size = 0
+        self._components = np.zeros((0, len(COMPONENT_COLUMNS)))
+        self._features = np.zeros((0, len(self.feature_names)))
+        self._load_table()
+
+    @property
+    def components(self):
+        """(n, 3) matrix of environmental/social/governance scores"""
+        return self._components[:self._size]
+
+    @property
+    def features(self):
+        """(n, n_features) matrix of extracted ESG metrics"""
+        return self._features[:self._size]
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, project_id):
+        return str(project_id) in self._row_index
+
+    def _load_table(self):
+        """Load the table from its columnar JSON file"""
+        try:
+            if not os.path.exists(self.table_file):
+                return
+            with open(self.table_file, 'r') as f:
+                columns = json.load(f)
+
+            project_ids = [str(pid) for pid in columns.get('project_id', [])]
+            if not project_ids:
+                return
+            components = np.column_stack([columns[name] for name in COMPONENT_COLUMNS])
+            features = np.column_stack([columns['features'][name] for name in self.feature_names])
+            self._append_rows(project_ids, components, features)
+            print(f"Loaded ESG table with {self._size} projects")
+        except Exception as e:
+            print(f"Error loading ESG table: {str(e)}")
+            self.project_ids = []
+            self._row_index = {}
+            self._size = 0
+
+    def save(self):
+        """Persist the table as one JSON list per column"""
+        try:
+            directory = os.path.dirname(self.table_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            columns = {'project_id': list(self.project_ids)}
+            for i, name in enumerate(COMPONENT_COLUMNS):
+                columns[name] = self.components[:, i].tolist()
+            columns['features'] = {
+                name: self.features[:, i].tolist()
+                for i, name in enumerate(self.feature_names)
+            }
+            columns['updated_at'] = datetime.now().isoformat()
+
+            with open(self.table_file, 'w') as f:
+                json.dump(columns, f)
+        except Exception as e:
+            print(f"Error saving ESG table: {str(e)}")
+
+    def _ensure_capacity(self, n_rows):
+        """Grow the backing matrices geometrically so appends stay amortized O(1)"""
+        capacity = self._components.shape[0]
+        if n_rows <= capacity:
+            return
+        new_capacity = max(n_rows, 2 * capacity, 16)
+        components = np.zeros((new_capacity, len(COMPONENT_COLUMNS)))
+        features = np.zeros((new_capacity, len(self.feature_names)))
+        components[:self._size] = self.components
+        features[:self._size] = self.features
+        self._components = components
+        self._features = features
+
+    def _append_rows(self, project_ids, components, features):
+        start = self._size
+        self._ensure_capacity(start + len(project_ids))
+        self._components[start:start + len(project_ids)] = components
+        self._features[start:start + len(project_ids)] = features
+        for offset, project_id in enumerate(project_ids):
+            self._row_index[project_id] = start + offset
+        self.project_ids.extend(project_ids)
+        self._size += len(project_ids)
+
+    def upsert(self, project_id, features, components):
+        """Insert or replace one project's feature vector and component scores"""
+        project_id = str(project_id)
+        if isinstance(features, dict):
+            features = [features[name] for name in self.feature_names]
+        if isinstance(components, dict):
+            components = [components[name] for name in COMPONENT_COLUMNS]
+
+        row = self._row_index.get(project_id)
+        if row is None:
+            self._append_rows([project_id], [components], [features])
+        else:
+            self._features[row] = features
+            self._components[row] = components
+
+    def get_row(self, project_id):
+        """Get the stored component scores and features of one project"""
+        row = self._row_index.get(str(project_id))
+        if row is None:
+            return None
+        return {
+            'components': dict(zip(COMPONENT_COLUMNS, self._components[row].tolist())),
+            'features': dict(zip(self.feature_names, self._features[row].tolist()))
+        }
+
+    def sync_projects(self, projects, esg_scorer):
+        """Add any project missing from the table
+
+        Text extraction runs once per project here, at ingestion time. Stored
+        component scores are kept when present, otherwise they are derived
+        from the extracted features.
+        """
+        new_projects = [p for p in projects if str(p.get('id')) not in self._row_index]
+        if not new_projects:
+            return 0
+
+        feature_rows = []
+        for project in new_projects:
+            text = f"{project.get('description', '')} {project.get('sustainability_impact', '')}"
+            metrics = esg_scorer.extract_metrics_from_description(text)
+            feature_rows.append([metrics[name] for name in self.feature_names])
+        features = np.array(feature_rows, dtype=float)
+
+        components = esg_scorer.calculate_component_matrix(features)
+        for i, project in enumerate(new_projects):
+            stored = [float(project.get(name) or 0) for name in COMPONENT_COLUMNS]
+            if any(stored):
+                components[i] = stored
+
+        self._append_rows([str(p['id']) for p in new_projects], components, features)
+        self.save()
+        return len(new_projects)
+
+    def rescore(self, weights):
+        """Recompute every project's composite ESG score for new weights
+
+        weights is a dict with env_weight/social_weight/gov_weight keys.
+        Returns a dict mapping project ID to the new composite score.
+        """
+        w = np.array([float(weights[key]) for key in WEIGHT_KEYS])
+        scores = self.components @ w
+        return dict(zip(self.project_ids, scores.tolist()))
@@ -1,12 +1,50 @@
+import functools
 import json
+import threading
 from datetime import datetime
 import os
 
+from models.search_index import ProjectSearchIndex
+from models.near_duplicates import NearDuplicateIndex
+from models.similarity_index import ProjectSimilarityIndex
+
+# Kept on saved projects for the server's own use, never sent to clients
+PRIVATE_FIELDS = ('text_analysis',)
+
+def _locked(method):
+    """Run a method while holding the manager's lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class FundSeekerManager:
-    def __init__(self):
+    def __init__(self, text_analyzer=None, search_index=None, similarity_index=None, duplicate_index=None):
         self.projects = []
+        # Held by every change to the projects and every save; background
+        # writers (the ESG scoring pipeline) take it too
+        self.lock = threading.RLock()
+        # Optional IncrementalESGAnalyzer, updated as project updates arrive
+        self.text_analyzer = text_analyzer
         self._load_projects()
+        # Full-text index over project text, kept current as projects change
+        self.search_index = ProjectSearchIndex() if search_index is None else search_index
+        self.search_index.add_projects(self.projects)
+        # TF-IDF vectors of project text for "similar projects"
+        self.similarity_index = ProjectSimilarityIndex() if similarity_index is None else similarity_index
+        self.similarity_index.fit(self.projects)
+        # MinHash/LSH index flagging near-duplicate submissions; it keeps the
+        # signatures and finds duplicates itself, so drop any saved on
+        # projects by older versions
+        for project in self.projects:
+            project.pop('minhash', None)
+            project.pop('possible_duplicates', None)
+        self.duplicate_index = NearDuplicateIndex() if duplicate_index is None else duplicate_index
+        self.duplicate_index.add_projects(self.projects)
+        self._projects_by_id = {str(p.get('id')): p for p in self.projects}
 
+    @_locked
     def _save_projects(self):
         """Save projects to JSON file"""
         try:
@@ -90,7 +128,8 @@ class FundSeekerManager:
         try:
             print(f"Getting projects for user {user_id}")  # Debug print
             print(f"All projects: {self.projects}")  # Debug print
-            user_projects = [p for p in self.projects if str(p.get('fund_seeker_id')) == str(user_id)]
+            user_projects = [self.public_project(p) for p in self.projects
+                             if str(p.get('fund_seeker_id')) == str(user_id)]
             print(f"Found {len(user_projects)} projects for user {user_id}")  # Debug print
             print(f"User projects: {user_projects}")  # Debug print
             return user_projects
@@ -102,7 +141,8 @@ class FundSeekerManager:
         """Get all approved projects"""
         try:
             # Include both pending and approved projects for now (for testing)
-            approved_projects = [p for p in self.projects if p.get('status') in ['pending', 'approved']]
+            approved_projects = [self.public_project(p) for p in self.projects
+                                 if p.get('status') in ['pending', 'approved']]
             print(f"Found {len(approved_projects)} available projects")  # Debug print
             for project in approved_projects:
                 print(f"Project: {project['name']}, Status: {project['status']}")  # Debug print
@@ -119,8 +159,9 @@ class FundSeekerManager:
                 if 'id' not in project:
                     project['id'] = str(self.projects.index(project) + 1)
             
-            print(f"Returning {len(self.projects)} projects: {self.projects}")  # Debug print
-            return self.projects
+            projects = [self.public_project(project) for project in self.projects]
+            print(f"Returning {len(projects)} projects: {projects}")  # Debug print
+            return projects
         except Exception as e:
             print(f"Error in get_all_projects: {str(e)}")
             return []
@@ -136,6 +177,103 @@ class FundSeekerManager:
             print(f"Error getting project by ID: {str(e)}")
             return None
 
+    def search_projects(self, query, category=None, min_score=None, page=1, per_page=20,
+                        statuses=('pending', 'approved')):
+        """Full-text search over projects, best match first
+
+        Returns the total number of matches and one page of results, each
+        with its BM25 score and the project. By default only projects shown
+        to investors (pending or approved) are searched.
+        """
+        try:
+            found = self.search_index.search(query, statuses=statuses, category=category,
+                                             min_score=min_score, page=page, per_page=per_page)
+            found['results'] = [
+                {'score': result['score'], 'project': self.public_project(self._find_project(result['id']))}
+                for result in found['results']
+            ]
+            return found
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"Error searching projects: {str(e)}")
+            return {'total': 0, 'page': page, 'per_page': per_page, 'results': []}
+
+    def public_project(self, project):
+        """Copy of a project for API responses and templates
+
+        Server-side fields are left out, and current near duplicates are
+        added as 'possible_duplicates' when there are any.
+        """
+        public = {key: value for key, value in project.items() if key not in PRIVATE_FIELDS}
+        duplicates = self.get_possible_duplicates(project.get('id'))
+        if duplicates:
+            public['possible_duplicates'] = duplicates
+        return public
+
+    def get_possible_duplicates(self, project_id):
+        """Projects in the store that look like near duplicates of a project, with their similarity"""
+        try:
+            return [
+                duplicate for duplicate in self.duplicate_index.duplicates_of(project_id)
+                if self._find_project(duplicate['id']) is not None
+            ]
+        except Exception as e:
+            print(f"Error finding duplicates: {str(e)}")
+            return []
+
+    def _find_project(self, project_id):
+        """Project by ID through the ID map, falling back to a scan"""
+        project = self._projects_by_id.get(str(project_id))
+        if project is None or str(project.get('id')) != str(project_id):
+            project = self.get_project_by_id(project_id)
+        return project
+
+    def _with_names(self, neighbours):
+        return [
+            {'id': found['id'], 'name': self._find_project(found['id']).get('name'),
+             'similarity': round(found['similarity'], 4)}
+            for found in neighbours
+        ]
+
+    def get_similar_projects(self, project_id, k=5):
+        """The k projects whose text is most similar to a project's, with their similarity"""
+        try:
+            return self._with_names(self.similarity_index.similar_projects(project_id, k))
+        except Exception as e:
+            print(f"Error finding similar projects: {str(e)}")
+            return []
+
+    def find_similar_to_text(self, text, k=5):
+        """The k projects most similar to a free text, e.g. a draft description"""
+        try:
+            return self._with_names(self.similarity_index.similar_to_text(text, k))
+        except Exception as e:
+            print(f"Error finding similar projects: {str(e)}")
+            return []
+
+    def get_duplicate_report(self):
+        """Groups of near-duplicate projects across the whole store, with their names"""
+        try:
+            report = self.duplicate_index.report()
+            for group in report:
+                group['projects'] = [
+                    {'id': project_id, 'name': (self._find_project(project_id) or {}).get('name')}
+                    for project_id in group['projects']
+                ]
+            return report
+        except Exception as e:
+            print(f"Error building duplicate report: {str(e)}")
+            return []
+
+    def get_score_history(self, project_id):
+        """ESG text score time series of a project, or None if it does not exist"""
+        project = self.get_project_by_id(project_id)
+        if project is None:
+            return None
+        return project.get('text_analysis', {}).get('history', [])
+
+    @_locked
     def create_project(self, name, description, funding_required, timeline, sustainability_impact, fund_seeker_id):
         """Create a new project"""
         try:
@@ -174,6 +312,12 @@ class FundSeekerManager:
             
             # Add new project and save
             self.projects.append(project)
+            self._projects_by_id[project_id] = project
+            self.search_index.add_project(project)
+            self.similarity_index.add_project(project)
+            duplicates = self.duplicate_index.add_project(project)
+            if duplicates:
+                print(f"Project {project_id} looks like a near duplicate of {[d['id'] for d in duplicates]}")
             print("Added project to projects list")  # Debug print
             self._save_projects()
             
@@ -185,12 +329,14 @@ class FundSeekerManager:
             traceback.print_exc()
             return None
 
+    @_locked
     def update_project_status(self, project_id, status):
         """Update project status (approved/rejected)"""
         try:
             for project in self.projects:
                 if str(project.get('id')) == str(project_id):
                     project['status'] = status
+                    self.search_index.update_project(project)
                     self._save_projects()
                     return True
             return False
@@ -198,6 +344,39 @@ class FundSeekerManager:
             print(f"Error updating project status: {str(e)}")
             return False
 
+    @_locked
+    def update_project_scores(self, project_id, scores):
+        """Store the ESG scores computed for a project"""
+        try:
+            for project in self.projects:
+                if str(project.get('id')) == str(project_id):
+                    project.update(scores)
+                    self.search_index.update_project(project)
+                    self._save_projects()
+                    return True
+            return False
+        except Exception as e:
+            print(f"Error updating project scores: {str(e)}")
+            return False
+
+    @_locked
+    def update_esg_scores(self, scores):
+        """Write composite ESG scores for many projects with a single save"""
+        try:
+            updated = 0
+            for project in self.projects:
+                project_id = str(project.get('id'))
+                if project_id in scores:
+                    project['esg_score'] = round(float(scores[project_id]), 2)
+                    updated += 1
+            if updated:
+                self._save_projects()
+            return updated
+        except Exception as e:
+            print(f"Error updating ESG scores: {str(e)}")
+            return 0
+
+    @_locked
     def add_project_update(self, project_id, update_text):
         """Add an update to a project"""
         try:
@@ -205,10 +384,17 @@ class FundSeekerManager:
                 if str(project.get('id')) == str(project_id):
                     if 'updates' not in project:
                         project['updates'] = []
-                    project['updates'].append({
+                    update = {
                         'text': update_text,
                         'date': datetime.now().isoformat()
-                    })
+                    }
+                    project['updates'].append(update)
+                    self.search_index.add_update(project, update_text)
+                    if self.text_analyzer is not None:
+                        try:
+                            self.text_analyzer.add_text(project, update_text, update['date'])
+                        except Exception as e:
+                            print(f"Error updating text analysis (non-critical): {str(e)}")
                     self._save_projects()
                     return True
             return False
@@ -1,10 +1,12 @@
 import numpy as np
-from pulp import *
+
+from models.lp_solvers import LPSolver
 
 class InvestmentOptimizer:
-    def __init__(self):
+    def __init__(self, solver=None):
         """Initialize the Investment Optimizer"""
-        pass
+        # LP backend; HiGHS in-process by default
+        self.solver = solver or LPSolver()
 
     def optimize_portfolio(self, projects, total_budget):
         """
@@ -18,33 +20,19 @@ class InvestmentOptimizer:
             dict: Optimized allocation of funds to projects
         """
         try:
-            # Create optimization problem
-            prob = LpProblem("ESG_Portfolio_Optimization", LpMaximize)
-            
-            # Decision variables
-            project_vars = LpVariable.dicts("Project",
-                                          ((p['id']) for p in projects),
-                                          0,
-                                          1,
-                                          LpContinuous)
-            
-            # Objective function: Maximize combined ESG score and expected return
-            prob += lpSum([
-                (p['environmental_score'] + p['social_score'] + p['governance_score']) * 0.7 +
-                (float(p['funding_required']) * 0.3) * project_vars[p['id']]
-                for p in projects
-            ])
-            
-            # Budget constraint
-            prob += lpSum([float(p['funding_required']) * project_vars[p['id']] for p in projects]) <= total_budget
+            funding = np.array([float(p['funding_required']) for p in projects])
             
-            # Solve the problem
-            prob.solve()
+            # Objective: Maximize combined ESG score and expected return. The ESG
+            # part is a constant, so only the funding term depends on the share
+            # (0 to 1) of each project funded, subject to the budget constraint
+            result = self.solver.solve(0.3 * funding, A_ub=funding[None, :], b_ub=[total_budget],
+                                       bounds=(0, 1), maximize=True)
+            shares = result['x'] if result['x'] is not None else np.zeros(len(projects))
             
             # Get results
             allocation = {}
-            for p in projects:
-                allocation[p['id']] = project_vars[p['id']].value() if project_vars[p['id']].value() is not None else 0
+            for p, share in zip(projects, shares):
+                allocation[p['id']] = float(share)
             
             return allocation
             
@@ -0,0 +1,146 @@
+"""
+Linear programs in matrix form with interchangeable solver backends
+
+The optimizers describe their LP as arrays: objective c, inequality rows
+A_ub x <= b_ub, equality rows A_eq x == b_eq and variable bounds. LPSolver
+solves it with one of two backends:
+
+- 'highs': HiGHS through scipy.optimize.linprog, in-process. Nothing is
+  written to disk and no process is started, so a small LP costs well
+  under a millisecond of overhead.
+- 'cbc': the same LP built as a PuLP model and solved by the CBC
+  executable, which writes the model to a temporary file and starts a
+  process for every solve; kept for comparison and as a fallback.
+
+Every solve is timed. The result carries build and solve times, and
+stats() sums them per solver. Statuses use PuLP's names ('Optimal',
+'Infeasible', 'Unbounded', 'Not Solved') so callers report the same
+strings whichever backend ran.
+"""
+import threading
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+
+BACKENDS = ('highs', 'cbc')
+
+# scipy.optimize.linprog status codes
+HIGHS_STATUS = {0: 'Optimal', 1: 'Not Solved', 2: 'Infeasible', 3: 'Unbounded', 4: 'Not Solved'}
+
+
+def _rows(matrix, n):
+    if matrix is None:
+        return sp.csr_matrix((0, n))
+    return sp.csr_matrix(matrix, dtype=float)
+
+
+def _bounds(bounds, n):
+    """Lower and upper bound arrays from a (lower, upper) pair of scalars or arrays"""
+    lower, upper = bounds
+    lower = np.broadcast_to(-np.inf if lower is None else np.asarray(lower, dtype=float), n)
+    upper = np.broadcast_to(np.inf if upper is None else np.asarray(upper, dtype=float), n)
+    return lower, upper
+
+
+def _solve_highs(c, A_ub, b_ub, A_eq, b_eq, lower, upper):
+    result = linprog(
+        c,
+        A_ub=A_ub if A_ub.shape[0] else None, b_ub=b_ub if A_ub.shape[0] else None,
+        A_eq=A_eq if A_eq.shape[0] else None, b_eq=b_eq if A_eq.shape[0] else None,
+        bounds=np.column_stack([lower, upper]), method='highs'
+    )
+    status = HIGHS_STATUS.get(result.status, 'Not Solved')
+    return status, result.x if status == 'Optimal' else None
+
+
+def _solve_cbc(c, A_ub, b_ub, A_eq, b_eq, lower, upper):
+    import pulp
+
+    prob = pulp.LpProblem("Matrix_LP", pulp.LpMinimize)
+    variables = [
+        pulp.LpVariable(f"x_{i}", None if np.isinf(low) else low, None if np.isinf(up) else up)
+        for i, (low, up) in enumerate(zip(lower, upper))
+    ]
+
+    def expression(coefficients, columns):
+        return pulp.LpAffineExpression([(variables[j], coefficient)
+                                        for j, coefficient in zip(columns, coefficients)])
+
+    prob += expression(c, range(len(c)))
+    for matrix, rhs, sense in ((A_ub, b_ub, pulp.LpConstraintLE), (A_eq, b_eq, pulp.LpConstraintEQ)):
+        for row in range(matrix.shape[0]):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            prob += pulp.LpConstraint(expression(matrix.data[start:end], matrix.indices[start:end]),
+                                      sense, rhs=rhs[row])
+
+    prob.solve(pulp.PULP_CBC_CMD(msg=False))
+    status = pulp.LpStatus[prob.status]
+    if status != 'Optimal':
+        return status, None
+    return status, np.array([variable.value() or 0.0 for variable in variables])
+
+
+SOLVE = {'highs': _solve_highs, 'cbc': _solve_cbc}
+
+
+class LPSolver:
+    """Solves matrix-form LPs with one backend and keeps timing statistics"""
+
+    def __init__(self, backend='highs'):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown LP backend '{backend}'; expected one of {BACKENDS}")
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.solves = 0
+        self.total_build_time = 0.0
+        self.total_solve_time = 0.0
+        self.last_solve_time = None
+
+    def solve(self, c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=(0, None), maximize=False):
+        """Solve min c @ x (or max with maximize) subject to the rows and bounds
+
+        A_ub and A_eq may be dense arrays or scipy sparse matrices. bounds is
+        a (lower, upper) pair of scalars or per-variable arrays, None meaning
+        unbounded. Returns a dict with 'status', 'x' (None unless optimal),
+        'objective', 'backend', 'build_time' and 'solve_time' in seconds.
+        """
+        start = time.perf_counter()
+        c = np.asarray(c, dtype=float)
+        n = len(c)
+        A_ub, A_eq = _rows(A_ub, n), _rows(A_eq, n)
+        b_ub = np.asarray(b_ub if b_ub is not None else [], dtype=float)
+        b_eq = np.asarray(b_eq if b_eq is not None else [], dtype=float)
+        lower, upper = _bounds(bounds, n)
+        objective = -c if maximize else c
+        built = time.perf_counter()
+
+        status, x = SOLVE[self.backend](objective, A_ub, b_ub, A_eq, b_eq, lower, upper)
+        solved = time.perf_counter()
+
+        with self._lock:
+            self.solves += 1
+            self.total_build_time += built - start
+            self.total_solve_time += solved - built
+            self.last_solve_time = solved - built
+        return {
+            'status': status,
+            'x': x,
+            'objective': float(c @ x) if x is not None else None,
+            'backend': self.backend,
+            'build_time': built - start,
+            'solve_time': solved - built
+        }
+
+    def stats(self):
+        """Number of solves and their build and solve times"""
+        with self._lock:
+            return {
+                'backend': self.backend,
+                'solves': self.solves,
+                'total_build_time': self.total_build_time,
+                'total_solve_time': self.total_solve_time,
+                'mean_solve_time': self.total_solve_time / self.solves if self.solves else 0.0,
+                'last_solve_time': self.last_solve_time
+            }
@@ -0,0 +1,200 @@
+"""
+Near-duplicate project detection with MinHash and LSH banding
+
+A project's text (name, description, sustainability impact) is normalized
+(lowercased, whitespace collapsed and stripped, so " Mumbai Vertical Farms"
+and "mumbai  vertical farms" are the same) and cut into overlapping byte
+shingles. Each shingle is packed into an integer, so there is no hashing
+of strings in Python, and the MinHash signature is the minimum of
+num_perm multiply-shift hashes over the shingles, computed with numpy. The
+share of equal signature entries estimates the Jaccard similarity of the
+shingle sets.
+
+The signature is split into bands; projects with an identical band land
+in the same bucket. A lookup only compares against the projects sharing a
+bucket, so it does not grow with the size of the store, and candidates are
+kept if their estimated similarity reaches threshold. With 32 bands of 4
+rows, pairs at 0.6 similarity become candidates with ~99% probability and
+pairs at 0.3 about one time in four, to be dropped by the similarity check.
+
+Signatures live only in the index, keyed by project id; project dicts (and
+so projects.json and API responses) never carry them. They are recomputed
+when the store is loaded, and a project's duplicates are looked up when
+they are needed rather than stored with it.
+"""
+import re
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from models.similarity_index import project_text
+
+WHITESPACE = re.compile(r'\s+')
+# Every entry of the signature of an empty text
+EMPTY = np.iinfo(np.uint32).max
+
+
+def normalize_text(text):
+    return WHITESPACE.sub(' ', text.lower()).strip()
+
+
+class NearDuplicateIndex:
+    """MinHash signatures of projects in an LSH banding index"""
+
+    def __init__(self, num_perm=128, bands=32, threshold=0.6, shingle_size=5, seed=1):
+        if bands <= 0 or num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        if not 1 <= shingle_size <= 7:
+            raise ValueError("shingle_size must be between 1 and 7 bytes")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # Odd 64-bit multipliers and offsets of the hashes (a * x + b) >> 32
+        self._a = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(bands)]
+        # Signatures as rows of a growing matrix; buckets hold row numbers
+        self._ids = []
+        self._row_of = {}
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _shingles(self, text):
+        """Distinct byte shingles of text, each packed into an integer"""
+        data = np.frombuffer(normalize_text(text).encode('utf-8'), dtype=np.uint8).astype(np.uint64)
+        k = self.shingle_size
+        if 0 < len(data) < k:
+            # Shorter texts are a single, zero-padded shingle
+            data = np.concatenate([data, np.zeros(k - len(data), dtype=np.uint64)])
+        packed = np.zeros(max(len(data) - k + 1, 0), dtype=np.uint64)
+        for offset in range(k):
+            packed = (packed << np.uint64(8)) | data[offset:len(data) - k + 1 + offset]
+        return np.unique(packed)
+
+    def signature(self, text):
+        """MinHash signature of text as a uint32 array of num_perm values"""
+        shingles = self._shingles(text)
+        if len(shingles) == 0:
+            return np.full(self.num_perm, EMPTY, dtype=np.uint32)
+        # Arithmetic wraps modulo 2**64; the high 32 bits are the hash
+        hashes = (np.outer(self._a, shingles) + self._b[:, None]) >> np.uint64(32)
+        return hashes.min(axis=1).astype(np.uint32)
+
+    def get_signature(self, project_id):
+        """The indexed signature of a project, or None if it is not indexed"""
+        with self._lock:
+            row = self._row_of.get(str(project_id))
+            return None if row is None else self._signatures[row].copy()
+
+    def project_signature(self, project):
+        """The signature of a project: the indexed one, or computed from its text"""
+        signature = self.get_signature(project.get('id'))
+        if signature is None:
+            signature = self.signature(project_text(project))
+        return signature
+
+    def _band_keys(self, signature):
+        # Each band's rows as one bytes object
+        return np.ascontiguousarray(signature).view(np.dtype((np.void, 4 * self.rows))).tolist()
+
+    def similarity(self, first, second):
+        """Estimated Jaccard similarity of two signatures"""
+        return float(np.mean(first == second))
+
+    def query(self, signature, exclude=None):
+        """Indexed projects whose estimated similarity to signature reaches threshold"""
+        with self._lock:
+            candidates = set()
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(buckets.get(key, ()))
+            candidates.discard(self._row_of.get(exclude))
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            similarities = (self._signatures[rows] == signature).mean(axis=1)
+            ids = self._ids
+        found = [
+            {'id': ids[row], 'similarity': float(similarity)}
+            for row, similarity in zip(rows, similarities) if similarity >= self.threshold
+        ]
+        return sorted(found, key=lambda match: (-match['similarity'], match['id']))
+
+    def duplicates_of(self, project_id):
+        """Indexed near duplicates of an indexed project, or [] if it is not indexed"""
+        signature = self.get_signature(project_id)
+        if signature is None:
+            return []
+        return self.query(signature, exclude=str(project_id))
+
+    def add(self, project_id, signature):
+        project_id = str(project_id)
+        with self._lock:
+            # Projects without text have nothing to be a duplicate of
+            if project_id in self._row_of or (signature == EMPTY).all():
+                return
+            row = self._row_of[project_id] = len(self._ids)
+            self._ids.append(project_id)
+            if row == len(self._signatures):
+                grown = np.zeros((max(2 * row, 1024), self.num_perm), dtype=np.uint32)
+                grown[:row] = self._signatures
+                self._signatures = grown
+            self._signatures[row] = signature
+            for buckets, key in zip(self._buckets, self._band_keys(signature)):
+                buckets.setdefault(key, []).append(row)
+
+    def add_project(self, project):
+        """Index a project and return the near duplicates already indexed"""
+        project_id = str(project.get('id'))
+        signature = self.project_signature(project)
+        duplicates = self.query(signature, exclude=project_id)
+        self.add(project_id, signature)
+        return duplicates
+
+    def add_projects(self, projects):
+        for project in projects:
+            project_id = str(project.get('id'))
+            self.add(project_id, self.project_signature(project))
+
+    def report(self):
+        """Every group of near-duplicate projects in the index
+
+        Candidate pairs come from the LSH buckets and are compared as whole
+        numpy arrays, keeping those whose estimated similarity reaches
+        threshold; groups are the connected components of the kept pairs. Returns a list of
+        {'projects': [ids], 'pairs': [{'ids', 'similarity'}]}, largest first.
+        """
+        with self._lock:
+            n = len(self._ids)
+            # Every pair sharing a bucket, encoded as first * n + second
+            codes = []
+            for buckets in self._buckets:
+                for members in buckets.values():
+                    if len(members) > 1:
+                        members = np.asarray(members, dtype=np.int64)
+                        first, second = np.triu_indices(len(members), 1)
+                        codes.append(members[first] * n + members[second])
+            codes = np.unique(np.concatenate(codes)) if codes else np.zeros(0, dtype=np.int64)
+            first, second = np.divmod(codes, n)
+            similarities = np.concatenate([
+                (self._signatures[first[i:i + 100_000]] == self._signatures[second[i:i + 100_000]]).mean(axis=1)
+                for i in range(0, len(codes), 100_000)
+            ] + [np.zeros(0)])
+            keep = similarities >= self.threshold
+            first, second, similarities = first[keep], second[keep], similarities[keep]
+            ids = list(self._ids)
+
+        graph = sp.coo_matrix((np.ones(len(first)), (first, second)), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        groups = {}
+        for a, b, similarity in zip(first, second, similarities):
+            group = groups.setdefault(labels[a], {'projects': set(), 'pairs': []})
+            group['projects'].update((ids[a], ids[b]))
+            group['pairs'].append({'ids': [ids[a], ids[b]], 'similarity': float(similarity)})
+        report = [{'projects': sorted(group['projects']), 'pairs': group['pairs']} for group in groups.values()]
+        return sorted(report, key=lambda group: (-len(group['projects']), group['projects']))
@@ -1,28 +1,14 @@
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
-from nltk.sentiment import SentimentIntensityAnalyzer
 import numpy as np
 
+from analysis.keyword_matcher import KeywordMatcher
+from analysis.nltk_resources import (
+    get_sentiment_analyzer, get_stopwords, sent_tokenize, word_tokenize
+)
+from analysis.sentence_memo import SentenceMemo, sentiment_memo
+from analysis.text_stream import iter_text_chunks
+
 class NLPAnalyzer:
     def __init__(self):
-        # Download required NLTK data
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
-        try:
-            nltk.data.find('sentiment/vader_lexicon')
-        except LookupError:
-            nltk.download('vader_lexicon')
-            
-        self.stop_words = set(stopwords.words('english'))
-        self.sia = SentimentIntensityAnalyzer()
-        
         # ESG-related keywords
         self.esg_keywords = {
             'environmental': [
@@ -38,7 +24,25 @@ class NLPAnalyzer:
                 'risk management', 'stakeholder', 'accountability'
             ]
         }
+        self.risk_keywords = [
+            'risk', 'challenge', 'problem', 'issue', 'concern',
+            'difficulty', 'threat', 'weakness', 'limitation'
+        ]
+        self.keyword_matcher = KeywordMatcher(
+            keyword for keywords in self.esg_keywords.values() for keyword in keywords
+        )
+        # Whether each sentence mentions a risk keyword
+        self.risk_sentences = SentenceMemo(self._mentions_risk)
     
+    @property
+    def sia(self):
+        """VADER analyzer, loaded from local NLTK data on first use"""
+        return get_sentiment_analyzer()
+
+    @property
+    def stop_words(self):
+        return get_stopwords()
+
     def analyze_text(self, text):
         """Analyze project description or report text"""
         sentences = sent_tokenize(text.lower())
@@ -62,28 +66,71 @@ class NLPAnalyzer:
             'risk_score': risk_score
         }
     
+    def analyze_stream(self, source, chunk_chars=100_000):
+        """Analyze a report too large to hold in memory, in sentence-aligned chunks
+
+        source is a file path, an open text file or an iterable of strings.
+        Keyword matches, sentiment sums and risk sentences are accumulated
+        per chunk and finalized into the analyze_text schema.
+        """
+        n_words = n_sentences = risk_sentences = 0
+        sentiment_sum = sentiment_sq_sum = 0.0
+        keyword_matches = dict.fromkeys(self.esg_keywords, 0)
+
+        for chunk in iter_text_chunks(source, chunk_chars):
+            chunk = chunk.lower()
+            sentences = sent_tokenize(chunk)
+            words = [w for w in word_tokenize(chunk) if w not in self.stop_words]
+
+            n_words += len(words)
+            for category, matches in self.keyword_matcher.count_words(words, self.esg_keywords).items():
+                keyword_matches[category] += matches
+
+            n_sentences += len(sentences)
+            compounds = self._sentence_compounds(sentences)
+            sentiment_sum += float(compounds.sum())
+            sentiment_sq_sum += float(compounds @ compounds)
+            risk_sentences += self._count_risk_sentences(sentences)
+
+        if n_sentences:
+            average = sentiment_sum / n_sentences
+            std = np.sqrt(max(sentiment_sq_sum / n_sentences - average * average, 0.0))
+        else:
+            average = std = np.nan
+
+        return {
+            'keyword_scores': {
+                category: matches / n_words if n_words else 0
+                for category, matches in keyword_matches.items()
+            },
+            'sentiment_scores': {
+                'average_sentiment': average,
+                'sentiment_std': std
+            },
+            'risk_score': risk_sentences / n_sentences if n_sentences else 0
+        }
+    
     def _calculate_keyword_scores(self, words):
-        """Calculate frequency of ESG-related keywords"""
+        """Calculate frequency of ESG-related keywords
+
+        Counts words containing a category keyword, plus multi-word keywords
+        such as "risk management" found across consecutive words.
+        """
         scores = {
             'environmental': 0,
             'social': 0,
             'governance': 0
         }
         
-        for category, keywords in self.esg_keywords.items():
-            category_matches = sum(1 for word in words if any(
-                keyword in word for keyword in keywords
-            ))
-            scores[category] = category_matches / len(words) if words else 0
+        category_matches = self.keyword_matcher.count_words(words, self.esg_keywords)
+        for category in self.esg_keywords:
+            scores[category] = category_matches[category] / len(words) if words else 0
             
         return scores
     
     def _analyze_sentiment(self, sentences):
         """Analyze sentiment of the text"""
-        sentiments = []
-        for sentence in sentences:
-            sentiment_score = self.sia.polarity_scores(sentence)
-            sentiments.append(sentiment_score['compound'])
+        sentiments = self._sentence_compounds(sentences)
             
         return {
             'average_sentiment': np.mean(sentiments),
@@ -92,18 +139,30 @@ class NLPAnalyzer:
     
     def _analyze_risks(self, sentences):
         """Analyze potential risks in the text"""
-        risk_keywords = [
-            'risk', 'challenge', 'problem', 'issue', 'concern',
-            'difficulty', 'threat', 'weakness', 'limitation'
-        ]
-        
-        risk_count = 0
-        for sentence in sentences:
-            if any(keyword in sentence.lower() for keyword in risk_keywords):
-                risk_count += 1
-                
+        risk_count = self._count_risk_sentences(sentences)
         risk_score = risk_count / len(sentences) if sentences else 0
         return risk_score
+
+    def _count_risk_sentences(self, sentences):
+        """Number of sentences mentioning a risk keyword"""
+        return sum(self.risk_sentences(sentences))
+
+    def _mentions_risk(self, sentences):
+        return [
+            any(keyword in sentence.lower() for keyword in self.risk_keywords)
+            for sentence in sentences
+        ]
+
+    def _sentence_compounds(self, sentences):
+        """Compound sentiment of each sentence, memoized across documents"""
+        return np.array([scores['compound'] for scores in sentiment_memo(sentences)], dtype=float)
+
+    def memo_stats(self):
+        """Dedup statistics of the sentence sentiment and risk keyword memos"""
+        return {
+            'sentiment': sentiment_memo.stats(),
+            'risk_keywords': self.risk_sentences.stats()
+        }
     
     def extract_key_metrics(self, text):
         """Extract numerical metrics from text"""
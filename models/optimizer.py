@@ -1,11 +1,43 @@
-from pulp import *
 import numpy as np
 
+from models.lp_solvers import LPSolver
+
+
+def greedy_fill(scores, caps, budget):
+    """Fill the budget with the highest-scoring projects first, each up to its cap
+
+    Projects with a non-positive score get nothing. Only the top of the
+    ranking is sorted: the best k projects are picked with argpartition and
+    k grows until their caps cover the budget.
+    """
+    allocation = np.zeros(len(scores))
+    candidates = np.flatnonzero(scores > 0)
+    if budget <= 0 or len(candidates) == 0:
+        return allocation
+    k = min(64, len(candidates))
+    while True:
+        if k < len(candidates):
+            top = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        else:
+            top = candidates
+        # Ties broken by index, so the allocation is deterministic
+        order = top[np.lexsort((top, -scores[top]))]
+        filled = np.cumsum(caps[order])
+        if filled[-1] >= budget or len(top) == len(candidates):
+            break
+        k *= 4
+    allocation[order] = np.clip(budget - (filled - caps[order]), 0, caps[order])
+    return allocation
+
+
 class InvestmentOptimizer:
-    def __init__(self):
+    def __init__(self, solver=None):
         self.model = None
+        # LP backend for general constraints; HiGHS in-process by default
+        self.solver = solver or LPSolver()
         
-    def optimize_portfolio(self, projects, total_budget, min_esg_score=50):
+    def optimize_portfolio(self, projects, total_budget, min_esg_score=50, extra_constraints=None,
+                           method='auto'):
         """
         Optimize investment allocation across projects
         
@@ -14,63 +46,112 @@ class InvestmentOptimizer:
           (each with 'name', 'cost', 'esg_score', 'expected_return', 'risk_score')
         - total_budget: total available budget
         - min_esg_score: minimum acceptable ESG score
+        - extra_constraints: optional list of general linear constraints, each a
+          dict with 'coefficients' (one per project), 'sense' ('<=' or '>=') and 'rhs'
+        - method: 'greedy' for the exact greedy/Lagrangian solver, 'lp' for the
+          LP solver, or 'auto' to use the greedy solver unless extra
+          constraints are given
         """
+        if method not in ('auto', 'greedy', 'lp'):
+            raise ValueError(f"Unknown method '{method}'")
+        if method == 'greedy' and extra_constraints:
+            raise ValueError("The greedy solver only handles the budget, cap and ESG constraints")
         
-        # Create optimization problem
-        prob = LpProblem("Green_Investment_Optimization", LpMaximize)
-        
-        # Decision variables: how much to invest in each project
-        investment_vars = LpVariable.dicts("Invest",
-                                         ((i) for i in range(len(projects))),
-                                         0,
-                                         None)
-        
-        # Objective: Maximize total ESG impact while considering returns
-        prob += lpSum([investment_vars[i] * (
-            0.7 * projects[i]['esg_score']/100 +  # 70% weight on ESG score
-            0.3 * projects[i]['expected_return']/100  # 30% weight on financial return
-        ) for i in range(len(projects))])
-        
-        # Constraints
-        
-        # Budget constraint
-        prob += lpSum([investment_vars[i] for i in range(len(projects))]) <= total_budget
-        
-        # Minimum investment constraints
-        for i in range(len(projects)):
-            prob += investment_vars[i] <= projects[i]['cost']
-        
-        # Minimum ESG score constraint
-        prob += lpSum([investment_vars[i] * projects[i]['esg_score'] 
-                      for i in range(len(projects))]) >= min_esg_score * total_budget
+        esg = np.array([p['esg_score'] for p in projects], dtype=float)
+        returns = np.array([p['expected_return'] for p in projects], dtype=float)
+        # No more than the project cost, and no more than 40% in one project
+        caps = np.minimum(np.array([p['cost'] for p in projects], dtype=float), 0.4 * total_budget)
+        # Objective: 70% weight on ESG score, 30% on financial return
+        weights = 0.7 * esg / 100 + 0.3 * returns / 100
         
-        # Risk diversification constraint
-        for i in range(len(projects)):
-            prob += investment_vars[i] <= 0.4 * total_budget  # No more than 40% in one project
-        
-        # Solve the optimization problem
-        prob.solve()
+        if method == 'lp' or extra_constraints:
+            status, allocation = self._solve_lp(weights, esg, caps, total_budget, min_esg_score,
+                                                extra_constraints or [])
+        else:
+            status, allocation = self._solve_greedy(weights, esg, caps, total_budget, min_esg_score)
         
         # Extract results
         results = []
-        for i in range(len(projects)):
-            if value(investment_vars[i]) > 0:
-                results.append({
-                    'project_name': projects[i]['name'],
-                    'investment_amount': value(investment_vars[i]),
-                    'esg_impact': projects[i]['esg_score'] * value(investment_vars[i]) / total_budget,
-                    'expected_return': projects[i]['expected_return'] * value(investment_vars[i]) / total_budget,
-                    'risk_score': projects[i]['risk_score']
-                })
+        for i in np.flatnonzero(allocation > 0):
+            results.append({
+                'project_name': projects[i]['name'],
+                'investment_amount': float(allocation[i]),
+                'esg_impact': projects[i]['esg_score'] * float(allocation[i]) / total_budget,
+                'expected_return': projects[i]['expected_return'] * float(allocation[i]) / total_budget,
+                'risk_score': projects[i]['risk_score']
+            })
         
         return {
-            'optimization_status': LpStatus[prob.status],
+            'optimization_status': status,
             'total_esg_impact': sum(r['esg_impact'] for r in results),
             'total_expected_return': sum(r['expected_return'] for r in results),
             'allocated_budget': sum(r['investment_amount'] for r in results),
             'project_allocations': results
         }
     
+    def _solve_greedy(self, weights, esg, caps, budget, min_esg_score, tolerance=1e-12):
+        """Exact solution of the budget/cap/ESG-floor LP without an LP solver
+        
+        Without the ESG floor the LP is a fractional knapsack: fill the budget
+        by objective weight. The floor is moved into the objective with a
+        multiplier lam, ranking projects by weights + lam * esg. The ESG total
+        of the greedy fill grows with lam, so lam is bisected until the floor
+        is met; the two fills either side of the crossing are optimal for the
+        same lam (up to the bisection tolerance) and are mixed so the floor
+        holds with equality.
+        """
+        esg_floor = min_esg_score * budget
+        fill = lambda lam: greedy_fill(weights + lam * esg, caps, budget)
+        
+        allocation = fill(0.0)
+        if allocation @ esg >= esg_floor * (1 - tolerance):
+            return 'Optimal', allocation
+        # The most ESG any allocation can reach
+        if greedy_fill(esg, caps, budget) @ esg < esg_floor * (1 - tolerance):
+            return 'Infeasible', np.zeros(len(weights))
+        
+        low, low_allocation = 0.0, allocation
+        high = max(np.abs(weights).max() / max(esg.max(), tolerance), tolerance)
+        high_allocation = fill(high)
+        while high_allocation @ esg < esg_floor * (1 - tolerance):
+            low, low_allocation = high, high_allocation
+            high *= 2
+            high_allocation = fill(high)
+        
+        while high - low > tolerance * high:
+            middle = (low + high) / 2
+            allocation = fill(middle)
+            if allocation @ esg < esg_floor:
+                low, low_allocation = middle, allocation
+            else:
+                high, high_allocation = middle, allocation
+        
+        low_esg, high_esg = low_allocation @ esg, high_allocation @ esg
+        share = (high_esg - esg_floor) / (high_esg - low_esg) if high_esg > low_esg else 0.0
+        return 'Optimal', share * low_allocation + (1 - share) * high_allocation
+    
+    def _solve_lp(self, weights, esg, caps, budget, min_esg_score, extra_constraints):
+        """Solve the allocation LP with the LP solver, including any general constraints"""
+        # Budget constraint, then the minimum ESG score as -esg @ x <= -floor
+        rows = [np.ones(len(weights)), -esg]
+        rhs = [budget, -min_esg_score * budget]
+        for constraint in extra_constraints:
+            coefficients = np.asarray(constraint['coefficients'], dtype=float)
+            if constraint['sense'] == '<=':
+                rows.append(coefficients)
+                rhs.append(constraint['rhs'])
+            elif constraint['sense'] == '>=':
+                rows.append(-coefficients)
+                rhs.append(-constraint['rhs'])
+            else:
+                raise ValueError(f"Unknown constraint sense '{constraint['sense']}'")
+        
+        # Objective: Maximize total ESG impact while considering returns,
+        # investing between 0 and each project's cap
+        result = self.solver.solve(weights, A_ub=np.array(rows), b_ub=rhs, bounds=(0, caps), maximize=True)
+        allocation = result['x'] if result['x'] is not None else np.zeros(len(weights))
+        return result['status'], allocation
+    
     def generate_synthetic_projects(self, n_projects=10):
         """Generate synthetic project data for demonstration"""
         np.random.seed(42)
@@ -129,7 +129,16 @@ class RealTimeManager:
         self.socketio.emit('esg_params_update', {
             'params': new_params,
             'timestamp': datetime.now().isoformat()
-        }, broadcast=True)
+        })
+    
+    def notify_esg_scores_rescored(self, scores, new_params):
+        """Notify all users about composite scores recomputed for new ESG weights"""
+        self.socketio.emit('esg_scores_update', {
+            'params': new_params,
+            'scores': scores,
+            'project_count': len(scores),
+            'timestamp': datetime.now().isoformat()
+        })
     
     def get_active_users(self):
         """Get list of currently active users"""
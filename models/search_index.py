@@ -0,0 +1,219 @@
+"""
+Inverted index with BM25 ranking over project text
+
+Each project is a document made of its name, description, sustainability
+impact and update texts. Every term keeps a postings list of (document,
+term frequency) that grows as projects are added or updated, so indexing a
+project or an update only touches its own terms. At query time the postings
+of the query terms are turned into numpy arrays (cached until the term
+changes) and BM25 scores are accumulated for the matching documents only.
+
+Filters work on per-document arrays: status, and the project's dominant
+ESG category with its component score, kept current through
+update_project.
+"""
+import re
+import threading
+
+import numpy as np
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Project fields indexed, followed by the text of every update
+TEXT_FIELDS = ('name', 'description', 'sustainability_impact')
+ESG_CATEGORIES = ('environmental', 'social', 'governance')
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Lowercase alphanumeric terms of text without English stopwords"""
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if term not in ENGLISH_STOP_WORDS]
+
+
+class _Postings:
+    """Documents containing a term and the term's frequency in each"""
+
+    __slots__ = ('docs', 'freqs', 'arrays')
+
+    def __init__(self):
+        self.docs = []
+        self.freqs = []
+        self.arrays = None
+
+    def add(self, doc, freq):
+        self.docs.append(doc)
+        self.freqs.append(freq)
+        self.arrays = None
+
+    def as_arrays(self):
+        """Unique documents and their total frequencies, as numpy arrays"""
+        if self.arrays is None:
+            docs = np.array(self.docs, dtype=np.int64)
+            freqs = np.array(self.freqs, dtype=float)
+            # An update can add a term to a document that already has it
+            unique, inverse = np.unique(docs, return_inverse=True)
+            if len(unique) < len(docs):
+                freqs = np.bincount(inverse, weights=freqs)
+                self.docs, self.freqs = unique.tolist(), freqs.tolist()
+                docs = unique
+            self.arrays = (docs, freqs)
+        return self.arrays
+
+
+class ProjectSearchIndex:
+    """BM25 full-text search over projects with status and ESG filters"""
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._doc_of = {}
+        self._project_ids = []
+        self._lengths = np.zeros(0)
+        self._statuses = np.zeros(0, dtype=np.int16)
+        self._status_codes = {}
+        self._categories = np.zeros(0, dtype=np.int8)
+        self._category_scores = np.zeros(0)
+        self._total_length = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._project_ids)
+
+    def _grow(self):
+        n = len(self._project_ids)
+        if n > len(self._lengths):
+            capacity = max(2 * len(self._lengths), 1024, n)
+            for name in ('_lengths', '_statuses', '_categories', '_category_scores'):
+                old = getattr(self, name)
+                new = np.zeros(capacity, dtype=old.dtype)
+                new[:len(old)] = old
+                setattr(self, name, new)
+
+    def _index_text(self, doc, text):
+        terms = tokenize(text)
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, freq in counts.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+            postings.add(doc, freq)
+        self._lengths[doc] += len(terms)
+        self._total_length += len(terms)
+
+    def _set_filters(self, doc, project):
+        status = project.get('status')
+        self._statuses[doc] = self._status_codes.setdefault(status, len(self._status_codes))
+        scores = [float(project.get(f'{category}_score') or 0) for category in ESG_CATEGORIES]
+        best = int(np.argmax(scores))
+        # Projects not scored yet have no dominant category
+        self._categories[doc] = best if scores[best] > 0 else -1
+        self._category_scores[doc] = scores[best]
+
+    def add_project(self, project):
+        """Index a new project (or re-index its filters if already present)"""
+        project_id = str(project.get('id'))
+        with self._lock:
+            doc = self._doc_of.get(project_id)
+            if doc is not None:
+                self._set_filters(doc, project)
+                return
+            doc = self._doc_of[project_id] = len(self._project_ids)
+            self._project_ids.append(project_id)
+            self._grow()
+            text = ' '.join(str(project.get(field) or '') for field in TEXT_FIELDS)
+            text += ' ' + ' '.join(update.get('text', '') for update in project.get('updates', []))
+            self._index_text(doc, text)
+            self._set_filters(doc, project)
+
+    def add_projects(self, projects):
+        for project in projects:
+            self.add_project(project)
+
+    def add_update(self, project, update_text):
+        """Add the text of a new update to an indexed project"""
+        project_id = str(project.get('id'))
+        with self._lock:
+            doc = self._doc_of.get(project_id)
+        if doc is None:
+            # The project already holds the update, so indexing it covers it
+            self.add_project(project)
+            return
+        with self._lock:
+            self._index_text(doc, update_text)
+
+    def update_project(self, project):
+        """Refresh the status and ESG filters of an indexed project"""
+        with self._lock:
+            doc = self._doc_of.get(str(project.get('id')))
+            if doc is not None:
+                self._set_filters(doc, project)
+
+    def _filter_mask(self, n, statuses, category, min_score):
+        mask = np.ones(n, dtype=bool)
+        if statuses is not None:
+            codes = [self._status_codes[status] for status in statuses if status in self._status_codes]
+            mask &= np.isin(self._statuses[:n], codes)
+        if category is not None:
+            mask &= self._categories[:n] == ESG_CATEGORIES.index(category)
+        if min_score is not None:
+            mask &= self._category_scores[:n] >= min_score
+        return mask
+
+    def search(self, query, statuses=None, category=None, min_score=None, page=1, per_page=20):
+        """Projects matching query, best BM25 score first
+
+        statuses limits results to projects with one of the given statuses;
+        category to projects whose highest ESG component score is that
+        category, and min_score to projects whose highest component score is
+        at least min_score. An empty query returns every project that passes
+        the filters, in indexing order. Returns the total number of matches
+        and one page of {'id', 'score'} results.
+        """
+        if category is not None and category not in ESG_CATEGORIES:
+            raise ValueError(f"Unknown ESG category '{category}'")
+        page, per_page = max(int(page), 1), max(int(per_page), 1)
+        terms = set(tokenize(query or ''))
+
+        with self._lock:
+            n = len(self._project_ids)
+            mask = self._filter_mask(n, statuses, category, min_score)
+            if not terms:
+                docs = np.flatnonzero(mask)
+                scores = np.zeros(len(docs))
+            else:
+                lengths = self._lengths[:n]
+                average_length = self._total_length / n if n else 0.0
+                scores = np.zeros(n)
+                matched = np.zeros(n, dtype=bool)
+                for term in terms:
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        continue
+                    docs, freqs = postings.as_arrays()
+                    idf = np.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                    norm = self.k1 * (1 - self.b + self.b * lengths[docs] / average_length)
+                    scores[docs] += idf * freqs * (self.k1 + 1) / (freqs + norm)
+                    matched[docs] = True
+                docs = np.flatnonzero(matched & mask)
+                scores = scores[docs]
+            project_ids = self._project_ids
+
+        total = len(docs)
+        start, end = (page - 1) * per_page, page * per_page
+        if terms and start < total:
+            # Only the documents up to the end of the page need sorting
+            if end < total:
+                top = np.argpartition(-scores, end - 1)[:end]
+            else:
+                top = np.arange(total)
+            order = top[np.lexsort((docs[top], -scores[top]))][start:end]
+        else:
+            order = np.arange(start, min(end, total))
+        return {
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'results': [{'id': project_ids[docs[i]], 'score': float(scores[i])} for i in order]
+        }
@@ -0,0 +1,160 @@
+"""
+Similar projects by TF-IDF cosine similarity
+
+ProjectSimilarityIndex fits a TF-IDF vectorizer over the text of every
+project and keeps the L2-normalized rows as one sparse CSR matrix, so the
+cosine similarity of two projects is the dot product of their rows.
+Neighbours are found by multiplying the sparse matrix, one block of
+project rows at a time, with the query vectors as a small dense array
+(sparse x dense is far cheaper than sparse x sparse when every project
+is scored). Only a (queries x block) array of at most max_scores scores
+and the running top k exist at once, so a single query scores every
+project in one pass while all-pairs lookups stay within a fixed amount
+of memory.
+
+New projects are transformed with the fitted vocabulary and appended
+without refitting. Terms the vocabulary has not seen are ignored until the
+next fit, which happens automatically once the number of projects added
+since the last fit exceeds refit_ratio times the number fitted.
+"""
+import threading
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from models.search_index import TEXT_FIELDS
+
+
+def project_text(project):
+    return ' '.join(str(project.get(field) or '') for field in TEXT_FIELDS)
+
+
+class ProjectSimilarityIndex:
+    """Top-k most similar projects for a project or a free text"""
+
+    def __init__(self, max_features=20000, max_scores=4_000_000, refit_ratio=1.0):
+        self.max_features = max_features
+        self.max_scores = max_scores
+        self.refit_ratio = refit_ratio
+        self.vectorizer = None
+        self.project_ids = []
+        self._texts = []
+        self._row_of = {}
+        self._matrix = None
+        self._pending = []
+        self._fitted_rows = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.project_ids)
+
+    def fit(self, projects):
+        """Fit the vocabulary on projects and index them, replacing any earlier fit"""
+        with self._lock:
+            self.project_ids = [str(project.get('id')) for project in projects]
+            self._texts = [project_text(project) for project in projects]
+            self._row_of = {project_id: row for row, project_id in enumerate(self.project_ids)}
+            self._refit()
+
+    def _refit(self):
+        self._pending = []
+        self._fitted_rows = len(self._texts)
+        if not any(text.strip() for text in self._texts):
+            self.vectorizer, self._matrix = None, None
+            return
+        self.vectorizer = TfidfVectorizer(max_features=self.max_features, stop_words='english',
+                                          sublinear_tf=True, dtype=np.float32)
+        try:
+            self._matrix = self.vectorizer.fit_transform(self._texts).tocsr()
+        except ValueError:
+            # Only stopwords so far: nothing to compare on
+            self.vectorizer, self._matrix = None, None
+
+    def add_project(self, project):
+        """Index one new project with the fitted vocabulary"""
+        project_id = str(project.get('id'))
+        with self._lock:
+            if project_id in self._row_of:
+                return
+            self._row_of[project_id] = len(self.project_ids)
+            self.project_ids.append(project_id)
+            self._texts.append(project_text(project))
+            if self.vectorizer is None or \
+                    len(self._texts) - self._fitted_rows > self.refit_ratio * self._fitted_rows:
+                self._refit()
+            else:
+                # TfidfVectorizer already returns L2-normalized rows
+                self._pending.append(self.vectorizer.transform([self._texts[-1]]))
+
+    def _rows(self):
+        if self._pending:
+            self._matrix = sp.vstack([self._matrix] + self._pending, format='csr')
+            self._pending = []
+        return self._matrix
+
+    def _top_k(self, queries, k, exclude):
+        """Best k neighbours with a positive similarity for each query row
+
+        exclude holds, per query, an indexed row to leave out (or -1).
+        """
+        matrix = self._rows()
+        n_queries, n_rows = queries.shape[0], matrix.shape[0]
+        dense_queries = queries.T.toarray()
+        best_scores = np.full((n_queries, 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((n_queries, 0), dtype=np.int64)
+        query_index = np.arange(n_queries)
+        block_size = max(self.max_scores // n_queries, k, 1)
+
+        for start in range(0, n_rows, block_size):
+            block = matrix if block_size >= n_rows else matrix[start:start + block_size]
+            scores = (block @ dense_queries).T
+            inside = (exclude >= start) & (exclude < start + block.shape[0])
+            scores[query_index[inside], exclude[inside] - start] = -np.inf
+
+            rows = np.broadcast_to(np.arange(start, start + block.shape[0]), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                rows = np.take_along_axis(rows, keep, axis=1)
+            best_scores, best_rows = scores, rows
+
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [
+            [{'id': self.project_ids[row], 'similarity': float(score)}
+             for row, score in zip(rows, scores) if score > 0]
+            for rows, scores in zip(best_rows, best_scores)
+        ]
+
+    def similar_projects(self, project_id, k=5):
+        """The k projects most similar to an indexed project (itself excluded)"""
+        with self._lock:
+            row = self._row_of.get(str(project_id))
+            if row is None or self.vectorizer is None or k <= 0:
+                return []
+            matrix = self._rows()
+            return self._top_k(matrix[row], k, np.array([row]))[0]
+
+    def similar_to_text(self, text, k=5):
+        """The k projects most similar to a free text"""
+        with self._lock:
+            if self.vectorizer is None or k <= 0:
+                return []
+            return self._top_k(self.vectorizer.transform([text]), k, np.array([-1]))[0]
+
+    def all_similar(self, k=5, query_block_size=256):
+        """The k most similar projects of every project, as {project_id: neighbours}"""
+        with self._lock:
+            if self.vectorizer is None or k <= 0:
+                return {project_id: [] for project_id in self.project_ids}
+            matrix = self._rows()
+            neighbours = {}
+            for start in range(0, matrix.shape[0], query_block_size):
+                rows = np.arange(start, min(start + query_block_size, matrix.shape[0]))
+                for row, found in zip(rows, self._top_k(matrix[rows], k, rows)):
+                    neighbours[self.project_ids[row]] = found
+            return neighbours
@@ -0,0 +1,222 @@
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import scipy.linalg
+from typing import Dict, Optional, Tuple
+
+
+class ActiveSetQP:
+    """
+    Primal active-set solver for convex quadratic programs
+
+        minimize    1/2 x'Qx + c'x
+        subject to  A x == b,  G x <= h,  lower <= x <= upper
+
+    Q, A, G and the bounds are fixed when the solver is built; c, b and h
+    change between solves. That is the shape of a parametric sweep (a
+    frontier over target returns, a risk-aversion path), where consecutive
+    problems have nearly the same active set. solve() takes the working set
+    of the previous solution and first tries it directly: one KKT solve
+    settles the problem whenever the active set has not changed. Otherwise
+    it runs the primal active-set method from a feasible starting point,
+    adding a blocking constraint or releasing one with a negative
+    multiplier per iteration.
+    
+    The KKT matrix depends only on the working set, not on c, b or h, so its
+    LU factorization is kept, for the max_factors most recent working sets,
+    and reused whenever a working set comes back; a warm-started solve then
+    costs two triangular solves.
+    """
+
+    def __init__(self, Q: np.ndarray, A: np.ndarray, G: Optional[np.ndarray] = None,
+                 lower=0.0, upper=np.inf, tol: float = 1e-10, max_iter: int = None,
+                 max_factors: int = 64):
+        """
+        Args:
+            Q: Symmetric positive semidefinite (n x n) matrix
+            A: Equality constraint rows (m x n)
+            G: Inequality constraint rows (k x n), if any
+            lower: Lower bounds, scalar or per variable
+            upper: Upper bounds, scalar or per variable
+            tol: Feasibility and optimality tolerance, relative to the data scale
+            max_iter: Iteration limit per solve (default: 10 * (n + k) + 100)
+            max_factors: KKT factorizations kept for reuse
+        """
+        self.Q = np.asarray(Q, dtype=float)
+        n = self.Q.shape[0]
+        self.A = np.atleast_2d(np.asarray(A, dtype=float)).reshape(-1, n)
+        self.G = np.zeros((0, n)) if G is None else np.atleast_2d(np.asarray(G, dtype=float)).reshape(-1, n)
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), n).copy()
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), n).copy()
+        self.tol = tol
+        self.max_iter = max_iter or 10 * (n + len(self.G)) + 100
+        self.max_factors = max_factors
+        self._factors = OrderedDict()
+
+    def _initial_state(self, x: np.ndarray) -> np.ndarray:
+        """-1 for variables at their lower bound, +1 at their upper bound, 0 free"""
+        scale = self.tol * (1 + np.abs(x).max(initial=0))
+        state = np.zeros(len(x), dtype=np.int8)
+        state[x <= self.lower + scale] = -1
+        state[x >= self.upper - scale] = 1
+        return state
+
+    def _kkt(self, c: np.ndarray, b: np.ndarray, h: np.ndarray, state: np.ndarray, g_active: np.ndarray):
+        """Minimizer over the working set: fixed variables at their bounds, active rows as equalities"""
+        free = state == 0
+        x = np.where(state < 0, self.lower, np.where(state > 0, self.upper, 0.0))
+        rows = np.vstack([self.A, self.G[g_active]])
+        rhs = np.concatenate([b, h[g_active]])
+        fixed_x = x[~free]
+
+        n_free = int(free.sum())
+        rhs_kkt = np.concatenate([
+            -c[free] - self.Q[np.ix_(free, ~free)] @ fixed_x,
+            rhs - rows[:, ~free] @ fixed_x
+        ])
+
+        key = state.tobytes() + g_active.tobytes()
+        factor = self._factors.get(key)
+        if factor is None:
+            m = len(rows)
+            kkt = np.zeros((n_free + m, n_free + m))
+            kkt[:n_free, :n_free] = self.Q[np.ix_(free, free)]
+            kkt[:n_free, n_free:] = rows[:, free].T
+            kkt[n_free:, :n_free] = rows[:, free]
+            with np.errstate(all='ignore'), warnings.catch_warnings():
+                warnings.simplefilter('ignore', scipy.linalg.LinAlgWarning)
+                lu, pivots = scipy.linalg.lu_factor(kkt, check_finite=False)
+            # A zero pivot means dependent working rows; fall back to least squares
+            singular = np.abs(np.diag(lu)).min(initial=np.inf) <= 1e-13 * np.abs(kkt).max(initial=1)
+            factor = self._factors[key] = kkt if singular else (lu, pivots)
+            if len(self._factors) > self.max_factors:
+                self._factors.popitem(last=False)
+        else:
+            self._factors.move_to_end(key)
+        if isinstance(factor, tuple):
+            solution = scipy.linalg.lu_solve(factor, rhs_kkt, check_finite=False)
+        else:
+            # Any consistent multipliers will do
+            solution = np.linalg.lstsq(factor, rhs_kkt, rcond=None)[0]
+        x[free] = solution[:n_free]
+        return x, solution[n_free:], rows
+
+    def _multipliers(self, x, c, y, rows, state, g_active):
+        """Multipliers of the active bounds and of the active G rows (all >= 0 at the optimum)"""
+        gradient = self.Q @ x + c + rows.T @ y
+        bound_multipliers = np.where(state < 0, gradient, np.where(state > 0, -gradient, np.inf))
+        g_multipliers = np.full(len(self.G), np.inf)
+        g_multipliers[g_active] = y[len(self.A):]
+        return bound_multipliers, g_multipliers, np.abs(gradient).max(initial=0)
+
+    def _feasible(self, x, h, g_active, scale):
+        tol = self.tol * scale
+        return (np.all(x >= self.lower - tol) and np.all(x <= self.upper + tol) and
+                np.all(self.G[~g_active] @ x <= h[~g_active] + tol))
+
+    def segment(self, c: np.ndarray, dc: np.ndarray, b: np.ndarray, h: Optional[np.ndarray],
+                working: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Minimizers over a fixed working set along the linear terms c + t * dc
+        
+        The working-set minimizer is linear in c, so it is x0 + t * dx for
+        every t; it is the solution of the QP for as long as that working
+        set stays optimal.
+        
+        Returns:
+            Tuple of (x0, dx)
+        """
+        c, dc = np.asarray(c, dtype=float), np.asarray(dc, dtype=float)
+        b = np.atleast_1d(np.asarray(b, dtype=float))
+        h = np.zeros(0) if h is None else np.atleast_1d(np.asarray(h, dtype=float))
+        state, g_active = working['state'], working['g_active']
+        x0 = self._kkt(c, b, h, state, g_active)[0]
+        x1 = self._kkt(c + dc, b, h, state, g_active)[0]
+        return x0, x1 - x0
+
+    def solve(self, c: np.ndarray, b: np.ndarray, h: Optional[np.ndarray] = None,
+              start: Optional[np.ndarray] = None, working: Optional[Dict] = None) -> Dict:
+        """
+        Solve the QP for one set of c, b and h
+
+        Args:
+            c: Linear objective term
+            b: Equality right-hand sides
+            h: Inequality right-hand sides (required when G has rows)
+            start: Feasible starting point, used when working does not settle the problem
+            working: Working set of an earlier solution, tried first
+
+        Returns:
+            Dict with 'x', 'status' ('optimal' or 'max_iter'), 'iterations'
+            (KKT solves) and 'working', to pass to the next solve
+        """
+        c = np.asarray(c, dtype=float)
+        b = np.atleast_1d(np.asarray(b, dtype=float))
+        h = np.zeros(0) if h is None else np.atleast_1d(np.asarray(h, dtype=float))
+        iterations = 0
+
+        if working is not None:
+            state, g_active = working['state'].copy(), working['g_active'].copy()
+            x, y, rows = self._kkt(c, b, h, state, g_active)
+            iterations += 1
+            bound_multipliers, g_multipliers, scale = self._multipliers(x, c, y, rows, state, g_active)
+            scale = 1 + max(scale, np.abs(x).max(initial=0))
+            if self._feasible(x, h, g_active, scale) and \
+                    min(bound_multipliers.min(initial=np.inf), g_multipliers.min(initial=np.inf)) >= -self.tol * scale:
+                return {'x': x, 'status': 'optimal', 'iterations': iterations,
+                        'working': {'state': state, 'g_active': g_active}}
+
+        if start is None:
+            raise ValueError("A feasible start is needed when the working set does not solve the problem")
+        x = np.clip(np.asarray(start, dtype=float), self.lower, self.upper)
+        state = self._initial_state(x)
+        x = np.where(state < 0, self.lower, np.where(state > 0, self.upper, x))
+        g_active = self.G @ x >= h - self.tol * (1 + np.abs(h))
+
+        while iterations < self.max_iter:
+            candidate, y, rows = self._kkt(c, b, h, state, g_active)
+            iterations += 1
+            step = candidate - x
+
+            if np.abs(step).max(initial=0) <= self.tol * (1 + np.abs(x).max(initial=0)):
+                bound_multipliers, g_multipliers, scale = self._multipliers(candidate, c, y, rows, state, g_active)
+                threshold = -self.tol * (1 + scale)
+                worst_bound = int(np.argmin(bound_multipliers)) if len(x) else 0
+                worst_g = int(np.argmin(g_multipliers)) if len(self.G) else 0
+                bound_value = bound_multipliers[worst_bound] if len(x) else np.inf
+                g_value = g_multipliers[worst_g] if len(self.G) else np.inf
+                if min(bound_value, g_value) >= threshold:
+                    return {'x': candidate, 'status': 'optimal', 'iterations': iterations,
+                            'working': {'state': state, 'g_active': g_active}}
+                # Release the constraint with the most negative multiplier
+                if bound_value <= g_value:
+                    state[worst_bound] = 0
+                else:
+                    g_active[worst_g] = False
+                x = candidate
+                continue
+
+            # Longest step along the direction that keeps every constraint satisfied
+            free = state == 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                to_lower = np.where(free & (step < 0), (self.lower - x) / step, np.inf)
+                to_upper = np.where(free & (step > 0), (self.upper - x) / step, np.inf)
+                g_step = self.G @ step
+                to_g = np.where(~g_active & (g_step > 0), (h - self.G @ x) / g_step, np.inf)
+            ratios = [to_lower.min(initial=np.inf), to_upper.min(initial=np.inf), to_g.min(initial=np.inf)]
+            blocking = int(np.argmin(ratios))
+            alpha = min(1.0, max(ratios[blocking], 0.0))
+            x = x + alpha * step
+            if alpha < 1.0:
+                if blocking == 0:
+                    i = int(np.argmin(to_lower))
+                    state[i], x[i] = -1, self.lower[i]
+                elif blocking == 1:
+                    i = int(np.argmin(to_upper))
+                    state[i], x[i] = 1, self.upper[i]
+                else:
+                    g_active[int(np.argmin(to_g))] = True
+
+        return {'x': x, 'status': 'max_iter', 'iterations': iterations,
+                'working': {'state': state, 'g_active': g_active}}
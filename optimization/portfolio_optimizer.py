@@ -1,20 +1,31 @@
+import threading
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
-from pulp import *
 from scipy.optimize import minimize
 import yfinance as yf
 from typing import Dict, List, Tuple
 
+from models.lp_solvers import LPSolver
+from optimization.active_set_qp import ActiveSetQP
+
 class GreenPortfolioOptimizer:
-    def __init__(self, risk_free_rate: float = 0.02):
+    def __init__(self, risk_free_rate: float = 0.02, solver: LPSolver = None):
         """
         Initialize the Green Portfolio Optimizer
         
         Args:
             risk_free_rate: Annual risk-free rate (default: 2%)
+            solver: LP backend (default: HiGHS in-process)
         """
         self.risk_free_rate = risk_free_rate
+        self.solver = solver or LPSolver()
         self.daily_risk_free_rate = (1 + risk_free_rate) ** (1/252) - 1
+        # Convex problems by covariance and constraints, for _convex_weights
+        self.max_cached_problems = 16
+        self._convex_problems = OrderedDict()
+        self._convex_lock = threading.Lock()
     
     def calculate_portfolio_metrics(self, weights: np.ndarray, returns: np.ndarray, 
                                  esg_scores: np.ndarray, cov_matrix: np.ndarray) -> Tuple[float, float, float]:
@@ -42,9 +53,17 @@ class GreenPortfolioOptimizer:
                          total_budget: float,
                          min_esg_score: float = 0.6,
                          max_volatility: float = None,
-                         min_return: float = None) -> Dict:
+                         min_return: float = None,
+                         method: str = 'auto') -> Dict:
         """
-        Optimize portfolio allocation using linear programming
+        Optimize portfolio allocation
+        
+        The objective (return plus ESG score), the budget, the ESG floor,
+        min_return and the 5%-40% position limits are linear; with method='lp'
+        they are solved as an LP. The volatility limit w'Σw <= max_volatility²
+        is quadratic, so method='convex' solves the problem as a convex QP
+        (see _convex_weights). 'auto' picks 'convex' when max_volatility is
+        given and 'lp' otherwise.
         
         Args:
             expected_returns: Dict of asset expected returns
@@ -54,52 +73,47 @@ class GreenPortfolioOptimizer:
             min_esg_score: Minimum required ESG score (0-1)
             max_volatility: Maximum allowed portfolio volatility
             min_return: Minimum required portfolio return
+            method: 'auto', 'lp' or 'convex'
             
         Returns:
             Dict containing optimal weights and portfolio metrics
         """
-        # Create optimization problem
-        prob = LpProblem("Green_Portfolio_Optimization", LpMaximize)
-        
-        # Decision variables (portfolio weights)
+        if method not in ('auto', 'lp', 'convex'):
+            raise ValueError(f"Unknown method '{method}'")
+        if method == 'lp' and max_volatility is not None:
+            raise ValueError("max_volatility is a quadratic constraint; use method='convex'")
         assets = list(expected_returns.keys())
-        weights = LpVariable.dicts("weights", assets, lowBound=0, upBound=1)
-        
-        # Objective: Maximize Sharpe Ratio proxy (return/risk + ESG score)
-        portfolio_return = lpSum([weights[asset] * expected_returns[asset] for asset in assets])
-        esg_contribution = lpSum([weights[asset] * esg_scores[asset] for asset in assets])
-        
-        # We'll maximize a combination of return and ESG score
-        prob += portfolio_return + esg_contribution
-        
-        # Constraints
-        # 1. Budget constraint
-        prob += lpSum([weights[asset] for asset in assets]) == 1
-        
-        # 2. Minimum ESG score
-        prob += lpSum([weights[asset] * esg_scores[asset] for asset in assets]) >= min_esg_score
-        
-        # 3. Maximum position size (diversification)
-        for asset in assets:
-            prob += weights[asset] <= 0.4  # No more than 40% in any single asset
-        
-        # 4. Minimum position size (if taken)
-        for asset in assets:
-            prob += weights[asset] >= 0.05  # At least 5% if position is taken
+        returns_array = np.array([expected_returns[asset] for asset in assets])
+        esg_array = np.array([esg_scores[asset] for asset in assets])
         
-        # Solve the optimization problem
-        prob.solve()
+        if method == 'convex' or max_volatility is not None:
+            weights, status = self._convex_weights(returns_array, esg_array, covariance_matrix.values,
+                                                   min_esg_score, min_return, max_volatility)
+        else:
+            # Objective: Maximize Sharpe Ratio proxy (return/risk + ESG score)
+            # We'll maximize a combination of return and ESG score
+            G, h = self._linear_constraints(returns_array, esg_array, min_esg_score, min_return)
+            result = self.solver.solve(
+                returns_array + esg_array,
+                # 1. Budget constraint: weights sum to one
+                A_eq=np.ones((1, len(assets))), b_eq=[1],
+                # 2. Minimum ESG score and return, as -esg @ w <= -min_esg_score
+                A_ub=G, b_ub=h,
+                # 3. Maximum position size (diversification): no more than 40% in any single asset
+                # 4. Minimum position size (if taken): at least 5%
+                bounds=(0.05, 0.4),
+                maximize=True
+            )
+            weights, status = result['x'], result['status']
         
-        # Extract results
-        optimal_weights = {asset: value(weights[asset]) for asset in assets}
+        # Extract results; an infeasible problem leaves every weight at zero
+        if weights is None:
+            weights = np.zeros(len(assets))
+        optimal_weights = {asset: float(weight) for asset, weight in zip(assets, weights)}
         
         # Calculate portfolio metrics
-        weight_array = np.array([optimal_weights[asset] for asset in assets])
-        returns_array = np.array([expected_returns[asset] for asset in assets])
-        esg_array = np.array([esg_scores[asset] for asset in assets])
-        
         port_return, port_vol, port_esg = self.calculate_portfolio_metrics(
-            weight_array, returns_array, esg_array, covariance_matrix.values
+            weights, returns_array, esg_array, covariance_matrix.values
         )
         
         # Calculate Sharpe Ratio
@@ -111,55 +125,199 @@ class GreenPortfolioOptimizer:
             'volatility': port_vol,
             'esg_score': port_esg,
             'sharpe_ratio': sharpe_ratio,
-            'total_investment': total_budget
+            'total_investment': total_budget,
+            'optimization_status': status
         }
     
+    @staticmethod
+    def _linear_constraints(returns_array: np.ndarray, esg_array: np.ndarray, min_esg_score: float,
+                            min_return: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows G and bounds h of G @ w <= h for the ESG floor and the minimum return"""
+        G, h = [-esg_array], [-min_esg_score]
+        if min_return is not None:
+            G.append(-returns_array)
+            h.append(-min_return)
+        return np.array(G), np.array(h, dtype=float)
+    
+    def _convex_weights(self, returns_array: np.ndarray, esg_array: np.ndarray, cov: np.ndarray,
+                        min_esg_score: float, min_return: float = None,
+                        max_volatility: float = None) -> Tuple[np.ndarray, str]:
+        """
+        Weights maximizing return plus ESG score under a volatility limit
+        
+        The LP optimum is the answer when its volatility is within the limit.
+        Otherwise the limit binds, and the optimum is the minimizer of the
+        QP 1/2 w'Σw - t * (returns + esg)'w, under the linear constraints,
+        for the t at which its volatility equals max_volatility. Volatility
+        grows with t, from the minimum-variance portfolio at t = 0 (if that
+        exceeds the limit, the problem is infeasible). t is found by
+        bracketing: inside a bracket the QP minimizer over one working set is
+        linear in t, so the t where its volatility reaches the limit solves
+        a quadratic; the QP is solved at that t, warm-started from the
+        working set, and is exact unless the working set changed, in which
+        case the solution narrows the bracket.
+        
+        The QP (with its KKT factorizations), the LP optimum and every point
+        solved so far are cached per covariance matrix and constraint set,
+        so calls that only change max_volatility, like a scenario sweep,
+        start from a tight bracket and mostly cost one or two KKT solves.
+        
+        Returns:
+            Tuple of (weights or None, status using PuLP's status names)
+        """
+        objective = returns_array + esg_array
+        G, h = self._linear_constraints(returns_array, esg_array, min_esg_score, min_return)
+        key = b''.join(np.ascontiguousarray(a, dtype=float).tobytes() for a in (cov, objective, G, h))
+        
+        with self._convex_lock:
+            problem = self._convex_problems.pop(key, None)
+            if problem is None:
+                ones = np.ones((1, len(objective)))
+                top = self.solver.solve(objective, A_eq=ones, b_eq=[1], A_ub=G, b_ub=h,
+                                        bounds=(0.05, 0.4), maximize=True)
+                problem = {'top': top['x'], 'status': top['status'],
+                           'qp': ActiveSetQP(cov, ones, G, 0.05, 0.4), 'path': []}
+            # Most recently used last; the oldest problems are dropped
+            self._convex_problems[key] = problem
+            while len(self._convex_problems) > self.max_cached_problems:
+                self._convex_problems.pop(next(iter(self._convex_problems)))
+            
+            if problem['top'] is None:
+                return None, problem['status']
+            
+            top = problem['top']
+            if max_volatility is None or np.sqrt(max(top @ cov @ top, 0)) <= max_volatility:
+                return top, 'Optimal'
+            return self._volatility_limited(problem, objective, h, cov, max_volatility)
+    
+    def _volatility_limited(self, problem: Dict, objective: np.ndarray, h: np.ndarray, cov: np.ndarray,
+                            max_volatility: float) -> Tuple[np.ndarray, str]:
+        """The point of the risk-aversion path whose volatility is max_volatility"""
+        qp, path = problem['qp'], problem['path']
+        zero = np.zeros(len(objective))
+        tolerance = 1e-9 * max_volatility
+        
+        def solve(t, start, working):
+            result = qp.solve(-t * objective, [1], h, start=start, working=working)
+            weights = result['x']
+            point = {'t': t, 'x': weights, 'working': result['working'],
+                     'volatility': float(np.sqrt(max(weights @ cov @ weights, 0))), 'status': result['status']}
+            # Path points stay sorted by t
+            path.insert(sum(other['t'] < t for other in path), point)
+        
+        if not path:
+            # Start the minimum-variance solve inside the feasible set: equal
+            # weights, mixed with the LP optimum as far as G @ w <= h requires
+            top = problem['top']
+            equal = np.full(len(objective), 1 / len(objective))
+            G = qp.G
+            with np.errstate(divide='ignore', invalid='ignore'):
+                shares = np.where(G @ equal > h, (h - G @ top) / (G @ equal - G @ top), 1.0)
+            share = float(np.clip(shares.min(initial=1.0), 0, 1))
+            solve(0.0, share * equal + (1 - share) * top, None)
+        if path[0]['volatility'] > max_volatility + tolerance:
+            # Even the minimum-variance portfolio exceeds the limit
+            return None, 'Infeasible'
+        
+        for _ in range(100):
+            below = [point for point in path if point['volatility'] <= max_volatility + tolerance]
+            above = [point for point in path if point['volatility'] > max_volatility + tolerance]
+            low = below[-1]
+            if low['volatility'] >= max_volatility - tolerance:
+                break
+            if not above:
+                if low['t'] > 1e12:
+                    # The limit never binds: low is on the LP optimal face
+                    break
+                solve(max(4 * low['t'], 1.0), low['x'], low['working'])
+                continue
+            high = above[0]
+            if high['t'] - low['t'] <= 1e-12 * high['t']:
+                break
+            
+            # Where the volatility over each end's working set reaches the limit
+            t, working = None, None
+            for point in (low, high):
+                x0, dx = qp.segment(zero, -objective, [1], h, point['working'])
+                a, b, c = dx @ cov @ dx, 2 * x0 @ cov @ dx, x0 @ cov @ x0 - max_volatility ** 2
+                if a > 0:
+                    root = (-b + np.sqrt(max(b * b - 4 * a * c, 0))) / (2 * a)
+                elif b > 0:
+                    root = -c / b
+                else:
+                    continue
+                if low['t'] < root < high['t']:
+                    t, working = root, point['working']
+                    break
+            if t is None:
+                t = 0.5 * (low['t'] + high['t'])
+            solve(t, low['x'], working or low['working'])
+        
+        low = [point for point in path if point['volatility'] <= max_volatility + tolerance][-1]
+        return low['x'], 'Optimal' if low['status'] == 'optimal' else 'Not Solved'
+    
     def generate_efficient_frontier(self, expected_returns: Dict[str, float],
                                   esg_scores: Dict[str, float],
                                   covariance_matrix: pd.DataFrame,
-                                  num_portfolios: int = 100) -> pd.DataFrame:
+                                  num_portfolios: int = 100,
+                                  chunk_size: int = None,
+                                  include_weights: bool = True,
+                                  random_state: int = None,
+                                  method: str = 'sample',
+                                  min_esg_score: float = None,
+                                  max_weight: float = 1.0) -> pd.DataFrame:
         """
         Generate the ESG-adjusted efficient frontier
         
+        With method='sample', random portfolios are sampled uniformly from the
+        simplex (Dirichlet with all parameters 1) and evaluated in chunks:
+        returns and ESG scores by a matrix product, volatilities by einsum
+        over the weights and weights @ covariance. Only one chunk of weights
+        is held at a time unless include_weights is set. Metrics are accurate
+        to float32 precision (about 1e-6 relative).
+        
+        With method='exact', the frontier itself is computed: the
+        minimum-variance long-only portfolio for num_portfolios target
+        returns evenly spaced from the minimum-variance portfolio to the
+        highest attainable return, subject to min_esg_score and max_weight.
+        Each point is a QP solved by an active-set method warm-started from
+        the previous point, so most points cost a single linear solve.
+        
         Args:
             expected_returns: Dict of asset expected returns
             esg_scores: Dict of asset ESG scores
             covariance_matrix: Covariance matrix of asset returns
-            num_portfolios: Number of portfolios to generate
+            num_portfolios: Number of portfolios to generate (frontier points for 'exact')
+            chunk_size: Portfolios evaluated per chunk (default: about 4M weights per chunk)
+            include_weights: Add a Weight_<asset> column per asset
+            random_state: Seed for reproducible portfolios
+            method: 'sample' for random portfolios or 'exact' for the frontier
+            min_esg_score: Minimum portfolio ESG score ('exact' only)
+            max_weight: Maximum weight of any single asset ('exact' only)
             
         Returns:
             DataFrame with portfolio metrics along the efficient frontier
         """
-        # Create arrays for storing results
-        all_weights = []
-        ret_arr = np.zeros(num_portfolios)
-        vol_arr = np.zeros(num_portfolios)
-        esg_arr = np.zeros(num_portfolios)
-        sharpe_arr = np.zeros(num_portfolios)
-        
+        if method not in ('sample', 'exact'):
+            raise ValueError(f"Unknown frontier method '{method}'")
         assets = list(expected_returns.keys())
         num_assets = len(assets)
+        returns_array = np.array([expected_returns[asset] for asset in assets])
+        esg_array = np.array([esg_scores[asset] for asset in assets])
+        cov = covariance_matrix.values
         
-        for i in range(num_portfolios):
-            # Generate random weights
-            weights = np.random.random(num_assets)
-            weights = weights / np.sum(weights)
-            
-            # Calculate portfolio metrics
-            weight_array = weights
-            returns_array = np.array([expected_returns[asset] for asset in assets])
-            esg_array = np.array([esg_scores[asset] for asset in assets])
-            
-            port_return, port_vol, port_esg = self.calculate_portfolio_metrics(
-                weight_array, returns_array, esg_array, covariance_matrix.values
-            )
-            
-            # Store results
-            all_weights.append(weights)
-            ret_arr[i] = port_return
-            vol_arr[i] = port_vol
-            esg_arr[i] = port_esg
-            sharpe_arr[i] = (port_return - self.risk_free_rate) / port_vol if port_vol > 0 else 0
+        if method == 'exact':
+            all_weights = self._exact_frontier(returns_array, esg_array, cov, num_portfolios,
+                                               min_esg_score, max_weight)
+            ret_arr = all_weights @ returns_array
+            esg_arr = all_weights @ esg_array
+            vol_arr = np.sqrt(np.maximum(np.einsum('ij,ij->i', all_weights @ cov, all_weights), 0))
+        else:
+            ret_arr, vol_arr, esg_arr, all_weights = self._sample_frontier(
+                returns_array, esg_array, cov, num_portfolios, chunk_size, include_weights, random_state)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe_arr = np.where(vol_arr > 0, (ret_arr - self.risk_free_rate) / vol_arr, 0)
         
         # Create results DataFrame
         results = pd.DataFrame({
@@ -170,11 +328,117 @@ class GreenPortfolioOptimizer:
         })
         
         # Add individual asset weights
-        for idx, asset in enumerate(assets):
-            results[f'Weight_{asset}'] = [w[idx] for w in all_weights]
+        if include_weights:
+            weight_columns = pd.DataFrame(all_weights, columns=[f'Weight_{asset}' for asset in assets])
+            results = pd.concat([results, weight_columns], axis=1)
         
         return results
-
+    
+    def _sample_frontier(self, returns_array: np.ndarray, esg_array: np.ndarray, cov: np.ndarray,
+                         num_portfolios: int, chunk_size: int, include_weights: bool,
+                         random_state: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns, volatilities, ESG scores and (optionally) weights of random portfolios"""
+        num_assets = len(returns_array)
+        if chunk_size is None:
+            chunk_size = max(1, (1 << 22) // max(num_assets, 1))
+        rng = np.random.default_rng(random_state)
+        
+        # Create arrays for storing results
+        ret_arr = np.empty(num_portfolios)
+        vol_arr = np.empty(num_portfolios)
+        esg_arr = np.empty(num_portfolios)
+        all_weights = np.empty((num_portfolios, num_assets)) if include_weights else None
+        
+        # Sampling and the covariance product run in float32, which halves
+        # their cost; sums are taken in float64
+        returns32, esg32, cov32 = (a.astype(np.float32) for a in (returns_array, esg_array, cov))
+        for start in range(0, num_portfolios, chunk_size):
+            end = min(start + chunk_size, num_portfolios)
+            # Normalized exponentials are Dirichlet(1, ..., 1) samples; the
+            # metrics are computed on the raw draws and divided by their sums
+            draws = rng.standard_exponential((end - start, num_assets), dtype=np.float32)
+            totals = draws.sum(axis=1, dtype=np.float64)
+            
+            ret_arr[start:end] = (draws @ returns32) / totals
+            esg_arr[start:end] = (draws @ esg32) / totals
+            variances = np.einsum('ij,ij->i', draws @ cov32, draws, dtype=np.float64) / totals ** 2
+            # A covariance matrix that is not PSD can give negative variances;
+            # those portfolios get zero volatility rather than NaN
+            vol_arr[start:end] = np.sqrt(np.maximum(variances, 0))
+            if include_weights:
+                all_weights[start:end] = draws / totals[:, None]
+        return ret_arr, vol_arr, esg_arr, all_weights
+    
+    def _exact_frontier(self, returns_array: np.ndarray, esg_array: np.ndarray, cov: np.ndarray,
+                        num_points: int, min_esg_score: float = None,
+                        max_weight: float = 1.0) -> np.ndarray:
+        """
+        Weights of minimum-variance portfolios for evenly spaced target returns
+        
+        The highest attainable return comes from an LP, the lowest frontier
+        return from the minimum-variance QP. Each
+        target's QP first tries the previous point's active set; when the
+        active set changes, the active-set method starts from a feasible mix
+        of the previous point and the highest-return portfolio.
+        
+        Returns:
+            Array of weights, one row per frontier point. Points whose QP
+            hit the iteration limit are left out, and there are no rows if
+            the constraints cannot be met or the minimum-variance QP does
+            not converge.
+        """
+        num_assets = len(returns_array)
+        ones = np.ones((1, num_assets))
+        if min_esg_score is not None:
+            G, h = -esg_array[None, :], np.array([-min_esg_score])
+        else:
+            G, h = None, None
+        
+        highest = self.solver.solve(returns_array, A_eq=ones, b_eq=[1], A_ub=G, b_ub=h,
+                                    bounds=(0, max_weight), maximize=True)
+        if highest['x'] is None:
+            return np.zeros((0, num_assets))
+        top = highest['x']
+        top_return = returns_array @ top
+        
+        # Start the minimum-variance solve inside the feasible set, where few
+        # bounds are active: equal weights, mixed with the top portfolio as
+        # far as the ESG floor requires
+        equal = np.full(num_assets, 1 / num_assets)
+        share = 1.0
+        if min_esg_score is not None and esg_array @ equal < min_esg_score:
+            share = (esg_array @ top - min_esg_score) / (esg_array @ top - esg_array @ equal)
+        start = share * equal + (1 - share) * top
+        
+        zero = np.zeros(num_assets)
+        result = ActiveSetQP(cov, ones, G, 0, max_weight).solve(zero, [1], h, start=start)
+        if result['status'] != 'optimal':
+            # Without the minimum-variance return there is no lower end to the targets
+            print(f"Error computing the efficient frontier: minimum-variance QP stopped "
+                  f"after {result['iterations']} iterations")
+            return np.zeros((0, num_assets))
+        min_variance = result['x']
+        targets = np.linspace(returns_array @ min_variance, top_return, num_points)
+        
+        qp = ActiveSetQP(cov, np.vstack([ones, returns_array]), G, 0, max_weight)
+        frontier = []
+        weights, working = min_variance, None
+        for target in targets:
+            current = returns_array @ weights
+            # Feasible start on the target return: mix the previous point with the top one
+            share = (top_return - target) / (top_return - current) if top_return > current else 0.0
+            start = share * weights + (1 - share) * top
+            result = qp.solve(zero, [1, target], h, start=start, working=working)
+            if result['status'] != 'optimal':
+                # Not a frontier point; the next target starts again from the last one
+                print(f"Skipping frontier point at return {target:.6g}: QP stopped "
+                      f"after {result['iterations']} iterations")
+                working = None
+                continue
+            weights, working = result['x'], result['working']
+            frontier.append(weights)
+        return np.array(frontier).reshape(-1, num_assets)
+    
     def get_optimal_allocation(self, budget: float, risk_tolerance: float,
                              min_esg_score: float, assets: List[str]) -> Dict:
         """
@@ -0,0 +1,98 @@
+import random
+import threading
+
+import numpy as np
+
+from analysis.batch_sentiment import BatchSentimentAnalyzer
+from analysis.nltk_resources import get_batch_sentiment_analyzer, get_sentiment_analyzer
+
+# Words that exercise every VADER rule: boosters and dampeners, ALL CAPS,
+# negations, "never so", "least", "kind of" bigrams, "but", idioms and
+# tokens with punctuation attached
+WORDS = ['good', 'GOOD', 'bad', 'BAD', 'not', 'never', 'so', 'this', 'very', 'VERY',
+         'extremely', 'slightly', 'kind', 'Kind', 'of', 'sort', 'just', 'enough', 'kinda',
+         'but', 'BUT', 'least', 'at', 'the', 'project', 'great', 'failure', 'risk', "isn't",
+         'without', 'despite', 'nope', 'no', 'a', 'I', '!', '?', 'good.', '(bad)', ',great',
+         'happy!', 'sad?', 'good!!', '!?!bad', '--good', 'u.s.', '..', 'kiss', 'death', 'bomb',
+         'love', 'hate', 'progress', 'x']
+REPORT_SENTENCES = [
+    "The project achieved excellent results in renewable energy.",
+    "However, there were some challenges with community engagement.",
+    "Emissions did not improve, which is a serious concern.",
+    "The board is NOT happy about the delays, but the outlook is very good!",
+    "",
+    "Governance remains at least adequate despite the problems?",
+]
+
+
+def test_matches_vader_on_random_sentences():
+    print("Testing batch sentiment against VADER...")
+    print("=" * 50)
+
+    sia = get_sentiment_analyzer()
+    batch = get_batch_sentiment_analyzer()
+    rng = random.Random(7)
+    sentences = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 16)))
+                 for _ in range(5000)]
+    expected = [sia.polarity_scores(sentence) for sentence in sentences]
+    assert batch.polarity_scores(sentences) == expected
+    assert np.array_equal(batch.compound_scores(sentences),
+                          [scores['compound'] for scores in expected])
+    print(f"{len(sentences)} sentences agree, e.g. {sentences[0]!r}: {expected[0]}")
+
+
+def test_matches_vader_on_report_sentences():
+    sia = get_sentiment_analyzer()
+    batch = get_batch_sentiment_analyzer()
+    expected = [sia.polarity_scores(sentence) for sentence in REPORT_SENTENCES]
+    assert batch.polarity_scores(REPORT_SENTENCES) == expected
+    # Sentences scored alone give the same result as in a batch
+    assert [batch.polarity_scores([s])[0] for s in REPORT_SENTENCES] == expected
+
+
+def test_empty_batch():
+    batch = get_batch_sentiment_analyzer()
+    assert batch.polarity_scores([]) == []
+    assert len(batch.compound_scores([])) == 0
+
+
+def test_vocabulary_is_capped():
+    sia = get_sentiment_analyzer()
+    batch = BatchSentimentAnalyzer(sia, max_words=50)
+    rng = random.Random(11)
+    for _ in range(20):
+        sentences = [' '.join(rng.choice(WORDS) + str(rng.randint(0, 9)) for _ in range(8))
+                     for _ in range(5)] + REPORT_SENTENCES
+        assert batch.polarity_scores(sentences) == [sia.polarity_scores(s) for s in sentences]
+        # Cleared before a batch once over the cap, so at most one batch over
+        assert len(batch._words) <= 50 + 8 * 5 + 50
+
+
+def test_shared_between_threads():
+    sia = get_sentiment_analyzer()
+    batch = BatchSentimentAnalyzer(sia, max_words=100)
+    errors = []
+
+    def score(seed):
+        rng = random.Random(seed)
+        for _ in range(50):
+            sentences = [' '.join(rng.choice(WORDS) + rng.choice(['', 'x', 'y', 'z'])
+                                  for _ in range(rng.randint(0, 12)))
+                         for _ in range(20)]
+            if batch.polarity_scores(sentences) != [sia.polarity_scores(s) for s in sentences]:
+                errors.append(seed)
+
+    threads = [threading.Thread(target=score, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+if __name__ == "__main__":
+    test_matches_vader_on_random_sentences()
+    test_matches_vader_on_report_sentences()
+    test_empty_batch()
+    test_vocabulary_is_capped()
+    test_shared_between_threads()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Ridge
+from sklearn.preprocessing import StandardScaler
+
+from models.esg_scorer import ESGScorer
+
+
+def test_synthetic_data_leaves_global_state_alone():
+    scorer = ESGScorer()
+    np.random.seed(7)
+    expected = np.random.rand()
+
+    np.random.seed(7)
+    X_first, y_first = scorer.generate_synthetic_data(n_samples=100)
+    assert np.random.rand() == expected
+
+    X_again, y_again = scorer.generate_synthetic_data(n_samples=100)
+    assert X_first.equals(X_again) and np.array_equal(y_first, y_again)
+
+
+def test_synthetic_chunks_are_reproducible():
+    scorer = ESGScorer()
+    chunks = list(scorer.iter_synthetic_chunks(2500, chunk_size=1000))
+    assert [len(y) for _, y in chunks] == [1000, 1000, 500]
+    assert not np.array_equal(chunks[0][0][:500], chunks[2][0])
+
+    again = list(scorer.iter_synthetic_chunks(2500, chunk_size=1000))
+    assert all(np.array_equal(a[0], b[0]) for a, b in zip(chunks, again))
+
+
+def test_chunked_ridge_matches_full_fit():
+    print("Testing chunked ridge training against a full in-memory fit...")
+    print("=" * 50)
+
+    scorer = ESGScorer(backend='ridge')
+    chunks = list(scorer.iter_synthetic_chunks(5000, chunk_size=700))
+    X = np.vstack([X_chunk for X_chunk, _ in chunks])
+    y = np.concatenate([y_chunk for _, y_chunk in chunks])
+
+    stats = scorer.train_chunked(iter(chunks), validation_data=(X[:500], y[:500]))
+    print(f"Training stats: {stats}")
+    assert stats['rows'] == 5000 and stats['chunks'] == 8
+
+    full = Ridge(alpha=1.0).fit(StandardScaler().fit_transform(X), y)
+    assert np.allclose(scorer.backend.model.coef_, full.coef_)
+    assert np.allclose(scorer.backend.predict(X), full.predict(StandardScaler().fit(X).transform(X)))
+
+
+def test_chunked_forest_from_csv():
+    scorer = ESGScorer(backend='random_forest', backend_params={'trees_per_chunk': 3})
+    X, y = scorer.generate_synthetic_data(n_samples=1500)
+    frame = X.assign(esg_score=y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'esg_training.csv')
+        frame.to_csv(path, index=False)
+        stats = scorer.train_chunked(scorer.iter_csv_chunks(path, chunk_size=500))
+
+    assert stats['chunks'] == 3
+    assert len(scorer.backend.model.estimators_) == 9
+    result = scorer.score_project(X.iloc[0].to_dict())
+    assert abs(result['esg_score'] - y[0]) < 10
+
+
+def test_chunked_forest_is_capped():
+    scorer = ESGScorer(backend='random_forest',
+                       backend_params={'trees_per_chunk': 4, 'max_trees': 10})
+    chunks = list(scorer.iter_synthetic_chunks(3000, chunk_size=200))
+    backend = scorer.backend
+    for i, (X_chunk, y_chunk) in enumerate(chunks, 1):
+        backend.partial_fit(X_chunk, y_chunk)
+        assert len(backend.model.estimators_) == min(4 * i, 10)
+    assert backend._trees_fitted == 4 * len(chunks)
+
+    X, y = scorer.generate_synthetic_data(n_samples=200)
+    errors = backend.predict(np.asarray(X, dtype=float)) - y
+    assert np.abs(errors).mean() < 10
+    contributions, base_value = backend.explain(np.asarray(X[:5], dtype=float))
+    assert np.allclose(contributions.sum(axis=1) + base_value,
+                       backend.predict(np.asarray(X[:5], dtype=float)))
+
+
+if __name__ == "__main__":
+    test_synthetic_data_leaves_global_state_alone()
+    test_synthetic_chunks_are_reproducible()
+    test_chunked_ridge_matches_full_fit()
+    test_chunked_forest_from_csv()
+    test_chunked_forest_is_capped()
@@ -0,0 +1,110 @@
+from optimization.active_set_qp import ActiveSetQP
+from optimization.portfolio_optimizer import GreenPortfolioOptimizer
+import numpy as np
+from scipy.optimize import minimize
+
+from conftest import make_universe
+
+
+def reference_objective(expected_returns, esg_scores, covariance, min_esg, max_volatility, min_return):
+    """The same problem solved by SLSQP"""
+    returns = np.array(list(expected_returns.values()))
+    esg = np.array(list(esg_scores.values()))
+    cov = covariance.values
+    constraints = [{'type': 'eq', 'fun': lambda w: w.sum() - 1},
+                   {'type': 'ineq', 'fun': lambda w: esg @ w - min_esg},
+                   {'type': 'ineq', 'fun': lambda w: max_volatility ** 2 - w @ cov @ w}]
+    if min_return is not None:
+        constraints.append({'type': 'ineq', 'fun': lambda w: returns @ w - min_return})
+    result = minimize(lambda w: -(returns + esg) @ w, np.full(len(returns), 1 / len(returns)),
+                      bounds=[(0.05, 0.4)] * len(returns), constraints=constraints, method='SLSQP',
+                      options={'ftol': 1e-12, 'maxiter': 1000})
+    return -result.fun
+
+
+def test_volatility_limit_is_honored():
+    print("Testing the convex portfolio mode...")
+    print("=" * 50)
+
+    optimizer = GreenPortfolioOptimizer()
+    expected_returns, esg_scores, covariance = make_universe(10, seed=2)
+    unconstrained = optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1e6, 0.6)
+    assert unconstrained['optimization_status'] == 'Optimal'
+
+    for max_volatility in (0.065, 0.075, 0.09, 1.0):
+        for min_return in (None, 0.097):
+            result = optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1e6, 0.6,
+                                                  max_volatility=max_volatility, min_return=min_return)
+            assert result['optimization_status'] == 'Optimal'
+            assert result['volatility'] <= max_volatility * (1 + 1e-8)
+            assert min_return is None or result['expected_return'] >= min_return - 1e-9
+            weights = np.array(list(result['optimal_weights'].values()))
+            assert np.isclose(weights.sum(), 1) and weights.min() >= 0.05 - 1e-9 and weights.max() <= 0.4 + 1e-9
+            objective = result['expected_return'] + result['esg_score']
+            assert np.isclose(objective, reference_objective(expected_returns, esg_scores, covariance,
+                                                             0.6, max_volatility, min_return), atol=1e-7)
+            print(f"max vol {max_volatility:.3f}, min return {min_return}: "
+                  f"vol {result['volatility']:.4f}, return {result['expected_return']:.4f}")
+
+    # A loose limit leaves the LP optimum
+    loose = optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1e6, 0.6, max_volatility=1.0)
+    assert np.isclose(loose['volatility'], unconstrained['volatility'])
+
+
+def test_scenario_sweep_reuses_the_problem():
+    optimizer = GreenPortfolioOptimizer()
+    expected_returns, esg_scores, covariance = make_universe(10, seed=2)
+    limits = np.linspace(0.063, 0.095, 6)
+    first = [optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1e6, 0.6,
+                                          max_volatility=limit)['volatility'] for limit in limits]
+    assert len(optimizer._convex_problems) == 1
+    path = next(iter(optimizer._convex_problems.values()))['path']
+    solved = len(path)
+
+    # Limits already swept are answered from the cached path without new solves
+    again = [optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1e6, 0.6,
+                                          max_volatility=limit)['volatility'] for limit in limits]
+    assert len(path) == solved
+    assert np.allclose(first, again) and np.all(np.diff(first) > 0)
+
+
+def test_infeasible_limits():
+    optimizer = GreenPortfolioOptimizer()
+    expected_returns, esg_scores, covariance = make_universe(10, seed=2)
+    # Below the minimum-variance portfolio's volatility
+    result = optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1e6, 0.6,
+                                          max_volatility=0.05)
+    assert result['optimization_status'] == 'Infeasible'
+    assert all(weight == 0 for weight in result['optimal_weights'].values())
+    # Above the highest attainable return
+    result = optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1e6, 0.6,
+                                          min_return=0.5)
+    assert result['optimization_status'] == 'Infeasible'
+
+    try:
+        optimizer.optimize_portfolio(expected_returns, esg_scores, covariance, 1e6, 0.6,
+                                     max_volatility=0.1, method='lp')
+        assert False, "the LP cannot express a volatility limit"
+    except ValueError:
+        pass
+
+
+def test_active_set_qp_segment():
+    rng = np.random.default_rng(4)
+    n = 8
+    factors = rng.normal(size=(n, 2))
+    qp = ActiveSetQP(factors @ factors.T + np.eye(n), np.ones((1, n)), lower=0, upper=0.4)
+    c, dc = rng.normal(size=n), rng.normal(size=n) * 0.01
+    first = qp.solve(c, [1], start=np.full(n, 1 / n))
+    x0, dx = qp.segment(c, dc, [1], None, first['working'])
+    assert np.allclose(x0, first['x'])
+    # Along a short stretch of the path the working set holds
+    moved = qp.solve(c + 0.5 * dc, [1], start=np.full(n, 1 / n))
+    assert np.allclose(moved['x'], x0 + 0.5 * dx)
+
+
+if __name__ == "__main__":
+    test_volatility_limit_is_honored()
+    test_scenario_sweep_reuses_the_problem()
+    test_infeasible_limits()
+    test_active_set_qp_segment()
@@ -0,0 +1,50 @@
+from analysis import parsed_document
+from analysis.corpus import eea_report_texts, project_report_texts
+from analysis.esg_scorer import ESGScorer
+from analysis.nlp_analyzer import NLPAnalyzer
+
+REPORTS = [
+    "Wind turbines will supply 30 MW of renewable energy to the region.",
+    "The board approved a new ethics and compliance policy.",
+    "Community health clinics served 5,000 people last year.",
+    "Water conservation measures cut usage by 20%.",
+]
+
+
+def test_corpus_matches_single_documents():
+    print("Testing batched corpus analysis...")
+    print("=" * 50)
+
+    analyzer = NLPAnalyzer()
+    stats = {}
+    results = list(analyzer.analyze_corpus(iter(REPORTS * 5), batch_size=4, stats=stats))
+    print(f"Throughput: {stats}")
+    assert stats['documents'] == len(results) == 20
+
+    parsed_document.document_cache.clear()
+    expected = [analyzer.analyze(text) for text in REPORTS]
+    assert results[:4] == expected and results[4:8] == expected
+
+
+def test_score_projects_in_bulk():
+    scorer = ESGScorer()
+    projects = [{'description': text, 'reports': REPORTS[:2]} for text in REPORTS]
+    bulk = list(scorer.score_projects(projects, batch_size=2, n_process=2))
+
+    parsed_document.document_cache.clear()
+    assert bulk == [scorer.calculate_esg_scores(project) for project in projects]
+
+
+def test_text_sources():
+    eea = {'items': [{'title': 'Air quality', 'summary': 'Emissions fell.'}, 'Plain report', {}]}
+    assert list(eea_report_texts(eea)) == ['Air quality Emissions fell.', 'Plain report']
+    assert list(eea_report_texts(None)) == []
+
+    projects = [{'id': 1, 'reports': ['Audit done.'], 'updates': [{'text': 'Site ready.'}]}]
+    assert list(project_report_texts(projects)) == [(1, 'Audit done.'), (1, 'Site ready.')]
+
+
+if __name__ == "__main__":
+    test_corpus_matches_single_documents()
+    test_score_projects_in_bulk()
+    test_text_sources()
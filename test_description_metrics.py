@@ -0,0 +1,73 @@
+import random
+import re
+
+from models.esg_scorer import METRIC_KEYWORDS, ESGScorer, _job_numbers
+
+# The job pattern run forwards over the text, as the extractor used to
+REFERENCE_JOB_PATTERN = r'(\d+)\s*(?:permanent |temporary )?jobs?'
+PIECES = ['12', '7', '1,500', '٣', ' ', '  ', '\n', '\t', ' ', 'job', 'jobs', 'Jobs', 'JOB',
+          'jobjob', 'permanent ', 'Permanent ', 'temporary ', 'permanent', 'temporary  ',
+          'solar', 'Recycling', 'CLEAN ENERGY', 'social', 'Transparent', 'disclosure',
+          'standard', 'report', 'the', '.', 'x', 's']
+
+
+def reference_job_numbers(text):
+    return [int(num) for num in re.findall(REFERENCE_JOB_PATTERN, text)]
+
+
+def reference_hits(text):
+    return {group for group, keywords in METRIC_KEYWORDS.items()
+            if any(keyword in text for keyword in keywords)}
+
+
+def test_job_numbers_match_forward_regex():
+    print("Testing reversed job number pattern against the forward regex...")
+    print("=" * 50)
+
+    cases = [
+        "",
+        "job",
+        "50 jobs",
+        "It will create 120 permanent jobs and 40 temporary jobs.",
+        "120permanent jobs",
+        "120 permanent  jobs",
+        "1 permanent 2 jobs",
+        "5 jobs6 jobs7job",
+        "5 jobjob",
+        "jobs 5",
+        "1,500 jobs",
+        "2.5 jobs",
+        "12\n\n jobs",
+        "٣ jobs",
+        "50 blowjobs, 3 jobsite visits",
+    ]
+    rng = random.Random(3)
+    cases += [''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 20))).lower()
+              for _ in range(5000)]
+    for text in cases:
+        assert _job_numbers(text) == reference_job_numbers(text), text
+    print(f"{len(cases)} texts agree, e.g. {cases[3]!r}: {_job_numbers(cases[3])}")
+
+
+def test_extracted_metrics_ignore_case():
+    scorer = ESGScorer()
+    rng = random.Random(5)
+    for _ in range(1000):
+        description = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 20)))
+        metrics = scorer.extract_metrics_from_description(description)
+        text = description.lower()
+        job_mentions, job_numbers = text.count('job'), reference_job_numbers(text)
+        hits = reference_hits(text)
+
+        expected_jobs = sum(job_numbers) if job_numbers else 100 * job_mentions
+        assert metrics['job_creation'] == expected_jobs, description
+        assert (metrics['renewable_energy'] == 90) == ('renewable' in hits)
+        assert (metrics['waste_recycled'] == 80) == ('recycling' in hits)
+        assert (metrics['community_impact'] == 8) == ('community' in hits)
+        assert (metrics['transparency_score'] == 90) == ('transparency' in hits)
+        assert (metrics['compliance_score'] == 90) == ('compliance' in hits)
+
+
+if __name__ == "__main__":
+    test_job_numbers_match_forward_regex()
+    test_extracted_metrics_ignore_case()
@@ -0,0 +1,171 @@
+from optimization.active_set_qp import ActiveSetQP
+from optimization import portfolio_optimizer
+from optimization.portfolio_optimizer import GreenPortfolioOptimizer
+import numpy as np
+from scipy.optimize import minimize
+
+from conftest import make_universe
+
+
+def test_sampled_frontier_metrics():
+    print("Testing vectorized efficient frontier sampling...")
+    print("=" * 50)
+
+    optimizer = GreenPortfolioOptimizer(risk_free_rate=0.02)
+    expected_returns, esg_scores, covariance = make_universe(8)
+    # A small chunk size spreads the portfolios over several chunks
+    frontier = optimizer.generate_efficient_frontier(expected_returns, esg_scores, covariance,
+                                                     num_portfolios=1000, chunk_size=64, random_state=1)
+    assert len(frontier) == 1000
+    weight_columns = [f'Weight_{asset}' for asset in expected_returns]
+    weights = frontier[weight_columns].values
+    assert np.allclose(weights.sum(axis=1), 1) and (weights >= 0).all()
+
+    # Each row matches the per-portfolio metrics
+    returns = np.array(list(expected_returns.values()))
+    esg = np.array(list(esg_scores.values()))
+    for i in (0, 63, 64, 999):
+        port_return, port_vol, port_esg = optimizer.calculate_portfolio_metrics(
+            weights[i], returns, esg, covariance.values)
+        assert np.isclose(frontier['Return'][i], port_return)
+        assert np.isclose(frontier['Volatility'][i], port_vol)
+        assert np.isclose(frontier['ESG_Score'][i], port_esg)
+        assert np.isclose(frontier['Sharpe_Ratio'][i], (port_return - 0.02) / port_vol)
+    print(frontier[['Return', 'Volatility', 'ESG_Score', 'Sharpe_Ratio']].describe())
+
+
+def test_frontier_without_weights_is_reproducible():
+    optimizer = GreenPortfolioOptimizer()
+    expected_returns, esg_scores, covariance = make_universe(50)
+    first = optimizer.generate_efficient_frontier(expected_returns, esg_scores, covariance,
+                                                  num_portfolios=5000, include_weights=False, random_state=7)
+    second = optimizer.generate_efficient_frontier(expected_returns, esg_scores, covariance,
+                                                   num_portfolios=5000, chunk_size=999,
+                                                   include_weights=False, random_state=7)
+    assert list(first.columns) == ['Return', 'Volatility', 'ESG_Score', 'Sharpe_Ratio']
+    assert np.allclose(first.values, second.values)
+
+
+def reference_min_variance(covariance, returns, esg, target, min_esg, max_weight, start):
+    """The same QP solved by SLSQP"""
+    constraints = [{'type': 'eq', 'fun': lambda w: np.array([w.sum() - 1, returns @ w - target])},
+                   {'type': 'ineq', 'fun': lambda w: esg @ w - min_esg}]
+    result = minimize(lambda w: w @ covariance @ w, start, jac=lambda w: 2 * covariance @ w,
+                      bounds=[(0, max_weight)] * len(start), constraints=constraints, method='SLSQP',
+                      options={'ftol': 1e-15, 'maxiter': 1000})
+    return result.x
+
+
+def test_active_set_qp_warm_start():
+    rng = np.random.default_rng(3)
+    n = 12
+    factors = rng.normal(size=(n, 2))
+    Q = factors @ factors.T + np.eye(n)
+    qp = ActiveSetQP(Q, np.ones((1, n)), lower=0, upper=0.3)
+    c = rng.normal(size=n)
+    first = qp.solve(c, [1], start=np.full(n, 1 / n))
+    assert first['status'] == 'optimal' and first['iterations'] > 1
+    # A slightly different linear term keeps the active set: one KKT solve
+    c = c + rng.normal(size=n) * 1e-4
+    warm = qp.solve(c, [1], start=np.full(n, 1 / n), working=first['working'])
+    cold = qp.solve(c, [1], start=np.full(n, 1 / n))
+    assert warm['iterations'] == 1 and cold['iterations'] > 1
+    assert np.allclose(warm['x'], cold['x'])
+
+
+def test_exact_frontier():
+    optimizer = GreenPortfolioOptimizer(risk_free_rate=0.02)
+    expected_returns, esg_scores, covariance = make_universe(15, seed=4)
+    returns = np.array(list(expected_returns.values()))
+    esg = np.array(list(esg_scores.values()))
+    min_esg, max_weight = 0.75, 0.3
+
+    frontier = optimizer.generate_efficient_frontier(expected_returns, esg_scores, covariance,
+                                                     num_portfolios=25, method='exact',
+                                                     min_esg_score=min_esg, max_weight=max_weight)
+    assert len(frontier) == 25
+    assert np.all(np.diff(frontier['Return']) > 0) and np.all(np.diff(frontier['Volatility']) >= -1e-9)
+    weights = frontier[[f'Weight_{asset}' for asset in expected_returns]].values
+    assert np.allclose(weights.sum(axis=1), 1)
+    assert weights.min() >= -1e-9 and weights.max() <= max_weight + 1e-9
+    assert np.all(frontier['ESG_Score'] >= min_esg - 1e-9)
+
+    for i in (0, 7, 24):
+        reference = reference_min_variance(covariance.values, returns, esg, frontier['Return'][i],
+                                           min_esg, max_weight, weights[i])
+        reference_volatility = np.sqrt(reference @ covariance.values @ reference)
+        assert frontier['Volatility'][i] <= reference_volatility * (1 + 1e-7)
+        print(f"Return {frontier['Return'][i]:.4f}: volatility {frontier['Volatility'][i]:.6f} "
+              f"(SLSQP {reference_volatility:.6f})")
+
+    # No random portfolio lies below the unconstrained frontier
+    unconstrained = optimizer.generate_efficient_frontier(expected_returns, esg_scores, covariance,
+                                                          num_portfolios=200, method='exact')
+    cloud = optimizer.generate_efficient_frontier(expected_returns, esg_scores, covariance,
+                                                  num_portfolios=20000, include_weights=False,
+                                                  random_state=0)
+    above = cloud['Return'] >= unconstrained['Return'].iloc[0]
+    bound = np.interp(cloud['Return'][above], unconstrained['Return'], unconstrained['Volatility'])
+    assert np.all(cloud['Volatility'][above] >= bound - 1e-4)
+
+
+def test_exact_frontier_infeasible():
+    optimizer = GreenPortfolioOptimizer()
+    expected_returns, esg_scores, covariance = make_universe(5)
+    frontier = optimizer.generate_efficient_frontier(expected_returns, esg_scores, covariance,
+                                                     method='exact', min_esg_score=1.5)
+    assert len(frontier) == 0
+
+
+class StoppingQP(ActiveSetQP):
+    """Reports chosen solves as stopped at the iteration limit"""
+
+    def __init__(self, *args, stop=lambda qp, call: False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stop = stop
+        self.calls = 0
+
+    def solve(self, *args, **kwargs):
+        result = super().solve(*args, **kwargs)
+        self.calls += 1
+        if self.stop(self, self.calls):
+            result['status'] = 'max_iter'
+        return result
+
+
+def frontier_with(qp_class, expected_returns, esg_scores, covariance):
+    portfolio_optimizer.ActiveSetQP = qp_class
+    try:
+        return GreenPortfolioOptimizer().generate_efficient_frontier(
+            expected_returns, esg_scores, covariance, num_portfolios=20, method='exact', min_esg_score=0.7)
+    finally:
+        portfolio_optimizer.ActiveSetQP = ActiveSetQP
+
+
+def test_exact_frontier_drops_unconverged_points():
+    expected_returns, esg_scores, covariance = make_universe(8)
+    full = frontier_with(ActiveSetQP, expected_returns, esg_scores, covariance)
+    assert len(full) == 20
+
+    # Every second target QP (two equality rows) stops early: those points are left out
+    def every_second_target(qp, call):
+        return len(qp.A) == 2 and call % 2 == 0
+    partial = frontier_with(lambda *a, **k: StoppingQP(*a, stop=every_second_target, **k),
+                            expected_returns, esg_scores, covariance)
+    assert len(partial) == 10
+    assert np.allclose(partial.values, full.values[::2], atol=1e-8)
+
+    # Without a converged minimum-variance portfolio there is no frontier
+    def min_variance(qp, call):
+        return len(qp.A) == 1
+    assert len(frontier_with(lambda *a, **k: StoppingQP(*a, stop=min_variance, **k),
+                             expected_returns, esg_scores, covariance)) == 0
+
+
+if __name__ == "__main__":
+    test_sampled_frontier_metrics()
+    test_frontier_without_weights_is_reproducible()
+    test_active_set_qp_warm_start()
+    test_exact_frontier()
+    test_exact_frontier_infeasible()
+    test_exact_frontier_drops_unconverged_points()
@@ -0,0 +1,77 @@
+from itertools import combinations
+from math import factorial
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from models.esg_explainer import TreeEnsembleExplainer
+from models.esg_scorer import ESGScorer
+
+
+def conditional_expectation(tree, x, subset, node=0):
+    """Path-dependent E[f(x) | x_S] by walking the tree"""
+    left, right = tree.children_left[node], tree.children_right[node]
+    if left == -1:
+        return tree.value[node, 0, 0]
+    feature = tree.feature[node]
+    if feature in subset:
+        child = left if x[feature] <= tree.threshold[node] else right
+        return conditional_expectation(tree, x, subset, child)
+    cover = tree.weighted_n_node_samples
+    return (cover[left] * conditional_expectation(tree, x, subset, left) +
+            cover[right] * conditional_expectation(tree, x, subset, right)) / cover[node]
+
+
+def brute_force_shap(forest, x):
+    """Shapley values by enumerating every coalition of features"""
+    m = len(x)
+    phi = np.zeros(m)
+    for tree in (estimator.tree_ for estimator in forest.estimators_):
+        for i in range(m):
+            others = [j for j in range(m) if j != i]
+            for size in range(m):
+                weight = factorial(size) * factorial(m - size - 1) / factorial(m)
+                for subset in combinations(others, size):
+                    subset = set(subset)
+                    phi[i] += weight * (conditional_expectation(tree, x, subset | {i}) -
+                                        conditional_expectation(tree, x, subset))
+    return phi / len(forest.estimators_)
+
+
+def test_attribution_matches_shapley_definition():
+    print("Testing tree attribution against brute-force Shapley values...")
+    print("=" * 50)
+
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 7))
+    y = X[:, 0] * 3 + X[:, 1] * X[:, 2] + rng.normal(scale=0.1, size=300)
+    forest = RandomForestRegressor(n_estimators=3, max_depth=4, random_state=0).fit(X, y)
+    explainer = TreeEnsembleExplainer(forest.estimators_, 7)
+
+    phi = explainer.shap_values(X[:3])
+    for row, x in enumerate(X[:3]):
+        expected = brute_force_shap(forest, x)
+        print(f"Row {row}: max difference {np.abs(phi[row] - expected).max():.2e}")
+        assert np.allclose(phi[row], expected)
+
+
+def test_score_project_contributions():
+    scorer = ESGScorer()
+    scorer.train()
+    X, _ = scorer.generate_synthetic_data(n_samples=20)
+
+    result = scorer.score_project(X.iloc[0].to_dict(), explain=True)
+    print(f"Contributions: {result['feature_contributions']}")
+    assert set(result['feature_contributions']) == set(scorer.feature_names)
+    total = result['base_value'] + sum(result['feature_contributions'].values())
+    assert np.isclose(total, result['esg_score'])
+
+    # Batches must agree with the model's predictions row by row
+    contributions, base_value = scorer.explain_batch(X)
+    predictions = scorer.backend.predict(X.values)
+    assert np.allclose(contributions.sum(axis=1) + base_value, predictions)
+
+
+if __name__ == "__main__":
+    test_attribution_matches_shapley_definition()
+    test_score_project_contributions()
@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from models.esg_incremental import IncrementalESGAnalyzer
+from models.fund_seeker import FundSeekerManager
+
+PROJECT = {
+    'id': '7',
+    'description': 'Solar farm with renewable energy storage and community health programs.',
+    'sustainability_impact': 'Cuts emissions by 1,200 tons a year with transparent disclosure.',
+    'reports': ['The board reviewed compliance and climate risk. Results were excellent.'],
+    'updates': []
+}
+UPDATES = [
+    'Construction is on schedule. Water conservation targets were met.',
+    'A safety incident caused serious concern, but the $2.5 million expansion is funded.',
+]
+
+
+def test_incremental_matches_full_rebuild():
+    print("Testing incremental ESG text analysis...")
+    print("=" * 50)
+
+    analyzer = IncrementalESGAnalyzer()
+    project = json.loads(json.dumps(PROJECT))
+    analyzer.initialize(project)
+    for text in UPDATES:
+        project['updates'].append({'text': text})
+        point = analyzer.add_text(project, text)
+        print(f"After update: {point}")
+
+    rebuilt = json.loads(json.dumps(project))
+    analyzer.initialize(rebuilt)
+    incremental, full = project['text_analysis'], rebuilt['text_analysis']
+
+    assert incremental['keyword_counts'] == full['keyword_counts']
+    assert incremental['sentiment_count'] == full['sentiment_count']
+    assert np.isclose(incremental['sentiment_sum'], full['sentiment_sum'])
+    assert incremental['metric_totals'] == full['metric_totals'] == {
+        'QUANTITY:tons': {'count': 1, 'total': 1200.0, 'min': 1200.0, 'max': 1200.0},
+        'MONEY:USD': {'count': 1, 'total': 2500000.0, 'min': 2500000.0, 'max': 2500000.0}
+    }
+
+    history = incremental['history']
+    assert len(history) == 3 and [p['texts'] for p in history] == [3, 4, 5]
+    assert np.isclose(history[-1]['overall_score'], full['history'][-1]['overall_score'])
+
+
+def test_aggregates_stay_bounded():
+    analyzer = IncrementalESGAnalyzer(max_history=3)
+    project = json.loads(json.dumps(PROJECT))
+    analyzer.initialize(project)
+    for i in range(10):
+        analyzer.add_text(project, f'The plant avoided {i + 1} tons of emissions.')
+
+    aggregate = project['text_analysis']
+    assert [point['texts'] for point in aggregate['history']] == [11, 12, 13]
+    assert aggregate['metric_totals']['QUANTITY:tons'] == {
+        'count': 11, 'total': 1255.0, 'min': 1.0, 'max': 1200.0
+    }
+
+
+def test_legacy_metric_lists_are_folded_in():
+    analyzer = IncrementalESGAnalyzer()
+    aggregate = analyzer.new_aggregate()
+    del aggregate['metric_totals']
+    aggregate['metrics'] = [{'value': '5 MW', 'type': 'QUANTITY', 'number': 5.0, 'unit': 'MW'}]
+    analyzer.merge(aggregate, analyzer.analyze_text('A 7 MW array was added.'))
+    assert 'metrics' not in aggregate
+    assert aggregate['metric_totals'] == {
+        'QUANTITY:MW': {'count': 2, 'total': 12.0, 'min': 5.0, 'max': 7.0}
+    }
+
+
+def test_manager_updates_aggregates_and_persists():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            manager = FundSeekerManager(text_analyzer=IncrementalESGAnalyzer())
+            project = manager.create_project('Wind', 'Offshore wind farm for renewable energy.',
+                                             1000000, 12, 'Community education.', '3')
+            assert manager.add_project_update(project['id'], UPDATES[0])
+            assert manager.add_project_update(project['id'], UPDATES[1])
+
+            history = manager.get_score_history(project['id'])
+            assert [point['texts'] for point in history] == [3, 4]
+            assert history[-1]['date'] == project['updates'][-1]['date']
+
+            # The aggregates are saved with the project
+            reloaded = FundSeekerManager()
+            assert reloaded.get_score_history(project['id']) == history
+            assert manager.get_score_history('missing') is None
+
+            # Only the history endpoint returns the aggregates
+            assert 'text_analysis' in manager.get_project_by_id(project['id'])
+            payloads = (manager.get_all_projects() + manager.get_approved_projects()
+                        + manager.get_user_projects('3')
+                        + [r['project'] for r in manager.search_projects('wind')['results']])
+            assert payloads and all('text_analysis' not in payload for payload in payloads)
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_rebuild()
+    test_aggregates_stay_bounded()
+    test_legacy_metric_lists_are_folded_in()
+    test_manager_updates_aggregates_and_persists()
@@ -0,0 +1,123 @@
+import json
+import os
+import tempfile
+
+from models.esg_pipeline import ESGScoringPipeline
+from models.esg_scorer import ESGScorer
+from models.esg_table import ESGScoreTable, COMPONENT_COLUMNS
+from models.fund_seeker import FundSeekerManager
+
+WEIGHTS = {'env_weight': 0.5, 'social_weight': 0.25, 'gov_weight': 0.25}
+
+
+class ManualRunner:
+    """Task runner that only records started tasks; the test runs them by hand"""
+
+    def __init__(self):
+        self.tasks = []
+
+    def start_background_task(self, target):
+        self.tasks.append(target)
+
+    def sleep(self, seconds):
+        pass
+
+
+def create_projects(manager, count):
+    return [
+        manager.create_project(
+            f"Solar Farm {i}",
+            f"Solar farm {i} with organic waste recycling and community education programs.",
+            1000000 + i, 24,
+            "Creates 120 permanent jobs and publishes transparent quarterly reports.",
+            '7'
+        )
+        for i in range(count)
+    ]
+
+
+def check_scores(manager, table, projects):
+    """Scores are on the projects, in projects.json and in the table"""
+    with open(os.path.join('data', 'projects.json')) as f:
+        saved = json.load(f)
+    for project in projects:
+        stored = manager.get_project_by_id(project['id'])
+        row = table.get_row(project['id'])
+        assert row is not None
+        components = [row['components'][name] for name in COMPONENT_COLUMNS]
+        assert [stored[name] for name in COMPONENT_COLUMNS] == [round(c, 2) for c in components]
+        expected = sum(c * w for c, w in zip(components, WEIGHTS.values()))
+        assert stored['esg_score'] == round(expected, 2)
+        assert saved[project['id']]['esg_score'] == stored['esg_score']
+    reloaded = ESGScoreTable(table.feature_names, table_file=table.table_file)
+    assert all(project['id'] in reloaded for project in projects)
+
+
+def test_pipeline_writes_scores():
+    print("Testing the ESG scoring pipeline...")
+    print("=" * 50)
+
+    scorer = ESGScorer()
+    scorer.train()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            manager = FundSeekerManager()
+            table = ESGScoreTable(scorer.feature_names, table_file=os.path.join('data', 'esg_table.json'))
+            pipeline = ESGScoringPipeline(scorer, fund_seeker_manager=manager, esg_table=table,
+                                          get_weights=lambda: WEIGHTS, max_workers=3,
+                                          lock=manager.lock)
+            projects = create_projects(manager, 6)
+            for project in projects:
+                pipeline.submit(project)
+            pipeline.shutdown()
+
+            assert all(pipeline.get_status(project['id']) == 'done' for project in projects)
+            check_scores(manager, table, projects)
+            print(f"Scored {len(projects)} projects: "
+                  f"{[manager.get_project_by_id(p['id'])['esg_score'] for p in projects]}")
+        finally:
+            os.chdir(cwd)
+
+
+def test_results_are_applied_by_the_delivery_task():
+    scorer = ESGScorer()
+    scorer.train()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            manager = FundSeekerManager()
+            table = ESGScoreTable(scorer.feature_names, table_file=os.path.join('data', 'esg_table.json'))
+            runner = ManualRunner()
+            pipeline = ESGScoringPipeline(scorer, fund_seeker_manager=manager, esg_table=table,
+                                          get_weights=lambda: WEIGHTS, lock=manager.lock,
+                                          task_runner=runner)
+            # Neither the pool nor the delivery task exist before the first job
+            assert pipeline._executor is None and runner.tasks == []
+
+            projects = create_projects(manager, 3)
+            futures = [pipeline.submit(project) for project in projects]
+            assert len(runner.tasks) == 1
+            for future in futures:
+                future.result()
+            pipeline.executor.shutdown(wait=True)
+
+            # Pool threads only queued the results; nothing is written yet
+            assert all(pipeline.get_status(project['id']) == 'queued' for project in projects)
+            assert len(table) == 0
+            # The task applies them and returns once nothing is outstanding
+            runner.tasks[0]()
+            assert all(pipeline.get_status(project['id']) == 'done' for project in projects)
+            check_scores(manager, table, projects)
+            assert pipeline.drain() == 0
+            # A later job would start a new task
+            assert not pipeline._delivering
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_pipeline_writes_scores()
+    test_results_are_applied_by_the_delivery_task()
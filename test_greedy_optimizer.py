@@ -0,0 +1,78 @@
+import numpy as np
+
+from models.optimizer import InvestmentOptimizer, greedy_fill
+
+
+def make_projects(n, seed):
+    rng = np.random.default_rng(seed)
+    return [
+        {'name': f'Project {i}', 'cost': rng.uniform(1e6, 5e6), 'esg_score': rng.uniform(60, 95),
+         'expected_return': rng.uniform(5, 15), 'risk_score': rng.uniform(0.1, 0.5)}
+        for i in range(n)
+    ]
+
+
+def objective(projects, result):
+    by_name = {p['name']: p for p in projects}
+    return sum((0.7 * by_name[r['project_name']]['esg_score'] / 100 +
+                0.3 * by_name[r['project_name']]['expected_return'] / 100) * r['investment_amount']
+               for r in result['project_allocations'])
+
+
+def test_greedy_fill():
+    allocation = greedy_fill(np.array([0.5, 0.9, -1.0, 0.7]), np.array([4.0, 3.0, 10.0, 2.0]), 6.0)
+    assert allocation.tolist() == [1.0, 3.0, 0.0, 2.0]
+    assert greedy_fill(np.array([0.2, 0.1]), np.array([1.0, 1.0]), 5.0).tolist() == [1.0, 1.0]
+
+
+def test_greedy_matches_lp():
+    print("Testing greedy portfolio solver against CBC...")
+    print("=" * 50)
+
+    optimizer = InvestmentOptimizer()
+    for n, budget, min_esg in [(10, 10e6, 50), (10, 10e6, 85), (60, 30e6, 88), (200, 50e6, 90)]:
+        projects = make_projects(n, seed=n)
+        greedy = optimizer.optimize_portfolio(projects, budget, min_esg)
+        lp = optimizer.optimize_portfolio(projects, budget, min_esg, method='lp')
+        assert greedy['optimization_status'] == lp['optimization_status'] == 'Optimal'
+        assert abs(objective(projects, greedy) - objective(projects, lp)) <= 1e-7 * objective(projects, lp)
+        # Every constraint holds
+        amounts = {r['project_name']: r['investment_amount'] for r in greedy['project_allocations']}
+        assert greedy['allocated_budget'] <= budget * (1 + 1e-9)
+        assert greedy['total_esg_impact'] >= min_esg * (1 - 1e-9)
+        for project in projects:
+            assert amounts.get(project['name'], 0) <= min(project['cost'], 0.4 * budget) * (1 + 1e-9)
+        print(f"n={n}, floor={min_esg}: objective {objective(projects, greedy):.2f}")
+
+
+def test_infeasible_floor():
+    optimizer = InvestmentOptimizer()
+    result = optimizer.optimize_portfolio(make_projects(10, seed=1), 10e6, 99)
+    assert result['optimization_status'] == 'Infeasible'
+    assert result['project_allocations'] == []
+
+
+def test_general_constraints_use_lp():
+    optimizer = InvestmentOptimizer()
+    projects = make_projects(10, seed=2)
+    unconstrained = optimizer.optimize_portfolio(projects, 10e6, 60)
+    # At most 1M in the first three projects together
+    limit = {'coefficients': [1, 1, 1] + [0] * 7, 'sense': '<=', 'rhs': 1e6}
+    constrained = optimizer.optimize_portfolio(projects, 10e6, 60, extra_constraints=[limit])
+    assert constrained['optimization_status'] == 'Optimal'
+    amounts = {r['project_name']: r['investment_amount'] for r in constrained['project_allocations']}
+    assert sum(amounts.get(f'Project {i}', 0) for i in range(3)) <= 1e6 * (1 + 1e-6)
+    assert objective(projects, constrained) <= objective(projects, unconstrained) * (1 + 1e-9)
+
+    try:
+        optimizer.optimize_portfolio(projects, 10e6, 60, extra_constraints=[limit], method='greedy')
+        assert False, "greedy solver accepted a general constraint"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_greedy_fill()
+    test_greedy_matches_lp()
+    test_infeasible_floor()
+    test_general_constraints_use_lp()
@@ -0,0 +1,74 @@
+import random
+
+from analysis.keyword_matcher import KeywordMatcher
+
+KEYWORDS = ['emission', 'emissions', 'risk', 'risk management', 'human rights',
+            'board', 'energy', 'renewable', 'aa', 'water']
+FILLER = ['the', 'superhuman', 'asterisk', 'wastewater', 'aaa', 'plan', 'renewables',
+          'emissionsemission', 'management', 'rights', 'human', 'Risk', 'boards']
+
+
+def random_text(rng, n_words):
+    words = [rng.choice(KEYWORDS + FILLER) for _ in range(n_words)]
+    return ' '.join(words).lower()
+
+
+def test_counts_match_str_count():
+    print("Testing keyword matcher against str.count...")
+    print("=" * 50)
+
+    matcher = KeywordMatcher(KEYWORDS)
+    rng = random.Random(0)
+    for _ in range(300):
+        text = random_text(rng, rng.randint(0, 60))
+        counts = matcher.count(text)
+        for keyword in KEYWORDS:
+            assert counts[keyword] == text.count(keyword), (keyword, text)
+    print(f"Example counts: {dict(matcher.count(text))}")
+
+
+def test_multi_word_terms_span_whitespace():
+    matcher = KeywordMatcher(['human rights', 'risk management'])
+    counts = matcher.count("human\n  rights and risk\tmanagement, human rights")
+    assert counts['human rights'] == 2 and counts['risk management'] == 1
+
+
+def test_word_counts_per_category():
+    categories = {'governance': ['risk management', 'board'], 'environmental': ['emission', 'water']}
+    matcher = KeywordMatcher(k for keywords in categories.values() for k in keywords)
+    words = ['risk', 'management', 'boards', 'emissions', 'wastewater', 'water', 'plan']
+    expected_single = {
+        category: sum(1 for word in words if any(k in word for k in keywords))
+        for category, keywords in categories.items()
+    }
+    totals = matcher.count_words(words, categories)
+    assert totals['environmental'] == expected_single['environmental'] == 3
+    # The phrase counts on top of the single-word matches
+    assert totals['governance'] == expected_single['governance'] + 1 == 2
+
+
+def test_scorer_scans_each_text_once():
+    from analysis.esg_scorer import ESGScorer
+
+    scorer = ESGScorer()
+    scans = []
+    count = scorer.keyword_matcher.count
+    scorer.keyword_matcher.count = lambda text: scans.append(text) or count(text)
+
+    project = {'description': 'Solar energy with low emissions, overseen by an independent board.'}
+    result = scorer.calculate_esg_scores(project)
+    # One scan serves all three categories, and nothing is kept between texts
+    assert len(scans) == 1
+    counts = count(scans[0])
+    for category in ('environmental', 'social', 'governance'):
+        assert result['detailed_scores'][category]['keyword_score'] == \
+            scorer.calculate_keyword_score(scans[0], category, counts)
+    assert scorer.calculate_keyword_score('board', 'governance') > 0
+    assert scorer.calculate_keyword_score('', 'governance') == 0
+
+
+if __name__ == "__main__":
+    test_counts_match_str_count()
+    test_multi_word_terms_span_whitespace()
+    test_word_counts_per_category()
+    test_scorer_scans_each_text_once()
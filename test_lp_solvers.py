@@ -0,0 +1,67 @@
+import numpy as np
+
+from models.lp_solvers import LPSolver
+from models.optimizer import InvestmentOptimizer
+
+
+def random_lp(seed, n=30, m=10):
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(0, 1, (m, n))
+    b = A.sum(axis=1) * rng.uniform(0.2, 0.6, m)
+    return rng.uniform(-1, 1, n), A, b
+
+
+def test_backends_agree():
+    print("Testing LP solver backends...")
+    print("=" * 50)
+
+    highs, cbc = LPSolver('highs'), LPSolver('cbc')
+    for seed in range(5):
+        c, A, b = random_lp(seed)
+        first = highs.solve(c, A_ub=A, b_ub=b, A_eq=np.ones((1, len(c))), b_eq=[3], bounds=(0, 1),
+                            maximize=True)
+        second = cbc.solve(c, A_ub=A, b_ub=b, A_eq=np.ones((1, len(c))), b_eq=[3], bounds=(0, 1),
+                           maximize=True)
+        assert first['status'] == second['status'] == 'Optimal'
+        assert abs(first['objective'] - second['objective']) < 1e-6
+        assert np.all(A @ first['x'] <= b + 1e-9) and abs(first['x'].sum() - 3) < 1e-9
+        print(f"seed {seed}: objective {first['objective']:.6f}, "
+              f"HiGHS {first['solve_time'] * 1000:.2f} ms, CBC {second['solve_time'] * 1000:.2f} ms")
+
+    stats = highs.stats()
+    assert stats['backend'] == 'highs' and stats['solves'] == 5
+    assert stats['total_solve_time'] > 0 and stats['last_solve_time'] is not None
+
+
+def test_statuses():
+    for backend in ('highs', 'cbc'):
+        solver = LPSolver(backend)
+        infeasible = solver.solve([1, 1], A_ub=[[1, 1]], b_ub=[-1], bounds=(0, None))
+        assert infeasible['status'] == 'Infeasible' and infeasible['x'] is None
+        unbounded = solver.solve([1, 1], bounds=(0, None), maximize=True)
+        assert unbounded['status'] in ('Unbounded', 'Not Solved') and unbounded['x'] is None
+    try:
+        LPSolver('glpk')
+        assert False, "unknown backend accepted"
+    except ValueError:
+        pass
+
+
+def test_optimizer_backends():
+    optimizer = InvestmentOptimizer()
+    projects = optimizer.generate_synthetic_projects(40)
+    results = [
+        InvestmentOptimizer(solver=LPSolver(backend)).optimize_portfolio(projects, 30e6, 85, method='lp')
+        for backend in ('highs', 'cbc')
+    ]
+    greedy = optimizer.optimize_portfolio(projects, 30e6, 85)
+    for result in results:
+        assert result['optimization_status'] == 'Optimal'
+        assert abs(result['total_esg_impact'] - greedy['total_esg_impact']) < 1e-6
+        assert abs(result['total_expected_return'] - greedy['total_expected_return']) < 1e-6
+
+
+if __name__ == "__main__":
+    test_backends_agree()
+    test_statuses()
+    test_optimizer_backends()
@@ -0,0 +1,83 @@
+import random
+import re
+
+from analysis.metric_extractor import METRIC_PATTERNS, MetricExtractor
+from analysis.nlp_analyzer import NLPAnalyzer
+
+# The previous per-sentence patterns, without the named groups
+REFERENCE_PATTERNS = {
+    'QUANTITY': r'\d+(?:,\d{3})*(?:\.\d+)?\s*(?:MW|GW|kW|tons?|acres?|jobs?|people|employees)',
+    'PERCENT': r'\d+(?:\.\d+)?%',
+    'MONEY': r'\$\s*\d+(?:,\d{3})*(?:\.\d+)?(?:\s*(?:million|billion|trillion))?'
+}
+PIECES = ['12', '1,500', '2.5', ' ', '  ', '\n', '%', '$', 'MW', 'tons', 'ton', 'jobs',
+          'people', 'million', 'billion', 'the', '.', 'acres', 'x']
+
+
+def reference_extract(text, sentence_spans):
+    metrics = []
+    for start, end in sentence_spans:
+        sentence = text[start:end]
+        for metric_type, pattern in REFERENCE_PATTERNS.items():
+            for match in re.finditer(pattern, sentence):
+                metrics.append((match.group(), metric_type, sentence.strip()))
+    return metrics
+
+
+def random_spans(rng, length):
+    cuts = sorted(rng.sample(range(length + 1), min(length + 1, rng.randint(0, 6))))
+    spans = []
+    for start, end in zip(cuts, cuts[1:]):
+        # Leave an occasional gap between sentences
+        spans.append((start + (rng.random() < 0.2 and start < end), end))
+    return spans
+
+
+def test_matches_per_sentence_scan():
+    print("Testing whole-text metric extraction against per-sentence scans...")
+    print("=" * 50)
+
+    extractor = MetricExtractor()
+    rng = random.Random(0)
+    for _ in range(500):
+        text = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 40)))
+        spans = random_spans(rng, len(text))
+        metrics = extractor.extract(text, spans)
+        found = [(m['value'], m['type'], m['context']) for m in metrics]
+        assert found == reference_extract(text, spans), (text, spans)
+    print(f"Example: {metrics[:2]}")
+
+
+def test_values_are_normalized():
+    extractor = MetricExtractor()
+    text = "We raised $2.5 million and $ 1,200. Output is 50 MW, 40% and 1 ton of 3 jobs."
+    spans = [(0, 35), (36, len(text))]
+    normalized = [(m['value'], m['number'], m['unit']) for m in extractor.extract(text, spans)]
+    assert normalized == [
+        ('$2.5 million', 2500000.0, 'USD'),
+        ('$ 1,200', 1200.0, 'USD'),
+        ('50 MW', 50.0, 'MW'),
+        ('1 ton', 1.0, 'tons'),
+        ('3 jobs', 3.0, 'jobs'),
+        ('40%', 40.0, '%'),
+    ]
+
+
+def test_pattern_order_is_kept():
+    assert list(METRIC_PATTERNS) == list(REFERENCE_PATTERNS)
+
+
+def test_analyzer_corpus_matches_single_documents():
+    analyzer = NLPAnalyzer(rule_based_sentences=True)
+    texts = ["Capacity reached 120 MW. Costs were $3 billion.",
+             "Emissions fell 12% as 300 people joined.", ""]
+    batched = list(analyzer.extract_metrics_corpus(texts, batch_size=2))
+    assert batched == [analyzer.extract_metrics(text) for text in texts]
+    assert batched[0][1]['number'] == 3e9 and batched[2] == []
+
+
+if __name__ == "__main__":
+    test_matches_per_sentence_scan()
+    test_values_are_normalized()
+    test_pattern_order_is_kept()
+    test_analyzer_corpus_matches_single_documents()
@@ -0,0 +1,117 @@
+import os
+import tempfile
+
+from models.fund_seeker import FundSeekerManager
+from models.near_duplicates import NearDuplicateIndex, normalize_text
+
+BASE = {
+    'id': '1', 'name': 'Mumbai Vertical Farms Initiative',
+    'description': 'Innovative vertical farming project in Mumbai converting unused urban spaces '
+                   'into hydroponic farms that supply fresh produce to local markets.',
+    'sustainability_impact': 'Reduces food miles and water use by 90%.'
+}
+VARIANT = dict(BASE, id='2', name='  Mumbai Vertical  Farms Initiative',
+               description=BASE['description'] + ' Phase two.')
+UNRELATED = {'id': '3', 'name': 'Offshore Wind Park', 'description': 'Wind turbines off the coast of Gujarat.',
+             'sustainability_impact': 'Clean energy for 40,000 homes.'}
+
+
+def exact_jaccard(index, first, second):
+    a = set(index._shingles(first).tolist())
+    b = set(index._shingles(second).tolist())
+    return len(a & b) / len(a | b)
+
+
+def test_signature_estimates_jaccard():
+    print("Testing MinHash near-duplicate detection...")
+    print("=" * 50)
+
+    assert normalize_text('  Mumbai Vertical\tFarms ') == 'mumbai vertical farms'
+    index = NearDuplicateIndex(num_perm=256, bands=64)
+    texts = [BASE['description'], VARIANT['description'], UNRELATED['description']]
+    for first in texts:
+        for second in texts:
+            estimate = index.similarity(index.signature(first), index.signature(second))
+            exact = exact_jaccard(index, first, second)
+            assert abs(estimate - exact) < 0.12, (estimate, exact)
+    # Whitespace and case do not change the signature
+    assert (index.signature(' Mumbai  FARMS') == index.signature('mumbai farms')).all()
+
+
+def test_flags_near_duplicates():
+    index = NearDuplicateIndex()
+    assert index.add_project(dict(BASE)) == []
+    assert index.add_project(dict(UNRELATED)) == []
+    duplicates = index.add_project(dict(VARIANT))
+    assert [d['id'] for d in duplicates] == ['1']
+    assert duplicates[0]['similarity'] >= index.threshold
+    print(f"Duplicates of the variant: {duplicates}")
+
+    # Signatures are kept in the index, not on the project
+    project = dict(BASE, id='4')
+    index.add_project(project)
+    assert 'minhash' not in project
+    assert len(index.get_signature('4')) == index.num_perm
+    # An indexed project's signature is looked up by id, not recomputed
+    assert (index.project_signature(dict(project, description='')) == index.get_signature('4')).all()
+
+    report = index.report()
+    assert len(report) == 1
+    assert report[0]['projects'] == ['1', '2', '4']
+    assert all(pair['similarity'] >= index.threshold for pair in report[0]['pairs'])
+
+
+def test_empty_projects_are_not_duplicates():
+    index = NearDuplicateIndex()
+    index.add_project({'id': '1', 'name': ''})
+    assert index.add_project({'id': '2', 'name': ''}) == []
+    assert index.report() == []
+
+
+def test_manager_flags_resubmissions():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            manager = FundSeekerManager()
+            first = manager.create_project(BASE['name'], BASE['description'], 100000, 12,
+                                           BASE['sustainability_impact'], '5')
+            assert manager.get_possible_duplicates(first['id']) == []
+            second = manager.create_project(VARIANT['name'], VARIANT['description'], 120000, 12,
+                                            VARIANT['sustainability_impact'], '5')
+            assert [d['id'] for d in manager.get_possible_duplicates(second['id'])] == [first['id']]
+
+            # Duplicates are found when a payload is built, for both projects,
+            # and are not stored on the projects or saved
+            assert 'possible_duplicates' not in second
+            payloads = {p['id']: p for p in manager.get_all_projects()}
+            assert [d['id'] for d in payloads[first['id']]['possible_duplicates']] == [second['id']]
+            assert [d['id'] for d in payloads[second['id']]['possible_duplicates']] == [first['id']]
+            with open(os.path.join('data', 'projects.json')) as f:
+                assert 'possible_duplicates' not in f.read()
+
+            report = manager.get_duplicate_report()
+            assert [p['id'] for p in report[0]['projects']] == sorted([first['id'], second['id']])
+            assert report[0]['projects'][0]['name']
+
+            # Signatures stay out of the projects, the saved file and search results
+            assert all('minhash' not in project for project in manager.projects)
+            with open(os.path.join('data', 'projects.json')) as f:
+                assert 'minhash' not in f.read()
+            found = manager.search_projects('vertical farms')
+            assert found['results'] and all('minhash' not in r['project'] for r in found['results'])
+
+            # A reload recomputes them in the index
+            reloaded = FundSeekerManager()
+            assert (reloaded.duplicate_index.get_signature(second['id']) ==
+                    manager.duplicate_index.get_signature(second['id'])).all()
+            assert len(reloaded.get_duplicate_report()) == 1
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_signature_estimates_jaccard()
+    test_flags_near_duplicates()
+    test_empty_projects_are_not_duplicates()
+    test_manager_flags_resubmissions()
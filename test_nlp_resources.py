@@ -0,0 +1,57 @@
+from analysis import nlp_resources
+from analysis.esg_scorer import ESGScorer
+from analysis.nlp_analyzer import NLPAnalyzer
+from models.esg_incremental import IncrementalESGAnalyzer
+
+TEXT = ("The project installs solar panels on municipal buildings. "
+        "Local communities receive new jobs and training programs. "
+        "Quarterly reports keep stakeholders informed.")
+
+
+def test_pipeline_loaded_once():
+    print("Testing shared spaCy pipeline...")
+    print("=" * 50)
+
+    assert nlp_resources.get_nlp() is nlp_resources.get_nlp()
+    assert ESGScorer().nlp is NLPAnalyzer().nlp
+    print(f"Load times: {nlp_resources.load_times}")
+
+
+def test_trimmed_parses_match_full_pipeline():
+    full = nlp_resources.get_nlp()(TEXT)
+
+    sentences = nlp_resources.parse(TEXT, 'sentences')
+    assert [s.text for s in sentences.sents] == [s.text for s in full.sents]
+
+    chunks = nlp_resources.parse(TEXT, 'noun_chunks')
+    assert [c.text for c in chunks.noun_chunks] == [c.text for c in full.noun_chunks]
+
+    tokens = nlp_resources.parse(TEXT, 'tokens')
+    assert [t.text for t in tokens] == [t.text for t in full]
+
+    rule_based = nlp_resources.parse(TEXT, 'sentences', rule_based=True)
+    print(f"Rule-based sentences: {[s.text for s in rule_based.sents]}")
+    assert len(list(rule_based.sents)) == 3
+
+
+def test_rule_based_paths_need_no_model():
+    # Any load of the trained pipeline would fail with OSError
+    model = nlp_resources.SPACY_MODEL
+    nlp_resources.SPACY_MODEL = 'missing_model_for_test'
+    try:
+        analyzer = NLPAnalyzer(rule_based_sentences=True)
+        assert 'governance' in analyzer.extract_esg_insights(TEXT)
+        assert analyzer.analyze_sentiment_by_aspect(TEXT)
+        scores = ESGScorer(rule_based_sentences=True).calculate_esg_scores({'description': TEXT})
+        assert scores is not None
+        aggregate = IncrementalESGAnalyzer().analyze_text(TEXT)
+        assert aggregate['sentiment_count'] == 3
+        assert 'missing_model_for_test' not in nlp_resources.load_times
+    finally:
+        nlp_resources.SPACY_MODEL = model
+
+
+if __name__ == "__main__":
+    test_pipeline_loaded_once()
+    test_trimmed_parses_match_full_pipeline()
+    test_rule_based_paths_need_no_model()
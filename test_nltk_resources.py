@@ -0,0 +1,78 @@
+import os
+import tempfile
+import time
+
+import nltk
+
+from analysis import nltk_resources
+from models.nlp_analyzer import NLPAnalyzer
+
+
+def test_analyzers_never_download():
+    print("Testing offline NLTK bootstrap...")
+    print("=" * 50)
+
+    def no_download(*args, **kwargs):
+        raise AssertionError("nltk.download must not be called")
+
+    original = nltk.download
+    nltk.download = no_download
+    try:
+        start = time.perf_counter()
+        analyzer = NLPAnalyzer()
+        print(f"Constructor took {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        result = analyzer.analyze_text("Solar panels cut emissions. The community is pleased.")
+        print(f"Analysis: {result}")
+        assert result['keyword_scores']['environmental'] > 0
+        assert analyzer.sia is NLPAnalyzer().sia
+    finally:
+        nltk.download = original
+
+
+def test_missing_resource_fails_fast():
+    original_path = list(nltk.data.path)
+    found = set(nltk_resources._found)
+    nltk.data.path[:] = []
+    nltk_resources._found.clear()
+    try:
+        start = time.perf_counter()
+        try:
+            nltk_resources.require('stopwords')
+            assert False, "missing data should raise"
+        except LookupError as e:
+            assert isinstance(e, nltk_resources.NLTKResourceError)
+            print(f"Raised in {(time.perf_counter() - start) * 1000:.2f} ms: {e}")
+    finally:
+        nltk.data.path[:] = original_path
+        nltk_resources._found.update(found)
+
+
+def test_legacy_punkt_is_not_accepted_for_punkt_tab():
+    original_path = list(nltk.data.path)
+    found = set(nltk_resources._found)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Only the pickled punkt of older nltk releases is installed
+        os.makedirs(os.path.join(tmp_dir, 'tokenizers', 'punkt'))
+        open(os.path.join(tmp_dir, 'tokenizers', 'punkt', 'english.pickle'), 'wb').close()
+        nltk.data.path[:] = [tmp_dir]
+        nltk_resources._found.clear()
+        try:
+            if nltk_resources.PUNKT_PACKAGE == 'punkt_tab':
+                try:
+                    nltk_resources.sent_tokenize("One sentence. Two sentences.")
+                    assert False, "punkt alone should not satisfy punkt_tab"
+                except nltk_resources.NLTKResourceError as e:
+                    assert e.name == 'punkt_tab'
+            else:
+                nltk_resources.require('punkt')
+        finally:
+            nltk.data.path[:] = original_path
+            nltk_resources._found.clear()
+            nltk_resources._found.update(found)
+
+
+if __name__ == "__main__":
+    test_analyzers_never_download()
+    test_missing_resource_fails_fast()
+    test_legacy_punkt_is_not_accepted_for_punkt_tab()
@@ -0,0 +1,62 @@
+from analysis import parsed_document
+from analysis.nlp_resources import get_nlp
+from analysis.esg_scorer import ESGScorer
+from analysis.nlp_analyzer import NLPAnalyzer
+
+REPORT = ("The solar farm will cut carbon emissions by 40% and create 120 jobs. "
+          "Community health programs were praised by residents. "
+          "Quarterly disclosure and board oversight reduce compliance risk.")
+
+
+def test_each_document_parsed_once():
+    print("Testing shared parsed documents...")
+    print("=" * 50)
+
+    calls = []
+    original_parse = parsed_document.parse
+
+    def counting_parse(text, task='full', rule_based=False):
+        calls.append(task)
+        return original_parse(text, task, rule_based)
+
+    parsed_document.parse = counting_parse
+    parsed_document.document_cache.clear()
+    try:
+        scorer = ESGScorer()
+        analyzer = NLPAnalyzer()
+        # calculate_esg_scores joins the description and (no) reports with a space
+        text = REPORT + ' '
+        scorer.calculate_esg_scores({'description': REPORT})
+        analyzer.extract_key_phrases(text)
+        analyzer.extract_esg_insights(text)
+        sentiments = analyzer.analyze_sentiment_by_aspect(text)
+        metrics = analyzer.extract_metrics(text)
+    finally:
+        parsed_document.parse = original_parse
+
+    print(f"Parses: {calls}, cache: {parsed_document.document_cache.stats()}")
+    print(f"Aspect sentiment: {sentiments}")
+    assert len(calls) == 1
+    assert any(m['value'] == '120 jobs' for m in metrics)
+
+
+def test_document_contents():
+    document = parsed_document.get_parsed_document(REPORT)
+    assert parsed_document.get_parsed_document(REPORT) is document
+    expected = [sent.text for sent in get_nlp()(REPORT).sents]
+    assert document.sentences == expected
+    start, end = document.sentence_spans[-1]
+    assert REPORT[start:end] == document.sentences[-1]
+    assert len(document.sentence_sentiment) == len(expected)
+    assert all(word.isalpha() and word == word.lower()
+               for words in document.sentence_words for word in words)
+
+    rule_based = parsed_document.get_parsed_document(REPORT, rule_based_sentences=True)
+    assert rule_based is not document
+    assert len(rule_based.sentences) == 3
+    assert rule_based.noun_chunks == document.noun_chunks
+
+
+if __name__ == "__main__":
+    test_each_document_parsed_once()
+    test_document_contents()
@@ -0,0 +1,64 @@
+import time
+
+from models.esg_scorer import ESGScorer
+from models.score_cache import ScoreCache
+
+
+def test_description_score_cache():
+    print("Testing ESG description score cache...")
+    print("=" * 50)
+
+    scorer = ESGScorer()
+    scorer.train()
+    description = "Solar farm creating 50 jobs with transparent community reporting."
+
+    first = scorer.score_project_description(description)
+    start = time.perf_counter()
+    repeat = scorer.score_project_description("  " + description.upper())
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Cached lookup took {elapsed_ms:.4f} ms")
+    print(f"Cache stats: {scorer.score_cache.stats()}")
+    assert repeat == first
+    assert scorer.score_cache.hits == 1 and scorer.score_cache.misses == 1
+    assert elapsed_ms < 1.0
+
+    # Retraining bumps the model version, so old entries are not reused
+    scorer.train()
+    scorer.score_project_description(description)
+    assert scorer.score_cache.misses == 2
+
+
+def test_cached_results_are_copies():
+    scorer = ESGScorer()
+    scorer.train()
+    description = "Wind farm with community benefits and transparent reporting."
+
+    first = scorer.score_project_description(description, explain=True)
+    expected = {**first, 'feature_contributions': dict(first['feature_contributions'])}
+    first['feature_contributions'].clear()
+    first['esg_score'] = -1
+
+    repeat = scorer.score_project_description(description, explain=True)
+    assert scorer.score_cache.hits == 1
+    assert repeat == expected
+    repeat['feature_contributions'].clear()
+    assert scorer.score_project_description(description, explain=True) == expected
+
+
+def test_cache_eviction_and_ttl():
+    cache = ScoreCache(maxsize=2, ttl=0.05)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None and cache.evictions == 1
+
+    time.sleep(0.06)
+    assert cache.get('a') is None and cache.expirations == 1
+
+
+if __name__ == "__main__":
+    test_description_score_cache()
+    test_cached_results_are_copies()
+    test_cache_eviction_and_ttl()
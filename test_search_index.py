@@ -0,0 +1,107 @@
+import math
+import os
+import tempfile
+
+from models.fund_seeker import FundSeekerManager
+from models.search_index import ProjectSearchIndex, tokenize
+
+PROJECTS = [
+    {'id': '1', 'name': 'Solar Farm', 'description': 'Solar panels on farm land with battery storage.',
+     'sustainability_impact': 'Clean energy for 5000 homes.', 'status': 'approved',
+     'environmental_score': 90, 'social_score': 60, 'governance_score': 70},
+    {'id': '2', 'name': 'Community Clinic', 'description': 'Rural health clinic run by the community.',
+     'sustainability_impact': 'Health care access.', 'status': 'approved',
+     'environmental_score': 40, 'social_score': 85, 'governance_score': 60},
+    {'id': '3', 'name': 'Solar Schools', 'description': 'Rooftop solar for schools and solar education.',
+     'sustainability_impact': 'Teaches energy literacy.', 'status': 'pending',
+     'environmental_score': 70, 'social_score': 75, 'governance_score': 50},
+    {'id': '4', 'name': 'Wind Park', 'description': 'Offshore wind energy.', 'sustainability_impact': '',
+     'status': 'rejected', 'environmental_score': 80, 'social_score': 50, 'governance_score': 50},
+]
+
+
+def reference_bm25(projects, query, k1=1.2, b=0.75):
+    """Straightforward BM25 over the same tokens"""
+    docs = [tokenize(' '.join([p['name'], p['description'], p['sustainability_impact']]))
+            for p in projects]
+    average = sum(map(len, docs)) / len(docs)
+    scores = {}
+    for project, doc in zip(projects, docs):
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(1 for other in docs if term in other)
+            tf = doc.count(term)
+            if tf:
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / average))
+        if score:
+            scores[project['id']] = score
+    return scores
+
+
+def test_bm25_scores_and_order():
+    print("Testing BM25 project search...")
+    print("=" * 50)
+
+    index = ProjectSearchIndex()
+    index.add_projects(PROJECTS)
+    found = index.search('solar energy')
+    expected = reference_bm25(PROJECTS, 'solar energy')
+    assert found['total'] == len(expected)
+    assert {r['id']: round(r['score'], 9) for r in found['results']} == \
+        {k: round(v, 9) for k, v in expected.items()}
+    scores = [r['score'] for r in found['results']]
+    assert scores == sorted(scores, reverse=True)
+    print(f"Results: {found['results']}")
+
+
+def test_filters_and_pagination():
+    index = ProjectSearchIndex()
+    index.add_projects(PROJECTS)
+    assert [r['id'] for r in index.search('energy', statuses=['approved'])['results']] == ['1']
+    assert [r['id'] for r in index.search('', category='social')['results']] == ['2', '3']
+    assert index.search('', min_score=85)['total'] == 2
+
+    pages = [index.search('solar energy', page=page, per_page=1) for page in (1, 2, 3, 4)]
+    ids = [r['id'] for found in pages for r in found['results']]
+    assert ids == [r['id'] for r in index.search('solar energy')['results']]
+    assert pages[-1]['results'] == []
+
+
+def test_updates_are_indexed_incrementally():
+    index = ProjectSearchIndex()
+    index.add_projects(PROJECTS)
+    assert index.search('hydrogen')['total'] == 0
+    index.add_update(PROJECTS[1], 'The clinic now runs on green hydrogen and hydrogen storage.')
+    found = index.search('hydrogen')
+    assert [r['id'] for r in found['results']] == ['2']
+
+    rescored = dict(PROJECTS[3], status='approved')
+    index.update_project(rescored)
+    assert '4' in [r['id'] for r in index.search('wind', statuses=['approved'])['results']]
+
+
+def test_manager_search():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            manager = FundSeekerManager()
+            project = manager.create_project('Mangrove Restoration', 'Replanting coastal mangroves.',
+                                             250000, 18, 'Protects biodiversity.', '5')
+            found = manager.search_projects('mangroves')
+            assert found['total'] == 1 and found['results'][0]['project'] == project
+
+            manager.add_project_update(project['id'], 'Seedlings survived the monsoon season.')
+            assert manager.search_projects('monsoon')['total'] == 1
+            manager.update_project_status(project['id'], 'rejected')
+            assert manager.search_projects('monsoon')['total'] == 0
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_bm25_scores_and_order()
+    test_filters_and_pagination()
+    test_updates_are_indexed_incrementally()
+    test_manager_search()
@@ -0,0 +1,76 @@
+from analysis.nlp_analyzer import NLPAnalyzer
+from analysis.sentence_memo import SentenceMemo, sentiment_memo
+from models.nlp_analyzer import NLPAnalyzer as ProjectNLPAnalyzer
+
+DISCLAIMER = ("This report contains forward-looking statements that involve risk. "
+              "Actual results may differ materially from those expressed. ")
+
+
+def test_memo_computes_each_distinct_sentence_once():
+    print("Testing sentence memo...")
+    print("=" * 50)
+
+    calls = []
+
+    def compute(sentences):
+        calls.append(list(sentences))
+        return [len(sentence) for sentence in sentences]
+
+    memo = SentenceMemo(compute, maxsize=10)
+    assert memo(['a b', 'cc', 'a b']) == [3, 2, 3]
+    assert memo(['cc', 'ddd']) == [2, 3]
+    assert calls == [['a b', 'cc'], ['ddd']]
+
+    stats = memo.stats()
+    assert stats['sentences'] == 5 and stats['computed'] == 3
+    assert abs(stats['dedup_ratio'] - 0.4) < 1e-9
+    print(f"Memo stats: {stats}")
+
+
+def test_memo_returns_copies():
+    memo = SentenceMemo(lambda sentences: [{'compound': len(s)} for s in sentences])
+    first = memo(['boilerplate', 'boilerplate'])
+    assert first[0] is not first[1]
+    first[0]['compound'] = -1
+    assert memo(['boilerplate']) == [{'compound': 11}]
+
+
+def test_memo_is_bounded():
+    memo = SentenceMemo(lambda sentences: [s.upper() for s in sentences], maxsize=3)
+    memo([f"sentence {i}" for i in range(10)])
+    stats = memo.stats()
+    assert stats['size'] == 3 and stats['evictions'] == 7
+    # Evicted sentences are computed again
+    memo(['sentence 0'])
+    assert memo.stats()['computed'] == 11
+
+
+def test_memoized_results_match_fresh_results():
+    sentiment_memo.clear()
+    analyzer = NLPAnalyzer(rule_based_sentences=True)
+    texts = [DISCLAIMER + f"Project {name} improved community health and cut emissions."
+             for name in ('alpha', 'beta', 'gamma')]
+    first = [analyzer.analyze(text) for text in texts]
+
+    stats = {}
+    again = list(analyzer.analyze_corpus([text + ' ' for text in texts], stats=stats))
+    assert again == first
+    assert stats['sentence_dedup_ratio'] == 1.0
+    assert analyzer.memo_stats()['keywords']['dedup_ratio'] > 0.5
+
+
+def test_project_analyzer_reuses_boilerplate():
+    analyzer = ProjectNLPAnalyzer()
+    text = DISCLAIMER + "The solar farm created many jobs."
+    result = analyzer.analyze_text(text)
+    assert analyzer.analyze_text(text) == result
+    stats = analyzer.memo_stats()
+    assert stats['risk_keywords']['computed'] == stats['risk_keywords']['sentences'] // 2
+
+
+if __name__ == "__main__":
+    test_memo_computes_each_distinct_sentence_once()
+    test_memo_returns_copies()
+    test_memo_is_bounded()
+    test_memoized_results_match_fresh_results()
+    test_project_analyzer_reuses_boilerplate()
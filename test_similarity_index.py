@@ -0,0 +1,102 @@
+import os
+import tempfile
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from models.fund_seeker import FundSeekerManager
+from models.similarity_index import ProjectSimilarityIndex, project_text
+
+PROJECTS = [
+    {'id': '1', 'name': 'Solar Farm', 'description': 'Solar panels on farm land with battery storage.',
+     'sustainability_impact': 'Clean energy for 5000 homes.'},
+    {'id': '2', 'name': 'Community Clinic', 'description': 'Rural health clinic run by the community.',
+     'sustainability_impact': 'Health care access.'},
+    {'id': '3', 'name': 'Solar Schools', 'description': 'Rooftop solar panels for schools.',
+     'sustainability_impact': 'Clean energy and energy literacy.'},
+    {'id': '4', 'name': 'Wind Park', 'description': 'Offshore wind energy with battery storage.',
+     'sustainability_impact': ''},
+    {'id': '5', 'name': 'Rural Health Vans', 'description': 'Mobile health clinic vans for rural villages.',
+     'sustainability_impact': 'Health care for the community.'},
+]
+
+
+def brute_force(projects, k):
+    """Dense cosine similarity over the same TF-IDF vectors"""
+    vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+    matrix = vectorizer.fit_transform([project_text(p) for p in projects]).toarray()
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, -1)
+    return {
+        project['id']: [projects[j]['id'] for j in np.argsort(-similarity[i], kind='stable')[:k]
+                        if similarity[i, j] > 0]
+        for i, project in enumerate(projects)
+    }
+
+
+def test_similar_projects_match_brute_force():
+    print("Testing TF-IDF similar projects...")
+    print("=" * 50)
+
+    # A tiny score budget makes every query span several blocks
+    index = ProjectSimilarityIndex(max_scores=2)
+    index.fit(PROJECTS)
+    expected = brute_force(PROJECTS, 2)
+    for project in PROJECTS:
+        found = index.similar_projects(project['id'], k=2)
+        assert [f['id'] for f in found] == expected[project['id']]
+        assert project['id'] not in [f['id'] for f in found]
+        print(f"{project['name']}: {found}")
+
+    assert {key: [f['id'] for f in found] for key, found in index.all_similar(k=2, query_block_size=2).items()} \
+        == expected
+    assert index.similar_projects('missing') == []
+
+
+def test_free_text_query():
+    index = ProjectSimilarityIndex(max_scores=3)
+    index.fit(PROJECTS)
+    found = index.similar_to_text('A health clinic for rural communities', k=3)
+    assert {f['id'] for f in found[:2]} == {'2', '5'}
+    assert all(0 < f['similarity'] <= 1.0001 for f in found)
+    assert index.similar_to_text('nothing in common here xyzzy') == []
+
+
+def test_incremental_addition_without_refit():
+    index = ProjectSimilarityIndex(refit_ratio=1.0)
+    index.fit(PROJECTS)
+    vectorizer = index.vectorizer
+    index.add_project({'id': '6', 'name': 'Solar Battery Farm',
+                       'description': 'Solar farm with battery storage.', 'sustainability_impact': ''})
+    assert index.vectorizer is vectorizer
+    assert index.similar_projects('6', k=1)[0]['id'] == '1'
+    assert '6' in [f['id'] for f in index.similar_projects('1', k=2)]
+
+    # Enough additions trigger a refit that picks up new vocabulary
+    for i in range(7, 13):
+        index.add_project({'id': str(i), 'name': f'Mangrove Site {i}', 'description': 'Mangrove replanting.'})
+    assert index.vectorizer is not vectorizer
+    assert index.similar_to_text('mangrove', k=1)[0]['id'].isdigit()
+    assert len(index) == 12
+
+
+def test_manager_similar_projects():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            manager = FundSeekerManager()
+            project = manager.create_project('Offshore Wind Expansion', 'Offshore wind farm with new turbines.',
+                                             100000, 12, 'Clean energy.', '5')
+            similar = manager.get_similar_projects(project['id'])
+            assert similar and similar[0]['name'] == 'Wind Energy Initiative'
+            assert manager.find_similar_to_text('solar farm in Arizona')[0]['name'] == 'Solar Farm Project'
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_similar_projects_match_brute_force()
+    test_free_text_query()
+    test_incremental_addition_without_refit()
+    test_manager_similar_projects()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+
+import numpy as np
+
+from analysis.nlp_analyzer import NLPAnalyzer
+from analysis.text_stream import iter_text_chunks
+from models.nlp_analyzer import NLPAnalyzer as ProjectNLPAnalyzer
+
+REPORT = (
+    "The project installed 50 MW of renewable energy capacity. "
+    "Carbon emissions fell by 1200 tons compared to the baseline year. "
+    "Community health programs reached 3000 households with great success. "
+    "The board improved transparency and compliance reporting. "
+    "Supply chain risk remains a serious concern for the company. "
+    "Investment of $2.5 million supported local employee education. "
+)
+
+
+def test_chunks_rejoin_at_sentence_ends():
+    print("Testing sentence-aligned chunking...")
+    print("=" * 50)
+
+    text = REPORT * 20
+    chunks = list(iter_text_chunks([text[i:i + 97] for i in range(0, len(text), 97)],
+                                   chunk_chars=400))
+    assert ''.join(chunks) == text
+    assert all(len(chunk) <= 400 for chunk in chunks)
+    assert all(chunk.rstrip().endswith('.') for chunk in chunks)
+    print(f"{len(chunks)} chunks, sizes {[len(c) for c in chunks[:5]]}...")
+
+
+def test_chunk_without_sentence_end_is_cut_at_whitespace():
+    text = 'word ' * 100
+    chunks = list(iter_text_chunks([text], chunk_chars=64))
+    assert ''.join(chunks) == text
+    assert all(chunk.endswith(' ') for chunk in chunks[:-1])
+
+
+def test_one_large_piece_chunks_like_many_small_ones():
+    text = REPORT * 5000
+    whole = list(iter_text_chunks([text], chunk_chars=1000))
+    pieces = list(iter_text_chunks([text[i:i + 333] for i in range(0, len(text), 333)],
+                                   chunk_chars=1000))
+    assert whole == pieces
+    assert ''.join(whole) == text and len(whole) > 1000
+
+
+def test_stream_matches_whole_document():
+    text = REPORT * 5
+    analyzer = NLPAnalyzer(rule_based_sentences=True)
+    stats = {}
+    streamed = analyzer.analyze_stream([text], chunk_chars=len(REPORT) + 10, stats=stats)
+    whole = analyzer.analyze(text)
+    assert stats['chunks'] == 5
+
+    assert streamed['key_phrases'] == whole['key_phrases']
+    assert streamed['esg_insights'] == whole['esg_insights']
+    assert streamed['metrics'] == whole['metrics']
+    assert streamed['aspect_sentiment'].keys() == whole['aspect_sentiment'].keys()
+    for aspect, score in whole['aspect_sentiment'].items():
+        assert np.isclose(streamed['aspect_sentiment'][aspect], score)
+
+
+def test_stream_caps_insights_and_metrics():
+    analyzer = NLPAnalyzer(rule_based_sentences=True)
+    stats = {}
+    result = analyzer.analyze_stream([REPORT * 10], chunk_chars=len(REPORT) + 10,
+                                     max_insights=3, max_metrics=4, stats=stats)
+    assert all(len(sentences) <= 3 for sentences in result['esg_insights'].values())
+    assert len(result['metrics']) == 4
+    assert stats['metrics_found'] > 4
+
+
+def test_project_analyzer_stream_from_file():
+    text = REPORT * 5
+    analyzer = ProjectNLPAnalyzer()
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write(text)
+    try:
+        streamed = analyzer.analyze_stream(f.name, chunk_chars=len(REPORT) + 10)
+    finally:
+        os.remove(f.name)
+    whole = analyzer.analyze_text(text)
+
+    for category, score in whole['keyword_scores'].items():
+        assert np.isclose(streamed['keyword_scores'][category], score)
+    for key, value in whole['sentiment_scores'].items():
+        assert np.isclose(streamed['sentiment_scores'][key], value)
+    assert np.isclose(streamed['risk_score'], whole['risk_score'])
+    print(f"Streamed results: {streamed}")
+
+
+if __name__ == "__main__":
+    test_chunks_rejoin_at_sentence_ends()
+    test_chunk_without_sentence_end_is_cut_at_whitespace()
+    test_one_large_piece_chunks_like_many_small_ones()
+    test_stream_matches_whole_document()
+    test_stream_caps_insights_and_metrics()
+    test_project_analyzer_stream_from_file()